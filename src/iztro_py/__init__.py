@@ -12,10 +12,47 @@ __version__ = "0.3.3"
 __author__ = "iztro-py Contributors"
 __license__ = "MIT"
 
-# Re-export main modules for convenient imports
-from iztro_py import astro, data, star, utils
+import importlib
+from typing import TYPE_CHECKING
 
-# Re-export main API functions for easier access
-from iztro_py.astro import by_solar, by_lunar
+# 子模块与主要 API 按需加载（PEP 562），`import iztro_py` 本身不会导入
+# pydantic、lunarcalendar 或语言资源；首次访问时才导入对应模块。
+_LAZY_MODULES = ("astro", "data", "star", "utils")
+_LAZY_ATTRIBUTES = {
+    "by_solar": "iztro_py.astro",
+    "by_lunar": "iztro_py.astro",
+    "warmup": "iztro_py.runtime",
+    "freeze_for_fork": "iztro_py.runtime",
+}
 
-__all__ = ["astro", "data", "star", "utils", "by_solar", "by_lunar", "__version__"]
+if TYPE_CHECKING:
+    from iztro_py import astro, data, star, utils
+    from iztro_py.astro import by_solar, by_lunar
+    from iztro_py.runtime import freeze_for_fork, warmup
+
+
+def __getattr__(name: str) -> object:
+    if name in _LAZY_MODULES:
+        return importlib.import_module(f"iztro_py.{name}")
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'iztro_py' has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+
+
+__all__ = [
+    "astro",
+    "data",
+    "star",
+    "utils",
+    "by_solar",
+    "by_lunar",
+    "warmup",
+    "freeze_for_fork",
+    "__version__",
+]
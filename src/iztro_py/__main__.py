@@ -0,0 +1,10 @@
+"""
+Command line entry point: python -m iztro_py
+"""
+
+import sys
+
+from iztro_py.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Asyncio API for iztro-py
+
+by_solar(), by_lunar() and horoscope() are CPU-bound and block the event
+loop. The coroutines here run them in an executor instead:
+
+    >>> from iztro_py import aio
+    >>> chart = await aio.by_solar("2000-8-16", 6, "男")
+    >>> horoscope = await aio.horoscope(chart, "2024-1-1", 6)
+
+- Backpressure: at most max_pending computations are submitted to the
+  executor at a time; further callers wait without blocking the loop.
+- Coalescing: concurrent identical requests (same arguments, or the same
+  frozen chart content and target date) share one in-flight computation and
+  receive the same result object, which should therefore be treated as
+  read-only (use chart.thaw() for an editable copy). Dates are compared as
+  passed, so "2000-8-16" and "2000-08-16" are computed separately and each
+  caller gets back the solar_date it passed, as with the sync API.
+
+The default runner uses a thread pool, which keeps the loop responsive;
+configure(process=True) uses a process pool, which also runs charts in
+parallel across CPU cores.
+"""
+
+import asyncio
+import os
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from iztro_py import astro, instrumentation
+from iztro_py.cache import chart_fingerprint
+
+# 合并请求的命中/未命中会作为缓存事件上报给 instrumentation
+COALESCE_CACHE = "aio_coalesce"
+
+
+def _horoscope(chart: Any, solar_date: str, time_index: int) -> Any:
+    return chart.horoscope(solar_date, time_index)
+
+
+class _LoopState:
+    """单个事件循环内的并发状态（asyncio 原语只能在创建它的循环中使用）"""
+
+    def __init__(self, max_pending: int):
+        self.semaphore = asyncio.Semaphore(max_pending)
+        self.in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+
+class AioRunner:
+    """
+    在执行器中运行星盘计算，带背压与请求合并
+
+    Args:
+        executor: 使用的执行器；为 None 时按 process 自动创建（并由 shutdown() 关闭）
+        max_workers: 自动创建执行器时的工作线程/进程数
+        max_pending: 同时提交给执行器的计算数上限，默认为 max_workers 的两倍
+        process: 自动创建进程池而不是线程池
+
+    Example:
+        >>> runner = AioRunner(process=True, max_workers=4)
+        >>> chart = await runner.by_solar('2000-8-16', 6, '男')
+        >>> runner.shutdown()
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        process: bool = False,
+    ):
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4) if executor is None else 4
+        if max_pending is None:
+            max_pending = max_workers * 2
+        if max_workers < 1 or max_pending < 1:
+            raise ValueError("max_workers and max_pending must be positive")
+
+        self.max_pending = max_pending
+        self._owns_executor = executor is None
+        if executor is None:
+            pool = ProcessPoolExecutor if process else ThreadPoolExecutor
+            executor = pool(max_workers=max_workers)
+        self.executor = executor
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _state(self) -> _LoopState:
+        """当前运行中的事件循环的状态（只能在协程中调用）"""
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState(self.max_pending)
+        return state
+
+    def pending(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> int:
+        """
+        事件循环中正在进行（含等待执行器）的不同计算数
+
+        Args:
+            loop: 事件循环，默认为当前运行中的事件循环
+
+        Returns:
+            计算数；没有运行中的事件循环、或该事件循环尚未运行过任何计算时为 0
+        """
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return 0
+        state = self._states.get(loop)
+        return 0 if state is None else len(state.in_flight)
+
+    async def run(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在执行器中运行 func(*args)；key 相同的并发调用只计算一次
+
+        Args:
+            key: 请求键，相同的键表示结果相同的请求
+            func: 要运行的函数（使用进程池时必须可以 pickle）
+            *args: 函数参数
+
+        Returns:
+            函数返回值（合并的调用者得到同一对象）
+        """
+        state = self._state()
+        task = state.in_flight.get(key)
+        if instrumentation.is_enabled():
+            instrumentation.record_cache(COALESCE_CACHE, task is not None)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(state, func, args))
+            state.in_flight[key] = task
+            task.add_done_callback(lambda _: state.in_flight.pop(key, None))
+        # shield：某个调用者被取消时，不影响共享同一计算的其他调用者
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self, state: _LoopState, func: Callable[..., Any], args: Tuple[Any, ...]
+    ) -> Any:
+        async with state.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    def by_solar(
+        self,
+        solar_date: str,
+        time_index: int,
+        gender: str,
+        fix_leap: bool = True,
+        language: str = "zh-CN",
+    ) -> Awaitable[Any]:
+        """异步版 astro.by_solar()"""
+        key = ("by_solar", solar_date, time_index, gender, fix_leap, language)
+        return self.run(key, astro.by_solar, solar_date, time_index, gender, fix_leap, language)
+
+    def by_lunar(
+        self,
+        lunar_date: str,
+        time_index: int,
+        gender: str,
+        is_leap_month: bool = False,
+        fix_leap: bool = True,
+        language: str = "zh-CN",
+    ) -> Awaitable[Any]:
+        """异步版 astro.by_lunar()"""
+        key = (
+            "by_lunar",
+            lunar_date,
+            time_index,
+            gender,
+            is_leap_month,
+            fix_leap,
+            language,
+        )
+        return self.run(
+            key, astro.by_lunar, lunar_date, time_index, gender, is_leap_month, fix_leap, language
+        )
+
+    def horoscope(self, chart: Any, solar_date: str, time_index: int = 0) -> Awaitable[Any]:
+        """
+        异步版 chart.horoscope()
+
+        冻结的星盘按内容摘要与目标日期合并请求；未冻结的星盘可能已被修改，不参与合并
+        """
+        if getattr(chart, "frozen", False):
+            chart_key: Hashable = chart.content_digest()
+        else:
+            chart_key = id(chart)
+        key = ("horoscope", chart_key, solar_date, time_index)
+        return self.run(key, _horoscope, chart, solar_date, time_index)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭自动创建的执行器（传入的执行器由调用方负责关闭）"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
+
+
+_default_runner: Optional[AioRunner] = None
+
+
+def configure(
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    process: bool = False,
+) -> AioRunner:
+    """
+    替换模块级函数使用的默认 AioRunner（旧的默认执行器会被关闭）
+
+    参数见 AioRunner。应在服务启动时、发出任何请求之前调用。
+
+    Returns:
+        新的默认 AioRunner
+
+    Example:
+        >>> from iztro_py import aio
+        >>> aio.configure(process=True, max_workers=4)
+    """
+    global _default_runner
+    previous = _default_runner
+    _default_runner = AioRunner(executor, max_workers, max_pending, process)
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return _default_runner
+
+
+def get_runner() -> AioRunner:
+    """获取默认 AioRunner（首次使用时以默认参数创建线程池）"""
+    global _default_runner
+    if _default_runner is None:
+        _default_runner = AioRunner()
+    return _default_runner
+
+
+def by_solar(
+    solar_date: str,
+    time_index: int,
+    gender: str,
+    fix_leap: bool = True,
+    language: str = "zh-CN",
+) -> Awaitable[Any]:
+    """
+    异步版 astro.by_solar()，在默认执行器中计算
+
+    Example:
+        >>> chart = await aio.by_solar('2000-8-16', 6, '男')
+    """
+    return get_runner().by_solar(solar_date, time_index, gender, fix_leap, language)
+
+
+def by_lunar(
+    lunar_date: str,
+    time_index: int,
+    gender: str,
+    is_leap_month: bool = False,
+    fix_leap: bool = True,
+    language: str = "zh-CN",
+) -> Awaitable[Any]:
+    """
+    异步版 astro.by_lunar()，在默认执行器中计算
+
+    Example:
+        >>> chart = await aio.by_lunar('2000-7-17', 6, '男')
+    """
+    return get_runner().by_lunar(lunar_date, time_index, gender, is_leap_month, fix_leap, language)
+
+
+def horoscope(chart: Any, solar_date: str, time_index: int = 0) -> Awaitable[Any]:
+    """
+    异步版 chart.horoscope()，在默认执行器中计算
+
+    Example:
+        >>> horoscope = await aio.horoscope(chart, '2024-1-1', 6)
+    """
+    return get_runner().horoscope(chart, solar_date, time_index)
+
+
+__all__ = [
+    "COALESCE_CACHE",
+    "AioRunner",
+    "chart_fingerprint",
+    "configure",
+    "get_runner",
+    "by_solar",
+    "by_lunar",
+    "horoscope",
+]
@@ -4,6 +4,8 @@ Astro module: Core astrolabe functionality and palace calculations.
 
 from iztro_py.astro.astro import (
     by_solar,
+    by_solar_fields,
+    by_solar_all_hours,
     by_lunar,
     by_solar_hour,
     by_lunar_hour,
@@ -17,6 +19,8 @@ from iztro_py.astro.functional_surpalaces import FunctionalSurpalaces
 
 __all__ = [
     "by_solar",
+    "by_solar_fields",
+    "by_solar_all_hours",
     "by_lunar",
     "by_solar_hour",
     "by_lunar_hour",
@@ -4,15 +4,17 @@ Main API for iztro-py
 Provides high-level functions for creating astrolabes.
 """
 
-from typing import Optional
-from datetime import date
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+from datetime import date, timedelta
 
+from iztro_py.instrumentation import stage_timer
 from iztro_py.data.types import (
     GenderName,
     Language,
     Astrolabe,
     LunarDate,
     HeavenlyStemAndEarthlyBranchDate,
+    Palace,
 )
 from iztro_py.astro.functional_astrolabe import FunctionalAstrolabe
 from iztro_py.astro.palace import get_soul_and_body, initialize_palaces
@@ -21,12 +23,14 @@ from iztro_py.star.minor_star import place_minor_stars
 from iztro_py.star.mutagen import apply_mutagen_to_palaces
 from iztro_py.data.brightness import apply_brightness_to_palaces
 from iztro_py.data.earthly_branches import get_soul_star, get_body_star
-from iztro_py.star.location import get_start_indices
+from iztro_py.star.location import get_start_indices_by_day
+from iztro_py.data.constants import EARTHLY_BRANCHES
 from iztro_py.utils.calendar import (
     parse_solar_date,
     solar_to_lunar,
     lunar_to_solar,
     get_heavenly_stem_and_earthly_branch_date,
+    get_time_stem_branch,
     get_zodiac,
     get_sign,
     format_lunar_date,
@@ -40,92 +44,160 @@ from iztro_py.utils.helpers import (
     hour_to_time_index,
 )
 
+# by_solar_fields() 可选的星盘字段（与 Astrolabe 的字段同名）
+CHART_FIELDS: Tuple[str, ...] = (
+    "gender",
+    "solar_date",
+    "lunar_date",
+    "chinese_date",
+    "time",
+    "time_range",
+    "sign",
+    "zodiac",
+    "earthly_branch_of_soul_palace",
+    "earthly_branch_of_body_palace",
+    "soul",
+    "body",
+    "five_elements_class",
+    "palaces",
+    "language",
+    "raw_lunar_date",
+    "raw_chinese_date",
+)
 
-def by_solar(
-    solar_date: str,
-    time_index: int,
-    gender: GenderName,
-    fix_leap: bool = True,
-    language: Language = "zh-CN",
-) -> FunctionalAstrolabe:
-    """
-    通过阳历日期获取紫微斗数星盘
+# 宫位字段，可以用 "palaces.<字段>" 只取其中一部分
+PALACE_FIELDS: Tuple[str, ...] = tuple(Palace.model_fields)
+
+# 各阶段被哪些字段用到；未用到的阶段整个跳过
+_LUNAR_FIELDS: FrozenSet[str] = frozenset({"lunar_date", "raw_lunar_date"})
+_PILLAR_FIELDS: FrozenSet[str] = frozenset({"chinese_date", "raw_chinese_date", "zodiac"})
+_SOUL_FIELDS: FrozenSet[str] = frozenset(
+    {
+        "earthly_branch_of_soul_palace",
+        "earthly_branch_of_body_palace",
+        "soul",
+        "five_elements_class",
+    }
+)
+_STAR_FIELDS: FrozenSet[str] = frozenset({"major_stars", "minor_stars"})
 
-    Args:
-        solar_date: 阳历日期字符串，格式 'YYYY-M-D' 或 'YYYY-MM-DD'
-        time_index: 时辰索引 (0-12)
-            0: 早子时 00:00~01:00
-            1: 丑时 01:00~03:00
-            ...
-            12: 晚子时 23:00~00:00
-        gender: 性别 ('男' 或 '女')
-        fix_leap: 是否修正闰月（默认True）
-        language: 输出语言（默认'zh-CN'）
 
-    Returns:
-        FunctionalAstrolabe对象
+def _start_lunar_day(
+    year: int, month: int, day: int, time_index: int, fix_leap: bool, lunar_date: LunarDate
+) -> int:
+    """起紫微所用的农历日：晚子时按次日的农历日，其余即当日农历日"""
+    if time_index != 12:
+        return lunar_date.day
+    next_day = date(year, month, day) + timedelta(days=1)
+    return solar_to_lunar(next_day.year, next_day.month, next_day.day, fix_leap).day
 
-    Example:
-        >>> from iztro_py import astro
-        >>> chart = astro.by_solar('2000-8-16', 6, '男')
-        >>> print(chart.get_soul_palace())
-        >>> print(chart.star('紫微'))
-    """
-    # 设置语言
-    from iztro_py.i18n import set_language
 
-    set_language(language)
+class _SolarDay(NamedTuple):
+    """同一阳历日各时辰共用的中间结果"""
+
+    year: int
+    month: int
+    day: int
+    lunar_date: LunarDate
+    chinese_date: HeavenlyStemAndEarthlyBranchDate  # 时柱为计算时传入的时辰
+    zodiac: str
+    sign: str
 
+
+def _solar_day(solar_date: str, time_index: int, fix_leap: bool, timer: Any) -> _SolarDay:
+    """解析日期并计算农历、四柱、生肖与星座（by_solar 流水线的第 1-4 步）"""
     # 1. 解析阳历日期
     year, month, day = parse_solar_date(solar_date)
+    if timer:
+        timer("parse_date")
 
     # 2. 阳历转农历
     lunar_date = solar_to_lunar(year, month, day, fix_leap)
+    if timer:
+        timer("solar_to_lunar")
 
     # 3. 计算四柱
     chinese_date = get_heavenly_stem_and_earthly_branch_date(
         year, month, day, time_index, lunar_date.month
     )
+    if timer:
+        timer("pillars")
 
     # 4. 生肖星座
     zodiac = get_zodiac(chinese_date.year_branch)
     sign = get_sign(month, day)
+    if timer:
+        timer("zodiac_sign")
+
+    return _SolarDay(year, month, day, lunar_date, chinese_date, zodiac, sign)
 
+
+def _with_time(
+    chinese_date: HeavenlyStemAndEarthlyBranchDate, time_index: int
+) -> HeavenlyStemAndEarthlyBranchDate:
+    """同一天另一时辰的四柱：年、月、日柱不变，只按五鼠遁换时柱"""
+    time_stem, time_branch = get_time_stem_branch(chinese_date.day_stem, time_index)
+    return chinese_date.model_copy(update={"time_stem": time_stem, "time_branch": time_branch})
+
+
+def _build_chart(
+    solar_date: str,
+    day: _SolarDay,
+    lunar_date: LunarDate,
+    chinese_date: HeavenlyStemAndEarthlyBranchDate,
+    time_index: int,
+    gender: GenderName,
+    fix_leap: bool,
+    language: Language,
+    timer: Any,
+) -> FunctionalAstrolabe:
+    """由日期部分的结果排出某一时辰的星盘（by_solar 流水线的第 5-14 步）"""
     # 5. 计算命宫身宫
     soul_and_body = get_soul_and_body(lunar_date.month, time_index, chinese_date.year_stem)
+    if timer:
+        timer("soul_body")
 
     # 6. 计算五行局
     five_class = get_five_elements_class(
         soul_and_body.heavenly_stem_of_soul, soul_and_body.earthly_branch_of_soul
     )
+    if timer:
+        timer("five_elements_class")
 
     # 7. 命主身主
     soul_star = get_soul_star(soul_and_body.earthly_branch_of_soul)
     body_star = get_body_star(chinese_date.year_branch)
+    if timer:
+        timer("soul_body_stars")
 
     # 8. 初始化十二宫
     palaces = initialize_palaces(soul_and_body)
+    if timer:
+        timer("init_palaces")
 
     # 9. 安置主星（与原生 iztro 对齐的紫微/天府起局算法）
-    ziwei_idx, tianfu_idx = get_start_indices(
-        solar_date,
-        time_index,
-        fix_leap,
-        soul_and_body.heavenly_stem_of_soul,
-        soul_and_body.earthly_branch_of_soul,
-    )
+    lunar_day = _start_lunar_day(day.year, day.month, day.day, time_index, fix_leap, lunar_date)
+    ziwei_idx, tianfu_idx = get_start_indices_by_day(five_class.value, lunar_day)
     place_major_stars(palaces, ziwei_idx, tianfu_idx)
+    if timer:
+        timer("major_stars")
 
     # 10. 安置辅星
     place_minor_stars(
         palaces, lunar_date.month, time_index, chinese_date.year_stem, chinese_date.year_branch
     )
+    if timer:
+        timer("minor_stars")
 
     # 11. 应用四化
     apply_mutagen_to_palaces(palaces, chinese_date.year_stem)
+    if timer:
+        timer("mutagen")
 
     # 12. 应用亮度
     apply_brightness_to_palaces(palaces)
+    if timer:
+        timer("brightness")
 
     # 13. 创建Astrolabe对象
     # 计算身宫地支（以身宫所在宫位的地支为准）
@@ -139,8 +211,8 @@ def by_solar(
         chinese_date=format_chinese_date(chinese_date),
         time=get_time_name(time_index),
         time_range=get_time_range(time_index),
-        sign=sign,
-        zodiac=zodiac,
+        sign=day.sign,
+        zodiac=day.zodiac,
         earthly_branch_of_soul_palace=soul_and_body.earthly_branch_of_soul,
         earthly_branch_of_body_palace=body_palace_branch,
         soul=soul_star,
@@ -151,9 +223,309 @@ def by_solar(
         raw_lunar_date=lunar_date,
         raw_chinese_date=chinese_date,
     )
+    if timer:
+        timer("build_model")
 
     # 14. 转换为FunctionalAstrolabe
-    return FunctionalAstrolabe(astrolabe)
+    chart = FunctionalAstrolabe(astrolabe)
+    if timer:
+        timer("functional_wrap")
+    return chart
+
+
+def by_solar(
+    solar_date: str,
+    time_index: int,
+    gender: GenderName,
+    fix_leap: bool = True,
+    language: Language = "zh-CN",
+) -> FunctionalAstrolabe:
+    """
+    通过阳历日期获取紫微斗数星盘
+
+    Args:
+        solar_date: 阳历日期字符串，格式 'YYYY-M-D' 或 'YYYY-MM-DD'
+        time_index: 时辰索引 (0-12)
+            0: 早子时 00:00~01:00
+            1: 丑时 01:00~03:00
+            ...
+            12: 晚子时 23:00~00:00
+        gender: 性别 ('男' 或 '女')
+        fix_leap: 是否修正闰月（默认True）
+        language: 输出语言（默认'zh-CN'），保存在星盘上，不修改全局语言设置
+
+    Returns:
+        FunctionalAstrolabe对象
+
+    Example:
+        >>> from iztro_py import astro
+        >>> chart = astro.by_solar('2000-8-16', 6, '男')
+        >>> print(chart.get_soul_palace())
+        >>> print(chart.star('紫微'))
+    """
+    # 阶段计时（未启用时为None）
+    timer = stage_timer("by_solar")
+
+    day = _solar_day(solar_date, time_index, fix_leap, timer)
+    chart = _build_chart(
+        solar_date,
+        day,
+        day.lunar_date,
+        day.chinese_date,
+        time_index,
+        gender,
+        fix_leap,
+        language,
+        timer,
+    )
+    if timer:
+        timer.finish()
+    return chart
+
+
+def by_solar_fields(
+    solar_date: str,
+    time_index: int,
+    gender: GenderName,
+    fields: Iterable[str],
+    fix_leap: bool = True,
+    language: Language = "zh-CN",
+) -> Dict[str, Any]:
+    """
+    只计算星盘的指定字段
+
+    与 by_solar() 使用同一套算法，但只执行所需字段用到的阶段：
+    例如只要命主身主和五行局时不会安星；只要主星时跳过辅星；
+    亮度与四化只在需要星曜时计算；始终不构建 Astrolabe 模型和 FunctionalAstrolabe。
+    返回值与 by_solar() 星盘上的同名属性一致，宫位为普通字典。
+
+    Args:
+        solar_date: 阳历日期字符串，格式 'YYYY-M-D' 或 'YYYY-MM-DD'
+        time_index: 时辰索引 (0-12)
+        gender: 性别 ('男' 或 '女')
+        fields: 字段名，取自 CHART_FIELDS；"palaces" 为完整宫位，
+            "palaces.<字段>"（字段取自 PALACE_FIELDS）只保留宫位的这些字段
+        fix_leap: 是否修正闰月（默认True）
+        language: 输出语言（默认'zh-CN'）
+
+    Returns:
+        字段名到值的字典，按 CHART_FIELDS 的顺序；宫位按从命宫起的顺序排列
+
+    Raises:
+        ValueError: 字段名未知
+
+    Example:
+        >>> from iztro_py import astro
+        >>> astro.by_solar_fields('2000-8-16', 6, '男', ['soul', 'body', 'five_elements_class'])
+        {'soul': 'lucunMin', 'body': 'wenchangMin', 'five_elements_class': '金四局'}
+        >>> soul_palace = astro.by_solar_fields('2000-8-16', 6, '男', ['palaces.major_stars'])[
+        ...     'palaces'
+        ... ][0]
+    """
+    return _project(
+        solar_date, (time_index,), gender, fields, fix_leap, language, "by_solar_fields"
+    )[0]
+
+
+def _project(
+    solar_date: str,
+    hours: Iterable[int],
+    gender: GenderName,
+    fields: Iterable[str],
+    fix_leap: bool,
+    language: Language,
+    pipeline: str,
+) -> List[Dict[str, Any]]:
+    """按 fields 计算同一天若干时辰的星盘字段，日期部分只计算一次"""
+    requested = set()
+    palace_fields = set()
+    for field in fields:
+        if field.startswith("palaces."):
+            palace_field = field[len("palaces.") :]
+            if palace_field not in PALACE_FIELDS:
+                raise ValueError(f"Unknown palace field: {palace_field!r}")
+            palace_fields.add(palace_field)
+            requested.add("palaces")
+        elif field in CHART_FIELDS:
+            if field == "palaces":
+                palace_fields.update(PALACE_FIELDS)
+            requested.add(field)
+        else:
+            raise ValueError(f"Unknown chart field: {field!r}")
+
+    need_palaces = bool(palace_fields)
+    need_stars = bool(palace_fields & _STAR_FIELDS)
+    need_soul = need_palaces or bool(requested & _SOUL_FIELDS)
+    need_pillars = need_soul or "body" in requested or bool(requested & _PILLAR_FIELDS)
+    need_lunar = need_pillars or bool(requested & _LUNAR_FIELDS)
+    keep = [field for field in PALACE_FIELDS if field in palace_fields]
+    hours = tuple(hours)
+
+    # 与时辰无关的部分
+    timer = stage_timer(pipeline)
+    shared: Dict[str, Any] = {
+        "gender": gender,
+        "solar_date": solar_date,
+        "language": language,
+    }
+
+    year, month, day = parse_solar_date(solar_date)
+    shared["sign"] = get_sign(month, day)
+    if timer:
+        timer("parse_date")
+
+    if need_lunar:
+        lunar_date = solar_to_lunar(year, month, day, fix_leap)
+        shared["lunar_date"] = format_lunar_date(lunar_date)
+        shared["raw_lunar_date"] = lunar_date
+        if timer:
+            timer("solar_to_lunar")
+
+    if need_pillars:
+        first_chinese_date = get_heavenly_stem_and_earthly_branch_date(
+            year, month, day, hours[0], lunar_date.month
+        )
+        shared["zodiac"] = get_zodiac(first_chinese_date.year_branch)
+        shared["body"] = get_body_star(first_chinese_date.year_branch)
+        if timer:
+            timer("pillars")
+
+    results = []
+    for time_index in hours:
+        values = dict(shared)
+        values["time"] = get_time_name(time_index)
+        values["time_range"] = get_time_range(time_index)
+
+        if need_pillars:
+            if time_index == hours[0]:
+                chinese_date = first_chinese_date
+            else:
+                chinese_date = _with_time(first_chinese_date, time_index)
+            values["chinese_date"] = format_chinese_date(chinese_date)
+            values["raw_chinese_date"] = chinese_date
+
+        if need_soul:
+            soul_and_body = get_soul_and_body(lunar_date.month, time_index, chinese_date.year_stem)
+            five_class = get_five_elements_class(
+                soul_and_body.heavenly_stem_of_soul, soul_and_body.earthly_branch_of_soul
+            )
+            values["earthly_branch_of_soul_palace"] = soul_and_body.earthly_branch_of_soul
+            values["earthly_branch_of_body_palace"] = EARTHLY_BRANCHES[soul_and_body.body_index]
+            values["soul"] = get_soul_star(soul_and_body.earthly_branch_of_soul)
+            values["five_elements_class"] = get_five_elements_class_name(five_class)
+            if timer:
+                timer("soul_body")
+
+        if need_palaces:
+            palaces = initialize_palaces(soul_and_body)
+            if timer:
+                timer("init_palaces")
+
+            if "major_stars" in palace_fields:
+                lunar_day = _start_lunar_day(year, month, day, time_index, fix_leap, lunar_date)
+                ziwei_idx, tianfu_idx = get_start_indices_by_day(five_class.value, lunar_day)
+                place_major_stars(palaces, ziwei_idx, tianfu_idx)
+                if timer:
+                    timer("major_stars")
+
+            if "minor_stars" in palace_fields:
+                place_minor_stars(
+                    palaces,
+                    lunar_date.month,
+                    time_index,
+                    chinese_date.year_stem,
+                    chinese_date.year_branch,
+                )
+                if timer:
+                    timer("minor_stars")
+
+            if need_stars:
+                apply_mutagen_to_palaces(palaces, chinese_date.year_stem)
+                if timer:
+                    timer("mutagen")
+                apply_brightness_to_palaces(palaces)
+                if timer:
+                    timer("brightness")
+
+            if len(keep) < len(PALACE_FIELDS):
+                palaces = [{field: palace[field] for field in keep} for palace in palaces]
+            values["palaces"] = palaces
+
+        results.append({field: values[field] for field in CHART_FIELDS if field in requested})
+        if timer:
+            timer("project")
+
+    if timer:
+        timer.finish()
+    return results
+
+
+def by_solar_all_hours(
+    solar_date: str,
+    gender: GenderName,
+    fix_leap: bool = True,
+    language: Language = "zh-CN",
+    fields: Optional[Iterable[str]] = None,
+) -> List[Any]:
+    """
+    生辰时辰未知时，一次排出同一天全部 13 个时辰（早子时至晚子时）的星盘
+
+    日期解析、农历转换、年月日柱、生肖与星座只计算一次，各时辰只换时柱；
+    晚子时所需的次日农历也只计算一次。需要更省时可指定 fields，
+    此时每个时辰只返回一行所需字段（见 by_solar_fields()）。
+
+    Args:
+        solar_date: 阳历日期字符串，格式 'YYYY-M-D' 或 'YYYY-MM-DD'
+        gender: 性别 ('男' 或 '女')
+        fix_leap: 是否修正闰月（默认True）
+        language: 输出语言（默认'zh-CN'）
+        fields: 可选，只计算这些字段（取值同 by_solar_fields()）
+
+    Returns:
+        长度为 13 的列表，下标即时辰索引；元素为 FunctionalAstrolabe，
+        指定 fields 时为字段字典
+
+    Raises:
+        ValueError: fields 中有未知字段
+
+    Example:
+        >>> from iztro_py import astro
+        >>> charts = astro.by_solar_all_hours('2000-8-16', '男')
+        >>> [chart.time for chart in charts][:2]
+        ['早子时', '丑时']
+        >>> rows = astro.by_solar_all_hours('2000-8-16', '男', fields=['soul', 'five_elements_class'])
+    """
+    if fields is not None:
+        return _project(
+            solar_date, range(13), gender, fields, fix_leap, language, "by_solar_all_hours"
+        )
+
+    timer = stage_timer("by_solar_all_hours")
+    day = _solar_day(solar_date, 0, fix_leap, timer)
+    charts = []
+    for time_index in range(13):
+        # 每张星盘持有自己的日期模型，修改其中一张不会影响其他时辰
+        if time_index:
+            lunar_date = day.lunar_date.model_copy()
+            chinese_date = _with_time(day.chinese_date, time_index)
+        else:
+            lunar_date, chinese_date = day.lunar_date, day.chinese_date
+        charts.append(
+            _build_chart(
+                solar_date,
+                day,
+                lunar_date,
+                chinese_date,
+                time_index,
+                gender,
+                fix_leap,
+                language,
+                timer,
+            )
+        )
+    if timer:
+        timer.finish()
+    return charts
 
 
 def by_solar_hour(
@@ -0,0 +1,189 @@
+"""
+Frozen chart support for iztro-py
+
+A frozen chart is immutable and hashable, so a single instance can be cached
+and handed to any number of threads without copying. Callers that need to
+modify a frozen chart take a mutable copy with FunctionalAstrolabe.thaw().
+"""
+
+from typing import Any, Dict, Optional, Type, TypeVar
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+_M = TypeVar("_M", bound=BaseModel)
+
+
+def frozen_instance_error(instance: Any, name: str, value: Any) -> ValidationError:
+    """构造与 pydantic 冻结模型一致的 frozen_instance 错误"""
+    return ValidationError.from_exception_data(
+        type(instance).__name__,
+        [{"type": "frozen_instance", "loc": (name,), "input": value}],
+    )
+
+
+class FrozenList(list):
+    """
+    只读列表
+
+    仍是 list 的子类，因此索引、遍历、序列化与比较的行为不变，
+    但所有修改操作都会抛出 TypeError。
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("FrozenList is read-only; call thaw() on the chart to modify it")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+# 冻结类 -> 对应的可变基类
+_MUTABLE_CLASSES: Dict[type, type] = {}
+_FROZEN_CLASSES: Dict[type, type] = {}
+
+
+def _frozen_class(cls: Type[_M]) -> Type[_M]:
+    """获取（必要时创建）cls 的冻结子类，与 cls 的实例按字段比较相等"""
+    frozen_cls = _FROZEN_CLASSES.get(cls)
+    if frozen_cls is None:
+
+        def __eq__(self: BaseModel, other: Any) -> bool:
+            if isinstance(other, cls):
+                return self.__dict__ == other.__dict__
+            return NotImplemented
+
+        def __hash__(self: BaseModel) -> int:
+            return hash(tuple(self.__dict__.values()))
+
+        def __reduce__(self: BaseModel) -> Any:
+            # 动态创建的类无法按名称 pickle，改为 pickle 可变副本并在加载时重新冻结
+            return (freeze_model, (cls(**self.__dict__),))
+
+        frozen_cls = type(cls)(
+            cls.__name__,
+            (cls,),
+            {
+                "__module__": cls.__module__,
+                "__doc__": cls.__doc__,
+                "__eq__": __eq__,
+                "__hash__": __hash__,
+                "__reduce__": __reduce__,
+                "model_config": ConfigDict(frozen=True),
+            },
+        )
+        frozen_cls = _FROZEN_CLASSES.setdefault(cls, frozen_cls)
+        _MUTABLE_CLASSES[frozen_cls] = cls
+    return frozen_cls
+
+
+def freeze_model(model: Optional[_M]) -> Optional[_M]:
+    """
+    获取普通 pydantic 模型（如 LunarDate）的不可变副本
+
+    Args:
+        model: 模型实例，可以为 None
+
+    Returns:
+        冻结的副本；已冻结的模型原样返回
+    """
+    if model is None or model.model_config.get("frozen"):
+        return model
+    return _frozen_class(type(model))(**model.__dict__)
+
+
+def thaw_model(model: Optional[_M]) -> Optional[_M]:
+    """
+    freeze_model() 的逆操作，返回可修改的副本
+
+    Args:
+        model: 模型实例，可以为 None
+
+    Returns:
+        可变副本；非 freeze_model() 产生的模型原样返回
+    """
+    if model is None:
+        return None
+    mutable_cls = _MUTABLE_CLASSES.get(type(model))
+    if mutable_cls is None:
+        return model
+    return mutable_cls(**model.__dict__)
+
+
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _freeze_value(value: Any) -> Any:
+    if type(value) in _SCALAR_TYPES or isinstance(value, FrozenList):
+        return value
+    if isinstance(value, list):
+        return FrozenList(_freeze_value(item) for item in value)
+    if isinstance(value, Freezable):
+        return value.freeze()
+    if isinstance(value, BaseModel):
+        return freeze_model(value)
+    return value
+
+
+class Freezable:
+    """
+    可冻结的功能类混入
+
+    冻结后禁止字段赋值（抛出 pydantic ValidationError，与冻结模型一致），
+    列表字段替换为只读的 FrozenList，并且实例可以哈希。
+    使用此混入的类需要在 __slots__ 中声明 "_frozen"，并在 __init__ 中将其初始化为 False。
+    """
+
+    __slots__ = ()
+
+    @property
+    def frozen(self) -> bool:
+        """是否已冻结"""
+        return getattr(self, "_frozen", False)
+
+    def freeze(self):
+        """
+        原地冻结（包括所有子对象），返回自身以便链式调用
+
+        Returns:
+            冻结后的自身
+        """
+        if getattr(self, "_frozen", False):
+            return self
+        values = self.__dict__
+        for name in values:
+            values[name] = _freeze_value(values[name])
+        object.__setattr__(self, "_frozen", True)
+        return self
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise frozen_instance_error(self, name, value)
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if getattr(self, "_frozen", False):
+            raise frozen_instance_error(self, name, None)
+        super().__delattr__(name)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 槽位不在 pydantic 的 pickle 状态中，单独保存冻结标记
+        state = super().__getstate__()  # type: ignore[misc]
+        state["_frozen"] = getattr(self, "_frozen", False)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        state = dict(state)
+        frozen = state.pop("_frozen", False)
+        super().__setstate__(state)  # type: ignore[misc]
+        object.__setattr__(self, "_frozen", frozen)
+
+    def __hash__(self) -> int:
+        if not getattr(self, "_frozen", False):
+            raise TypeError(f"unhashable type: '{type(self).__name__}' (call freeze() first)")
+        return hash(tuple(self.__dict__.values()))
@@ -5,22 +5,51 @@ The main class for interacting with a Zi Wei Dou Shu astrolabe.
 Provides rich API for querying palaces, stars, and their relationships.
 """
 
-from typing import List, Optional, Union
-from iztro_py.data.types import Astrolabe, PalaceName, StarName
+import hashlib
+from typing import Any, Dict, List, Optional, Union
+from iztro_py.data.types import (
+    Astrolabe,
+    FiveElementsClass,
+    Language,
+    Palace,
+    PalaceName,
+    Star,
+    StarName,
+)
+from iztro_py.astro.frozen import Freezable, thaw_model
 from iztro_py.astro.functional_palace import FunctionalPalace
 from iztro_py.astro.functional_star import FunctionalStar
 from iztro_py.astro.functional_surpalaces import FunctionalSurpalaces
+from iztro_py.astro.horoscope import get_horoscope
 from iztro_py.data.constants import get_surrounded_indices
-from iztro_py.i18n import t
-
-
-class FunctionalAstrolabe(Astrolabe):
+from iztro_py.data.earthly_branches import EARTHLY_BRANCHES_CONFIG
+from iztro_py.i18n import SUPPORTED_LANGUAGES, get_language, get_reverse_table, t
+from iztro_py.instrumentation import stage_timer
+from iztro_py.utils.calendar import parse_formatted_chinese_date, parse_formatted_lunar_date
+from iztro_py.utils.helpers import get_palace_index_by_name
+
+# 五行局名称 -> 五行局
+_FIVE_ELEMENTS_CLASSES = {
+    "水二局": FiveElementsClass.WATER_2,
+    "木三局": FiveElementsClass.WOOD_3,
+    "金四局": FiveElementsClass.METAL_4,
+    "土五局": FiveElementsClass.EARTH_5,
+    "火六局": FiveElementsClass.FIRE_6,
+}
+
+
+class FunctionalAstrolabe(Freezable, Astrolabe):
     """
     功能增强的星盘类
 
-    继承自Astrolabe，提供丰富的查询和链式调用API
+    继承自Astrolabe，提供丰富的查询和链式调用API。
+    调用 freeze() 后星盘（包括宫位和星曜）不可修改且可哈希，
+    可以被缓存并在多个线程间直接共享；需要修改时使用 thaw() 获取可变副本。
     """
 
+    # 冻结标志与缓存的哈希值、内容摘要
+    __slots__ = ("_frozen", "_hash", "_digest")
+
     def __init__(self, astrolabe: Astrolabe):
         """
         初始化FunctionalAstrolabe
@@ -46,14 +75,75 @@ class FunctionalAstrolabe(Astrolabe):
             body=astrolabe.body,
             five_elements_class=astrolabe.five_elements_class,
             palaces=functional_palaces,
+            language=astrolabe.language,
             raw_lunar_date=astrolabe.raw_lunar_date,
             raw_chinese_date=astrolabe.raw_chinese_date,
         )
 
+        object.__setattr__(self, "_frozen", False)
+        object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, "_digest", None)
+
         # 设置宫位的星盘引用
         for palace in self.palaces:
             palace.set_astrolabe(self)
 
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        super().__setstate__(state)
+        object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, "_digest", None)
+        # 宫位对星盘的反向引用不参与 pickle，加载后重新建立
+        for palace in self.palaces:
+            palace.set_astrolabe(self)
+
+    def thaw(self) -> "FunctionalAstrolabe":
+        """
+        获取星盘的可修改副本（写时复制）
+
+        原星盘保持不变，冻结的星盘可以继续被其他调用方共享。
+
+        Returns:
+            新的未冻结星盘
+
+        Example:
+            >>> chart = astro.by_solar('2000-8-16', 6, '男').freeze()
+            >>> editable = chart.thaw()
+            >>> editable.palace(0).major_stars.clear()
+        """
+        chart = type(self)(self)
+        chart.raw_lunar_date = thaw_model(chart.raw_lunar_date)
+        chart.raw_chinese_date = thaw_model(chart.raw_chinese_date)
+        for palace in chart.palaces:
+            palace.decadal = thaw_model(palace.decadal)
+        return chart
+
+    def __hash__(self) -> int:
+        # 星盘冻结后内容不再变化，哈希值只需计算一次
+        cached = getattr(self, "_hash", None)
+        if cached is None:
+            cached = super().__hash__()
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    def content_digest(self) -> str:
+        """
+        星盘全部内容（包括宫位与星曜）的摘要
+
+        与 cache.chart_fingerprint() 不同，创建后对星盘的修改也会反映在摘要中。
+        冻结的星盘只计算一次。
+
+        Returns:
+            32 位十六进制字符串，在不同进程之间稳定
+        """
+        cached = getattr(self, "_digest", None)
+        if cached is not None:
+            return cached
+        digest = hashlib.blake2b(self.model_dump_json().encode("utf-8"), digest_size=16)
+        cached = digest.hexdigest()
+        if self.frozen:
+            object.__setattr__(self, "_digest", cached)
+        return cached
+
     def palace(self, index_or_name: Union[int, PalaceName]) -> Optional[FunctionalPalace]:
         """
         获取指定的宫位对象
@@ -82,8 +172,6 @@ class FunctionalAstrolabe(Astrolabe):
                     return palace
 
             # 再尝试中文名
-            from iztro_py.utils.helpers import get_palace_index_by_name
-
             palace_index = get_palace_index_by_name(index_or_name)
             if palace_index is not None:
                 return self.palaces[palace_index]
@@ -204,8 +292,7 @@ class FunctionalAstrolabe(Astrolabe):
             >>> print(f"大限: {horoscope.decadal.name}")
             >>> print(f"流年: {horoscope.yearly.name}")
         """
-        from iztro_py.astro.horoscope import get_horoscope
-        from iztro_py.data.types import FiveElementsClass
+        timer = stage_timer("horoscope")
 
         # 获取出生年份
         birth_year = int(self.solar_date.split("-")[0])
@@ -215,14 +302,7 @@ class FunctionalAstrolabe(Astrolabe):
         soul_palace_index = soul_palace.index if soul_palace else 0
 
         # 获取五行局
-        five_elements_class_map = {
-            "水二局": FiveElementsClass.WATER_2,
-            "木三局": FiveElementsClass.WOOD_3,
-            "金四局": FiveElementsClass.METAL_4,
-            "土五局": FiveElementsClass.EARTH_5,
-            "火六局": FiveElementsClass.FIRE_6,
-        }
-        five_elements = five_elements_class_map.get(
+        five_elements = _FIVE_ELEMENTS_CLASSES.get(
             self.five_elements_class, FiveElementsClass.WATER_2
         )
 
@@ -230,14 +310,12 @@ class FunctionalAstrolabe(Astrolabe):
         if self.raw_chinese_date:
             year_branch = self.raw_chinese_date.year_branch
             # 从地支获取阴阳
-            from iztro_py.data.earthly_branches import EARTHLY_BRANCHES_CONFIG
-
             branch_config = EARTHLY_BRANCHES_CONFIG.get(year_branch)
             year_branch_yin_yang = branch_config.yin_yang if branch_config else "阳"
         else:
             year_branch_yin_yang = "阳"
 
-        return get_horoscope(
+        horoscope = get_horoscope(
             solar_date_str=solar_date,
             time_index=time_index,
             palaces=self.palaces,
@@ -247,6 +325,10 @@ class FunctionalAstrolabe(Astrolabe):
             year_branch_yin_yang=year_branch_yin_yang,
             birth_year=birth_year,
         )
+        if timer:
+            timer("horoscope")
+            timer.finish()
+        return horoscope
 
     def __str__(self) -> str:
         """字符串表示"""
@@ -281,16 +363,19 @@ class FunctionalAstrolabe(Astrolabe):
         - earthlyBranchOfSoulPalace, earthlyBranchOfBodyPalace, soul, body, fiveElementsClass
         - palaces: [{ name, isBodyPalace, isOriginalPalace, heavenlyStem, earthlyBranch, majorStars, minorStars }]
         """
+        # 使用星盘自身的语言，不读取全局语言设置
+        lang = self.language
+        timer = stage_timer("to_iztro_dict", {"language": lang})
 
         def tr_branch(branch_key: str) -> str:
-            return t(f"earthlyBranch.{branch_key}") if "Earthly" in branch_key else branch_key
+            return t(f"earthlyBranch.{branch_key}", lang) if "Earthly" in branch_key else branch_key
 
         def tr_stem(stem_key: str) -> str:
-            return t(f"heavenlyStem.{stem_key}") if "Heavenly" in stem_key else stem_key
+            return t(f"heavenlyStem.{stem_key}", lang) if "Heavenly" in stem_key else stem_key
 
-        def star_dict(star: FunctionalStar) -> dict:
+        def star_dict(star: Star) -> dict:
             return {
-                "name": star.translate_name(),
+                "name": star.translate_name(lang),
                 "type": star.type,
                 "scope": star.scope,
                 "brightness": star.brightness,
@@ -301,20 +386,18 @@ class FunctionalAstrolabe(Astrolabe):
         for p in self.palaces:
             palaces.append(
                 {
-                    "name": p.translate_name(),
+                    "name": p.translate_name(lang),
                     "isBodyPalace": p.is_body_palace,
                     "isOriginalPalace": p.is_original_palace,
                     "heavenlyStem": tr_stem(p.heavenly_stem),
                     "earthlyBranch": tr_branch(p.earthly_branch),
-                    "majorStars": [star_dict(s) for s in p.major_stars],
-                    "minorStars": [star_dict(s) for s in p.minor_stars],
-                    "adjectiveStars": [star_dict(s) for s in p.adjective_stars],
+                    "majorStars": [star_dict(s) for s in p.major_stars.interned()],
+                    "minorStars": [star_dict(s) for s in p.minor_stars.interned()],
+                    "adjectiveStars": [star_dict(s) for s in p.adjective_stars.interned()],
                 }
             )
 
-        from iztro_py.data.types import Star
-
-        return {
+        result = {
             "gender": self.gender,
             "solarDate": self.solar_date,
             "lunarDate": self.lunar_date,
@@ -325,8 +408,130 @@ class FunctionalAstrolabe(Astrolabe):
             "zodiac": self.zodiac,
             "earthlyBranchOfSoulPalace": tr_branch(self.earthly_branch_of_soul_palace),
             "earthlyBranchOfBodyPalace": tr_branch(self.earthly_branch_of_body_palace),
-            "soul": Star(name=self.soul, type="major", scope="origin").translate_name(),
-            "body": Star(name=self.body, type="major", scope="origin").translate_name(),
+            "soul": Star(name=self.soul, type="major", scope="origin").translate_name(lang),
+            "body": Star(name=self.body, type="major", scope="origin").translate_name(lang),
             "fiveElementsClass": self.five_elements_class,
             "palaces": palaces,
         }
+        if timer:
+            timer("render")
+            timer.finish()
+        return result
+
+    @classmethod
+    def from_iztro_dict(
+        cls, data: Dict[str, Any], language: Optional[Language] = None
+    ) -> "FunctionalAstrolabe":
+        """
+        从 to_iztro_dict() 导出的字典重建星盘（to_iztro_dict 的逆运算）
+
+        直接通过语言反向翻译表还原宫位、星曜、天干地支的英文键，
+        不做历法转换和安星计算，适合从存储中快速加载星盘。
+
+        Args:
+            data: to_iztro_dict() 的输出
+            language: 导出时使用的语言；不指定时依次尝试当前语言与其他支持的语言
+
+        Returns:
+            FunctionalAstrolabe对象
+
+        Raises:
+            ValueError: 如果字典中包含无法识别的名称
+
+        Example:
+            >>> saved = chart.to_iztro_dict()
+            >>> chart2 = FunctionalAstrolabe.from_iztro_dict(saved)
+            >>> chart2.star('ziweiMaj').palace().name
+        """
+        lang = language or _detect_iztro_dict_language(data)
+        table = get_reverse_table(lang)
+
+        def lookup(section: str, value: str) -> str:
+            key = table[section].get(value)
+            if key is not None:
+                return key
+            # 未翻译的值本身就是英文键
+            if value in table[section].values():
+                return value
+            raise ValueError(f"Unknown {section} name for language {lang}: {value!r}")
+
+        def build_star(item: Dict[str, Any]) -> Star:
+            return Star(
+                name=lookup("stars", item["name"]),
+                type=item["type"],
+                scope=item["scope"],
+                brightness=item.get("brightness"),
+                mutagen=item.get("mutagen"),
+            )
+
+        palaces = [
+            Palace(
+                index=i,
+                name=lookup("palaces", p["name"]),
+                is_body_palace=p["isBodyPalace"],
+                is_original_palace=p["isOriginalPalace"],
+                heavenly_stem=lookup("heavenlyStem", p["heavenlyStem"]),
+                earthly_branch=lookup("earthlyBranch", p["earthlyBranch"]),
+                major_stars=[build_star(s) for s in p["majorStars"]],
+                minor_stars=[build_star(s) for s in p["minorStars"]],
+                adjective_stars=[build_star(s) for s in p.get("adjectiveStars", [])],
+            )
+            for i, p in enumerate(data["palaces"])
+        ]
+
+        astrolabe = Astrolabe(
+            gender=data["gender"],
+            solar_date=data["solarDate"],
+            lunar_date=data["lunarDate"],
+            chinese_date=data["chineseDate"],
+            time=data["time"],
+            time_range=data["timeRange"],
+            sign=data["sign"],
+            zodiac=data["zodiac"],
+            earthly_branch_of_soul_palace=lookup(
+                "earthlyBranch", data["earthlyBranchOfSoulPalace"]
+            ),
+            earthly_branch_of_body_palace=lookup(
+                "earthlyBranch", data["earthlyBranchOfBodyPalace"]
+            ),
+            soul=lookup("stars", data["soul"]),
+            body=lookup("stars", data["body"]),
+            five_elements_class=data["fiveElementsClass"],
+            palaces=palaces,
+            language=lang,
+            raw_lunar_date=parse_formatted_lunar_date(data["lunarDate"]),
+            raw_chinese_date=parse_formatted_chinese_date(data["chineseDate"]),
+        )
+
+        return cls(astrolabe)
+
+
+def _detect_iztro_dict_language(data: Dict[str, Any]) -> str:
+    """
+    推断 to_iztro_dict() 输出所用的语言
+
+    以命宫地支、各宫位名称与主星、辅星名称能否全部被反向翻译为准，优先尝试当前语言。
+    只看宫位名称不够：日文与繁体中文的宫位名称、地支写法相同，星曜名称则不同。
+    """
+    current = get_language()
+    candidates = [current] + [lang for lang in SUPPORTED_LANGUAGES if lang != current]
+    palace_names = [palace["name"] for palace in data["palaces"]]
+    star_names = [
+        star["name"]
+        for palace in data["palaces"]
+        for star in palace.get("majorStars", []) + palace.get("minorStars", [])
+    ]
+
+    for lang in candidates:
+        table = get_reverse_table(lang)
+        # 未翻译的星曜保留英文键
+        known_stars = set(table["stars"]) | set(table["stars"].values())
+        if (
+            data["earthlyBranchOfSoulPalace"] in table["earthlyBranch"]
+            and palace_names
+            and all(name in table["palaces"] for name in palace_names)
+            and all(name in known_stars for name in star_names)
+        ):
+            return lang
+
+    raise ValueError("Unable to detect the language of the iztro dict")
@@ -4,22 +4,147 @@ FunctionalPalace class - Palace with functional methods
 Provides a rich API for querying palace properties and stars.
 """
 
-from typing import Optional, List, TYPE_CHECKING
-from iztro_py.data.types import Palace, StarName, Mutagen
+from typing import Any, Dict, Iterable, Iterator, Optional, List, TYPE_CHECKING
+from iztro_py.data.types import Palace, Star, StarName, Mutagen
+from iztro_py.astro.frozen import Freezable, FrozenList
 from iztro_py.astro.functional_star import FunctionalStar
+from iztro_py.star.pool import InternedStar, replace_star
 
 if TYPE_CHECKING:
     from iztro_py.astro.functional_astrolabe import FunctionalAstrolabe
     from iztro_py.astro.functional_surpalaces import FunctionalSurpalaces
 
 
-class FunctionalPalace(Palace):
+# 宫位中保存星曜的字段
+_STAR_FIELDS = ("major_stars", "minor_stars", "adjective_stars")
+
+
+def _interned(stars: Iterable[Star]) -> List[InternedStar]:
+    """把星曜转换为星曜池中的共享实例"""
+    if isinstance(stars, StarList):
+        return list.copy(stars)
+    return [star if type(star) is InternedStar else replace_star(star) for star in stars]
+
+
+class StarList(list):
+    """
+    宫位中的星曜列表
+
+    列表中保存的是星曜池中的共享实例（见 iztro_py.star.pool），所有星盘共用，
+    宫位归属由列表所在的宫位表示。取出的元素是绑定到该宫位的 FunctionalStar，
+    因此 palace.major_stars[0].palace() 等链式调用可用；
+    写入的星曜（Star 或 FunctionalStar）会被替换为对应的共享实例。
+    """
+
+    __slots__ = ("_palace",)
+
+    def __init__(self, palace: "FunctionalPalace", stars: Iterable[Star] = ()):
+        super().__init__(_interned(stars))
+        self._palace = palace
+
+    def _bind(self, star: InternedStar) -> FunctionalStar:
+        return FunctionalStar(star, self._palace)
+
+    def interned(self) -> List[InternedStar]:
+        """
+        列表中保存的共享实例
+
+        返回的星曜不绑定宫位且不可修改；只需读取星曜字段时，比逐个取出元素开销更小。
+        """
+        return list.copy(self)
+
+    def __getitem__(self, index: Any) -> Any:
+        value = list.__getitem__(self, index)
+        if isinstance(index, slice):
+            return [self._bind(star) for star in value]
+        return self._bind(value)
+
+    def __iter__(self) -> Iterator[FunctionalStar]:
+        return map(self._bind, list.__iter__(self))
+
+    def __reversed__(self) -> Iterator[FunctionalStar]:
+        return map(self._bind, list.__reversed__(self))
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            list.__setitem__(self, index, _interned(value))
+        else:
+            list.__setitem__(self, index, replace_star(value))
+
+    def __iadd__(self, values: Iterable[Star]) -> "StarList":  # type: ignore[override,misc]
+        list.extend(self, _interned(values))
+        return self
+
+    def __add__(self, other: List[Any]) -> List[Any]:  # type: ignore[override]
+        return list(self) + list(other)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, list):
+            return NotImplemented
+        return list.__eq__(self, _interned(other))
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __contains__(self, value: Any) -> bool:
+        return isinstance(value, Star) and list.__contains__(self, replace_star(value))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self) -> Any:
+        # 宫位在 __setstate__ / __deepcopy__ 中重新绑定
+        return (list, (list.copy(self),))
+
+    def append(self, star: Star) -> None:
+        list.append(self, replace_star(star))
+
+    def insert(self, index: Any, star: Star) -> None:
+        list.insert(self, index, replace_star(star))
+
+    def extend(self, stars: Iterable[Star]) -> None:
+        list.extend(self, _interned(stars))
+
+    def remove(self, star: Star) -> None:
+        list.remove(self, replace_star(star))
+
+    def index(self, star: Star, *args: Any) -> int:
+        return list.index(self, replace_star(star), *args)
+
+    def count(self, star: Any) -> int:
+        return list.count(self, replace_star(star)) if isinstance(star, Star) else 0
+
+    def pop(self, index: Any = -1) -> FunctionalStar:
+        return self._bind(list.pop(self, index))
+
+    def copy(self) -> List[FunctionalStar]:
+        return list(self)
+
+
+class FrozenStarList(FrozenList, StarList):
+    """冻结宫位的星曜列表：只读，取出的星曜同样不可修改"""
+
+    __slots__ = ()
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(tuple(list.__iter__(self)))
+
+    def __reduce__(self) -> Any:
+        return StarList.__reduce__(self)
+
+
+class FunctionalPalace(Freezable, Palace):
     """
     功能增强的宫位类
 
-    继承自Palace，添加了星曜查询方法和关联星盘的能力
+    继承自Palace，添加了星曜查询方法和关联星盘的能力。
+    星曜字段为 StarList：保存星曜池中的共享实例，取出时绑定到本宫位。
     """
 
+    # 所属星盘与冻结标志放在 slot 中，不参与字段比较、序列化与复制
+    __slots__ = ("_astrolabe", "_frozen")
+
     def __init__(self, palace: Palace):
         """
         初始化FunctionalPalace
@@ -27,10 +152,10 @@ class FunctionalPalace(Palace):
         Args:
             palace: 基础Palace对象
         """
-        # 转换星曜为FunctionalStar
-        major_stars = [FunctionalStar(s) for s in palace.major_stars]
-        minor_stars = [FunctionalStar(s) for s in palace.minor_stars]
-        adjective_stars = [FunctionalStar(s) for s in palace.adjective_stars]
+        # 星曜保存为共享实例，不为每张星盘创建星曜对象
+        major_stars = _interned(palace.major_stars)
+        minor_stars = _interned(palace.minor_stars)
+        adjective_stars = _interned(palace.adjective_stars)
 
         super().__init__(
             index=palace.index,
@@ -50,20 +175,62 @@ class FunctionalPalace(Palace):
             ages=palace.ages,
         )
 
-        self._astrolabe: Optional["FunctionalAstrolabe"] = None
-
-        # 设置星曜的宫位引用
-        for star in self.major_stars + self.minor_stars + self.adjective_stars:
-            star.set_palace(self)
+        object.__setattr__(self, "_astrolabe", None)
+        object.__setattr__(self, "_frozen", False)
+        self._bind_stars(StarList)
+
+    def _bind_stars(self, list_class: type) -> None:
+        """把星曜字段包装为绑定到本宫位的 StarList / FrozenStarList"""
+        values = self.__dict__
+        for name in _STAR_FIELDS:
+            values[name] = list_class(self, values[name])
+
+    def _replace_star(self, star_name: StarName, star: Star) -> None:
+        """把宫位中名为 star_name 的星曜替换为 star（FunctionalStar 的字段赋值写回宫位）"""
+        for name in _STAR_FIELDS:
+            stars = self.__dict__[name]
+            for i, stored in enumerate(list.__iter__(stars)):
+                if stored.name == star_name:
+                    stars[i] = star
+                    return
+
+    def _stars(self) -> List[InternedStar]:
+        """宫位中全部星曜的共享实例"""
+        values = self.__dict__
+        return [star for name in _STAR_FIELDS for star in list.__iter__(values[name])]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _STAR_FIELDS:
+            value = StarList(self, value)
+        super().__setattr__(name, value)
+
+    def freeze(self):
+        if not self.frozen:
+            self._bind_stars(FrozenStarList)
+        return super().freeze()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        super().__setstate__(state)
+        # 反向引用不参与 pickle，加载后重新建立
+        object.__setattr__(self, "_astrolabe", None)
+        self._bind_stars(FrozenStarList if self.frozen else StarList)
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "FunctionalPalace":
+        palace = super().__deepcopy__(memo)
+        palace._bind_stars(StarList)
+        return palace
 
     def set_astrolabe(self, astrolabe: "FunctionalAstrolabe") -> None:
         """
         设置宫位所属的星盘
 
+        宫位持有星盘的强引用，因此无论从哪条路径取得宫位（chart.palaces[i]、
+        chart.palace()、star.palace()），都可以继续链式调用。
+
         Args:
             astrolabe: 星盘对象
         """
-        self._astrolabe = astrolabe
+        object.__setattr__(self, "_astrolabe", astrolabe)
 
     def astrolabe(self) -> Optional["FunctionalAstrolabe"]:
         """
@@ -72,7 +239,32 @@ class FunctionalPalace(Palace):
         Returns:
             星盘对象，如果未设置则返回None
         """
-        return self._astrolabe
+        return getattr(self, "_astrolabe", None)
+
+    def _chart_language(self) -> Optional[str]:
+        """所属星盘的语言；未设置时为None（即使用当前语言）"""
+        astrolabe = getattr(self, "_astrolabe", None)
+        return None if astrolabe is None else astrolabe.language
+
+    def translate_name(self, lang: Optional[str] = None) -> str:
+        """
+        翻译宫位名称
+
+        Args:
+            lang: 目标语言代码，如不指定则使用所属星盘的语言
+
+        Returns:
+            翻译后的宫位名称
+        """
+        return super().translate_name(lang or self._chart_language())
+
+    def translate_heavenly_stem(self, lang: Optional[str] = None) -> str:
+        """翻译天干（默认使用所属星盘的语言）"""
+        return super().translate_heavenly_stem(lang or self._chart_language())
+
+    def translate_earthly_branch(self, lang: Optional[str] = None) -> str:
+        """翻译地支（默认使用所属星盘的语言）"""
+        return super().translate_earthly_branch(lang or self._chart_language())
 
     def has(self, stars: List[StarName]) -> bool:
         """
@@ -87,8 +279,7 @@ class FunctionalPalace(Palace):
         Example:
             >>> palace.has(['紫微', '天府'])
         """
-        all_stars = self.major_stars + self.minor_stars + self.adjective_stars
-        star_names = [s.name for s in all_stars]
+        star_names = [s.name for s in self._stars()]
 
         return all(star in star_names for star in stars)
 
@@ -105,8 +296,7 @@ class FunctionalPalace(Palace):
         Example:
             >>> palace.has_one_of(['紫微', '天府'])
         """
-        all_stars = self.major_stars + self.minor_stars + self.adjective_stars
-        star_names = [s.name for s in all_stars]
+        star_names = [s.name for s in self._stars()]
 
         return any(star in star_names for star in stars)
 
@@ -123,8 +313,7 @@ class FunctionalPalace(Palace):
         Example:
             >>> palace.not_have(['火星', '铃星'])
         """
-        all_stars = self.major_stars + self.minor_stars + self.adjective_stars
-        star_names = [s.name for s in all_stars]
+        star_names = [s.name for s in self._stars()]
 
         return all(star not in star_names for star in stars)
 
@@ -141,8 +330,7 @@ class FunctionalPalace(Palace):
         Example:
             >>> palace.has_mutagen('禄')
         """
-        all_stars = self.major_stars + self.minor_stars + self.adjective_stars
-        return any(s.mutagen == mutagen for s in all_stars)
+        return any(s.mutagen == mutagen for s in self._stars())
 
     def not_have_mutagen(self, mutagen: Mutagen) -> bool:
         """
@@ -173,7 +361,7 @@ class FunctionalPalace(Palace):
             >>> palace.is_empty()
             >>> palace.is_empty(exclude_stars=['禄存', '天马'])
         """
-        major_stars = self.major_stars
+        major_stars = self.major_stars.interned()
 
         if exclude_stars:
             major_stars = [s for s in major_stars if s.name not in exclude_stars]
@@ -190,11 +378,9 @@ class FunctionalPalace(Palace):
         Returns:
             星曜对象，如果不存在则返回None
         """
-        all_stars = self.major_stars + self.minor_stars + self.adjective_stars
-
-        for star in all_stars:
+        for star in self._stars():
             if star.name == star_name:
-                return star
+                return FunctionalStar(star, self)
 
         return None
 
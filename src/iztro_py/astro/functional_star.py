@@ -4,27 +4,36 @@ FunctionalStar class - Star with functional methods
 Provides a rich API for querying star properties and relationships.
 """
 
-from typing import Optional, TYPE_CHECKING, List, Union
+from typing import Any, Optional, TYPE_CHECKING, List, Union
 from iztro_py.data.types import Star, Brightness, Mutagen
+from iztro_py.astro.frozen import Freezable
+from iztro_py.data.constants import get_opposite_index
+from iztro_py.star.pool import intern_star
 
 if TYPE_CHECKING:
     from iztro_py.astro.functional_palace import FunctionalPalace
     from iztro_py.astro.functional_surpalaces import FunctionalSurpalaces
 
 
-class FunctionalStar(Star):
+class FunctionalStar(Freezable, Star):
     """
     功能增强的星曜类
 
-    继承自Star，添加了查询方法和关联宫位的能力
+    继承自Star，添加了查询方法和关联宫位的能力。
+    宫位中保存的是星曜池中的共享实例，从宫位或星盘取出星曜时才创建绑定到该宫位的
+    FunctionalStar；对其字段赋值会写回所在宫位（宫位冻结时不可修改）。
     """
 
-    def __init__(self, star: Star):
+    # 所在宫位与冻结标志放在 slot 中，不参与字段比较、序列化与复制
+    __slots__ = ("_palace", "_frozen")
+
+    def __init__(self, star: Star, palace: Optional["FunctionalPalace"] = None):
         """
         初始化FunctionalStar
 
         Args:
             star: 基础Star对象
+            palace: 所在宫位（可选）
         """
         super().__init__(
             name=star.name,
@@ -33,7 +42,19 @@ class FunctionalStar(Star):
             brightness=star.brightness,
             mutagen=star.mutagen,
         )
-        self._palace: Optional["FunctionalPalace"] = None
+        object.__setattr__(self, "_palace", palace)
+        object.__setattr__(self, "_frozen", palace is not None and palace.frozen)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        palace = getattr(self, "_palace", None)
+        if palace is None or name not in Star.model_fields:
+            super().__setattr__(name, value)
+            return
+        # 宫位中保存的是共享实例：先取得（并校验）新状态的共享实例，再写回宫位
+        star_name = self.name
+        star = intern_star(**{**self.__dict__, name: value})
+        super().__setattr__(name, value)
+        palace._replace_star(star_name, star)
 
     def set_palace(self, palace: "FunctionalPalace") -> None:
         """
@@ -42,7 +63,7 @@ class FunctionalStar(Star):
         Args:
             palace: 宫位对象
         """
-        self._palace = palace
+        object.__setattr__(self, "_palace", palace)
 
     def palace(self) -> Optional["FunctionalPalace"]:
         """
@@ -51,7 +72,36 @@ class FunctionalStar(Star):
         Returns:
             宫位对象，如果未设置则返回None
         """
-        return self._palace
+        return getattr(self, "_palace", None)
+
+    def _chart_language(self) -> Optional[str]:
+        """所属星盘的语言；未设置宫位时为None（即使用当前语言）"""
+        palace = getattr(self, "_palace", None)
+        return None if palace is None else palace._chart_language()
+
+    def translate_name(self, lang: Optional[str] = None) -> str:
+        """
+        翻译星曜名称
+
+        Args:
+            lang: 目标语言代码，如不指定则使用所属星盘的语言
+
+        Returns:
+            翻译后的星曜名称
+        """
+        return super().translate_name(lang or self._chart_language())
+
+    def translate_brightness(self, lang: Optional[str] = None) -> Optional[str]:
+        """
+        翻译亮度
+
+        Args:
+            lang: 目标语言代码，如不指定则使用所属星盘的语言
+
+        Returns:
+            翻译后的亮度，如无亮度则返回 None
+        """
+        return super().translate_brightness(lang or self._chart_language())
 
     def with_brightness(self, brightness: Union[Brightness, List[Brightness]]) -> bool:
         """
@@ -98,15 +148,14 @@ class FunctionalStar(Star):
         Returns:
             对宫对象，如果未设置宫位则返回None
         """
-        if not self._palace:
+        palace = self.palace()
+        if not palace:
             return None
 
-        from iztro_py.data.constants import get_opposite_index
-
-        opposite_index = get_opposite_index(self._palace.index)
+        opposite_index = get_opposite_index(palace.index)
 
         # 从星盘中获取对宫
-        astrolabe = self._palace.astrolabe()
+        astrolabe = palace.astrolabe()
         if astrolabe:
             return astrolabe.palace(opposite_index)
 
@@ -119,12 +168,13 @@ class FunctionalStar(Star):
         Returns:
             三方四正对象，如果未设置宫位则返回None
         """
-        if not self._palace:
+        palace = self.palace()
+        if not palace:
             return None
 
-        astrolabe = self._palace.astrolabe()
+        astrolabe = palace.astrolabe()
         if astrolabe:
-            return astrolabe.surrounded_palaces(self._palace.index)
+            return astrolabe.surrounded_palaces(palace.index)
 
         return None
 
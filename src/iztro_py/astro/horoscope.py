@@ -30,6 +30,7 @@ from iztro_py.utils.helpers import (
     fix_index,
 )
 from iztro_py.data.constants import HEAVENLY_STEMS, EARTHLY_BRANCHES, fix_index as const_fix_index
+from iztro_py.data.heavenly_stems import get_mutagen
 
 
 def get_horoscope(
@@ -419,8 +420,6 @@ def _get_mutagen_stars(stem: HeavenlyStemName) -> List[StarName]:
     Returns:
         四化星列表 [禄, 权, 科, 忌]
     """
-    from iztro_py.data.heavenly_stems import get_mutagen
-
     return get_mutagen(stem)
 
 
@@ -5,9 +5,61 @@ Contains functions for calculating palace positions, especially
 the soul palace (命宫) and body palace (身宫).
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from iztro_py.data.types import SoulAndBody, HeavenlyStemName, EarthlyBranchName
-from iztro_py.data.constants import HEAVENLY_STEMS, EARTHLY_BRANCHES, TIGER_RULE, fix_index
+from iztro_py.data.constants import (
+    HEAVENLY_STEMS,
+    HEAVENLY_STEM_INDEX,
+    EARTHLY_BRANCHES,
+    PALACES,
+    TIGER_RULE,
+    fix_index,
+)
+
+
+def _soul_and_body_indices(lunar_month: int, time_index: int) -> Tuple[int, int]:
+    """
+    命宫、身宫地支索引的原始算法（用于建表，以及表外输入的回退）
+
+    1. 命宫：寅起正月，顺数至生月，再逆数生时
+    2. 身宫：从生月宫位顺数生时
+    """
+    # 寅 = 索引2，正月 = lunar_month 1
+    birth_month_palace_index = fix_index(2 + lunar_month - 1)
+
+    # 0(早子时)和12(晚子时)都对应子时
+    actual_time_index = 0 if time_index == 12 else time_index
+
+    return (
+        fix_index(birth_month_palace_index - actual_time_index),
+        fix_index(birth_month_palace_index + actual_time_index),
+    )
+
+
+# 以下各表在导入时一次性生成，排盘时只做索引，不再逐步推算
+
+# (命宫索引, 身宫索引)：SOUL_BODY_TABLE[(lunar_month - 1) * 13 + time_index]
+SOUL_BODY_TABLE: Tuple[Tuple[int, int], ...] = tuple(
+    _soul_and_body_indices(month, time) for month in range(1, 13) for time in range(13)
+)
+
+# 命宫天干（五虎遁：由年干定寅宫天干，再数到命宫）：
+# SOUL_STEM_TABLE[year_stem_index * 12 + soul_index]
+SOUL_STEM_TABLE: Tuple[HeavenlyStemName, ...] = tuple(
+    HEAVENLY_STEMS[(HEAVENLY_STEMS.index(TIGER_RULE[stem]) + (soul - 2) % 12) % 10]
+    for stem in HEAVENLY_STEMS
+    for soul in range(12)
+)
+
+# 从命宫起十二宫的天干：PALACE_STEMS_TABLE[命宫天干索引][i]
+PALACE_STEMS_TABLE: Tuple[Tuple[HeavenlyStemName, ...], ...] = tuple(
+    tuple(HEAVENLY_STEMS[(stem + i) % 10] for i in range(12)) for stem in range(10)
+)
+
+# 从命宫起十二宫的地支：PALACE_BRANCHES_TABLE[命宫索引][i]
+PALACE_BRANCHES_TABLE: Tuple[Tuple[EarthlyBranchName, ...], ...] = tuple(
+    tuple(EARTHLY_BRANCHES[(soul + i) % 12] for i in range(12)) for soul in range(12)
+)
 
 
 def get_soul_and_body(
@@ -19,6 +71,9 @@ def get_soul_and_body(
     算法：
     1. 命宫：寅起正月，顺数至生月，再逆数生时
     2. 身宫：从生月宫位顺数生时
+    3. 命宫天干：五虎遁由年干定寅宫天干，顺数至命宫
+
+    结果直接查 SOUL_BODY_TABLE / SOUL_STEM_TABLE。
 
     Args:
         lunar_month: 农历月份 (1-12)
@@ -28,48 +83,16 @@ def get_soul_and_body(
     Returns:
         SoulAndBody对象，包含命宫和身宫的索引及天干地支
     """
-    # 1. 寅起正月，顺数至生月
-    # 寅 = 索引2，正月 = lunar_month 1
-    # 生月宫位索引 = (2 + lunar_month - 1) % 12
-    birth_month_palace_index = fix_index(2 + lunar_month - 1)
-
-    # 2. 从生月宫位逆数生时，得到命宫
-    # 时辰索引转换：0(早子时)和12(晚子时)都对应子时，其他时辰直接对应
-    actual_time_index = 0 if time_index == 12 else time_index
-
-    # 逆数：减去时辰数
-    soul_index = fix_index(birth_month_palace_index - actual_time_index)
-
-    # 3. 从生月宫位顺数生时，得到身宫
-    body_index = fix_index(birth_month_palace_index + actual_time_index)
-
-    # 4. 计算命宫地支
-    earthly_branch_of_soul = EARTHLY_BRANCHES[soul_index]
-
-    # 5. 计算命宫天干（使用五虎遁）
-    # 先找到寅宫的天干
-    # 五虎遁：根据年干确定寅月（正月）的天干
-    yin_month_stem = TIGER_RULE[year_stem]
-    yin_month_stem_index = HEAVENLY_STEMS.index(yin_month_stem)
-
-    # 寅宫索引是2，命宫索引是soul_index
-    # 计算从寅宫到命宫的天干偏移
-    # 地支顺序：子丑寅卯辰巳午未申酉戌亥
-    # 从寅(2)到命宫的距离
-    if soul_index >= 2:
-        offset = soul_index - 2
+    if 1 <= lunar_month <= 12 and 0 <= time_index <= 12:
+        soul_index, body_index = SOUL_BODY_TABLE[(lunar_month - 1) * 13 + time_index]
     else:
-        offset = soul_index + 12 - 2
-
-    # 命宫天干
-    heavenly_stem_of_soul_index = fix_index(yin_month_stem_index + offset, 10)
-    heavenly_stem_of_soul = HEAVENLY_STEMS[heavenly_stem_of_soul_index]
+        soul_index, body_index = _soul_and_body_indices(lunar_month, time_index)
 
     return SoulAndBody(
         soul_index=soul_index,
         body_index=body_index,
-        heavenly_stem_of_soul=heavenly_stem_of_soul,
-        earthly_branch_of_soul=earthly_branch_of_soul,
+        heavenly_stem_of_soul=SOUL_STEM_TABLE[HEAVENLY_STEM_INDEX[year_stem] * 12 + soul_index],
+        earthly_branch_of_soul=EARTHLY_BRANCHES[soul_index],
     )
 
 
@@ -87,7 +110,7 @@ def get_palace_heavenly_stem(
     Returns:
         目标宫位的天干
     """
-    soul_stem_index = HEAVENLY_STEMS.index(soul_palace_stem)
+    soul_stem_index = HEAVENLY_STEM_INDEX[soul_palace_stem]
 
     # 计算从命宫到目标宫位的距离
     if palace_index >= soul_palace_index:
@@ -190,35 +213,23 @@ def initialize_palaces(soul_and_body: SoulAndBody) -> List[Dict[str, Any]]:
     Returns:
         包含12个宫位基础信息的列表
     """
-    from iztro_py.data.constants import PALACES
-
-    palaces = []
-
     # 重要：宫位地支是从命宫的地支开始，按地支顺序排列
     # 例如：命宫在亥 -> 父母宫在子 -> 福德宫在丑 -> ...
     soul_index = soul_and_body.soul_index
-    body_index = soul_and_body.body_index
+    branches = PALACE_BRANCHES_TABLE[soul_index]
+    stems = PALACE_STEMS_TABLE[HEAVENLY_STEM_INDEX[soul_and_body.heavenly_stem_of_soul]]
 
     # 计算身宫在宫位序列中的相对索引（以命宫所在宫位为0）
-    body_palace_rel_index = fix_index(body_index - soul_index)
+    body_palace_rel_index = fix_index(soul_and_body.body_index - soul_index)
 
-    for i in range(12):
-        # 计算这个宫位对应的地支索引
-        # 从命宫开始，i=0是命宫，i=1是父母宫等
-        earthly_branch_index = fix_index(soul_index + i)
-
-        # 判断该宫位是否为身宫（相对命宫的序列位置等于身宫相对索引）
-        is_body = i == body_palace_rel_index
-
-        palace: Dict[str, Any] = {
+    return [
+        {
             "index": i,
             "name": PALACES[i],
-            "is_body_palace": is_body,
+            "is_body_palace": i == body_palace_rel_index,
             "is_original_palace": (i == 0),  # 第0个宫位总是命宫
-            "earthly_branch": EARTHLY_BRANCHES[earthly_branch_index],
-            "heavenly_stem": get_palace_heavenly_stem(
-                earthly_branch_index, soul_and_body.soul_index, soul_and_body.heavenly_stem_of_soul
-            ),
+            "earthly_branch": branches[i],
+            "heavenly_stem": stems[i],
             "major_stars": [],
             "minor_stars": [],
             "adjective_stars": [],
@@ -229,7 +240,5 @@ def initialize_palaces(soul_and_body: SoulAndBody) -> List[Dict[str, Any]]:
             "decadal": None,
             "ages": [],
         }
-
-        palaces.append(palace)
-
-    return palaces
+        for i in range(12)
+    ]
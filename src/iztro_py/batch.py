@@ -0,0 +1,581 @@
+"""
+Batch chart computation for iztro-py
+
+Streams birth records through a process pool and yields results in input
+order, keeping memory bounded by the number of chunks in flight:
+
+    >>> from iztro_py.batch import read_records, run_batch
+    >>> for row in run_batch(read_records("births.csv"), workers=4):
+    ...     print(row.line, row.error or row.result["soul"])
+
+A record is a mapping with these fields (CSV columns or JSONL keys):
+
+    date           'YYYY-M-D'（阳历或农历，取决于 calendar）
+    time_index     时辰索引 0-12，或者用 hour 给出 0-23 点
+    gender         '男'/'女'，也接受 male/female、m/f
+    calendar       'solar'（默认）或 'lunar'
+    is_leap_month  农历闰月，默认 false
+    fix_leap       是否修正闰月，默认 true
+    language       输出语言，默认 'zh-CN'
+    id             可选，原样写入输出
+
+Within a chunk, records of the same chart class (same calendar, date, time
+index, gender, leap flags and language) are computed once.
+
+run_job() wraps run_batch() for very large inputs: it processes one shard
+(i of n, by record hash) and writes each finished chunk to its own file, so
+an interrupted job resumes where it stopped and several machines can share
+a job directory on a shared filesystem.
+
+The command line front end is ``iztro-py batch`` (see iztro_py.cli).
+"""
+
+import csv
+import hashlib
+import json
+import os
+import socket
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from iztro_py import astro
+from iztro_py.cache import date_key
+from iztro_py.utils.helpers import hour_to_time_index
+
+# 输出格式：json（to_iztro_dict 的 JSON 文本）、dict（to_iztro_dict）、chart（星盘对象）
+RENDERERS = ("json", "dict", "chart")
+
+_GENDERS = {
+    "男": "男",
+    "女": "女",
+    "male": "男",
+    "female": "女",
+    "m": "男",
+    "f": "女",
+}
+_TRUE = {"1", "true", "yes", "y", "t"}
+_FALSE = {"0", "false", "no", "n", "f", ""}
+
+# (calendar, date, time_index, gender, is_leap_month, fix_leap, language)
+ChartRequest = Tuple[str, str, int, str, bool, bool, str]
+
+
+class BatchRow:
+    """
+    一条记录的处理结果
+
+    Attributes:
+        line: 记录序号（从 1 开始；CSV 不含表头）
+        id: 记录中的 id 字段（没有时为 None）
+        result: 渲染后的结果，出错时为 None
+        error: 错误信息，成功时为 None
+    """
+
+    __slots__ = ("line", "id", "result", "error")
+
+    def __init__(self, line: int, id: Any, result: Any = None, error: Optional[str] = None):
+        self.line = line
+        self.id = id
+        self.result = result
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"BatchRow(line={self.line}, id={self.id!r}, error={self.error!r})"
+
+
+def _flag(value: Any, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"Invalid boolean: {value!r}")
+
+
+def parse_record(record: Dict[str, Any], language: str = "zh-CN") -> ChartRequest:
+    """
+    校验并规范化一条出生记录
+
+    Args:
+        record: 出生记录（字段见模块说明）
+        language: 记录未指定语言时使用的语言
+
+    Returns:
+        规范化的星盘请求，相同的请求属于同一星盘类别
+
+    Raises:
+        ValueError: 如果记录无效
+    """
+    calendar = str(record.get("calendar") or "solar").strip().lower()
+    if calendar not in ("solar", "lunar"):
+        raise ValueError(f"Invalid calendar: {calendar!r}")
+
+    date = str(record.get("date") or "").strip()
+    key = date_key(date)
+    if not isinstance(key, tuple) or len(key) != 3:
+        raise ValueError(f"Invalid date: {date!r}")
+    date = "-".join(map(str, key))
+
+    if record.get("time_index") not in (None, ""):
+        time_index = int(record["time_index"])
+    elif record.get("hour") not in (None, ""):
+        hour = int(record["hour"])
+        if not 0 <= hour <= 23:
+            raise ValueError(f"Invalid hour: {hour}")
+        time_index = hour_to_time_index(hour)
+    else:
+        raise ValueError("Missing time_index or hour")
+    if not 0 <= time_index <= 12:
+        raise ValueError(f"Invalid time_index: {time_index}")
+
+    gender = _GENDERS.get(str(record.get("gender") or "").strip().lower())
+    if gender is None:
+        raise ValueError(f"Invalid gender: {record.get('gender')!r}")
+
+    return (
+        calendar,
+        date,
+        time_index,
+        gender,
+        _flag(record.get("is_leap_month"), False),
+        _flag(record.get("fix_leap"), True),
+        str(record.get("language") or language),
+    )
+
+
+def compute(request: ChartRequest) -> Any:
+    """
+    计算一个规范化的星盘请求
+
+    Args:
+        request: parse_record() 的返回值
+
+    Returns:
+        FunctionalAstrolabe对象
+    """
+    calendar, date, time_index, gender, is_leap_month, fix_leap, language = request
+    if calendar == "lunar":
+        return astro.by_lunar(date, time_index, gender, is_leap_month, fix_leap, language)
+    return astro.by_solar(date, time_index, gender, fix_leap, language)
+
+
+def _render_json(chart: Any) -> str:
+    return json.dumps(chart.to_iztro_dict(), ensure_ascii=False, separators=(",", ":"))
+
+
+_RENDER: Dict[str, Callable[[Any], Any]] = {
+    "json": _render_json,
+    "dict": lambda chart: chart.to_iztro_dict(),
+    "chart": lambda chart: chart,
+}
+
+
+def _compute_chunk(requests: List[ChartRequest], render: str) -> List[Tuple[bool, Any]]:
+    """计算一组互不相同的请求（在工作进程中运行），返回 (是否成功, 结果或错误信息) 列表"""
+    renderer = _RENDER[render]
+    results: List[Tuple[bool, Any]] = []
+    for request in requests:
+        try:
+            results.append((True, renderer(compute(request))))
+        except Exception as e:  # 单条记录出错不影响整批
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+class _Chunk:
+    """一批记录：解析结果、去重后的请求以及正在计算的 future"""
+
+    def __init__(self, rows: List[BatchRow], slots: List[Optional[int]], requests: List[Any]):
+        self.rows = rows
+        self.slots = slots  # 每条记录对应 requests 中的位置，解析失败为 None
+        self.requests = requests
+        self.future: Optional["Future[List[Tuple[bool, Any]]]"] = None
+        self.number = 0  # 在任务中的块序号（run_job 使用）
+
+    def finish(self, results: List[Tuple[bool, Any]]) -> List[BatchRow]:
+        for row, slot in zip(self.rows, self.slots):
+            if slot is not None:
+                ok, value = results[slot]
+                if ok:
+                    row.result = value
+                else:
+                    row.error = value
+        return self.rows
+
+
+def _groups(
+    numbered: Iterable[Tuple[int, Dict[str, Any]]], chunk_size: int
+) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    """把 (序号, 记录) 按 chunk_size 分组"""
+    group: List[Tuple[int, Dict[str, Any]]] = []
+    for item in numbered:
+        group.append(item)
+        if len(group) >= chunk_size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def _make_chunk(group: List[Tuple[int, Dict[str, Any]]], language: str) -> _Chunk:
+    rows: List[BatchRow] = []
+    slots: List[Optional[int]] = []
+    index: Dict[ChartRequest, int] = {}
+    for line, record in group:
+        row = BatchRow(line, record.get("id") if isinstance(record, dict) else None)
+        slot = None
+        if isinstance(record, dict) and "_error" in record:
+            row.error = record["_error"]
+        else:
+            try:
+                request = parse_record(record, language)
+                slot = index.setdefault(request, len(index))
+            except (TypeError, ValueError, AttributeError) as e:
+                row.error = f"{type(e).__name__}: {e}"
+        rows.append(row)
+        slots.append(slot)
+    return _Chunk(rows, slots, list(index))
+
+
+def _compute_chunks(
+    chunks: Iterable[_Chunk], workers: int, render: str, max_pending: Optional[int]
+) -> Iterator[_Chunk]:
+    """计算各批次，按输入顺序产出已完成的批次"""
+    if workers == 1:
+        for chunk in chunks:
+            chunk.finish(_compute_chunk(chunk.requests, render))
+            yield chunk
+        return
+
+    max_pending = max_pending or workers * 2
+    pending: Deque[_Chunk] = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for chunk in chunks:
+            chunk.future = executor.submit(_compute_chunk, chunk.requests, render)
+            pending.append(chunk)
+            while len(pending) >= max_pending:
+                done = pending.popleft()
+                done.finish(done.future.result())
+                yield done
+        while pending:
+            done = pending.popleft()
+            done.finish(done.future.result())
+            yield done
+
+
+def _check_arguments(render: str, chunk_size: int) -> None:
+    if render not in RENDERERS:
+        raise ValueError(f"Unknown render format: {render!r}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+
+def run_batch(
+    records: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    render: str = "json",
+    language: str = "zh-CN",
+    max_pending: Optional[int] = None,
+) -> Iterator[BatchRow]:
+    """
+    批量计算星盘，按输入顺序逐条产出结果
+
+    同时最多有 max_pending 个批次在计算，内存占用与输入规模无关。
+
+    Args:
+        records: 出生记录（可以是生成器，见 read_records()）
+        workers: 工作进程数，默认 CPU 核数；1 表示在当前进程中计算
+        chunk_size: 每批记录数，批内按星盘类别去重
+        render: 结果格式，见 RENDERERS
+        language: 记录未指定语言时使用的语言
+        max_pending: 同时计算的批次数上限，默认为 workers 的两倍
+
+    Returns:
+        BatchRow 迭代器
+
+    Raises:
+        ValueError: 如果参数无效
+    """
+    _check_arguments(render, chunk_size)
+    chunks = (_make_chunk(group, language) for group in _groups(enumerate(records, 1), chunk_size))
+    for chunk in _compute_chunks(chunks, workers or os.cpu_count() or 1, render, max_pending):
+        yield from chunk.rows
+
+
+def shard_of(record: Dict[str, Any], count: int, language: str = "zh-CN") -> int:
+    """
+    按记录哈希确定记录所属的分片（与进程、机器和 Python 版本无关）
+
+    有效记录按规范化的星盘请求哈希，同一星盘类别总是落在同一分片中。
+
+    Args:
+        record: 出生记录
+        count: 分片总数
+        language: 记录未指定语言时使用的语言
+
+    Returns:
+        分片序号 0 到 count - 1
+    """
+    try:
+        key = repr(parse_record(record, language))
+    except (TypeError, ValueError, AttributeError):
+        key = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+def _write_atomic(path: str, write: Callable[[IO[str]], Any]) -> Any:
+    """先写临时文件再改名，其他进程和机器只会看到完整的文件"""
+    temp = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    try:
+        with open(temp, "w", encoding="utf-8") as f:
+            result = write(f)
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+    return result
+
+
+def run_job(
+    source: Any,
+    directory: str,
+    shard: Tuple[int, int] = (0, 1),
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    input_format: Optional[str] = None,
+    language: str = "zh-CN",
+    max_pending: Optional[int] = None,
+    progress: Optional["Progress"] = None,
+) -> Dict[str, Any]:
+    """
+    可断点续跑、可分片的批量任务，结果写为 JSONL 分块文件
+
+    输入中属于本分片（见 shard_of()）的记录按 chunk_size 分块，每块完成后以
+    原子改名写出 directory/shard-I-of-N/chunk-K.jsonl，并更新同目录下的
+    checkpoint.json。重新运行时跳过已有的分块；多台机器可以通过共享文件系统
+    各自运行不同的分片，无需协调。输出行的 line 为在整个输入中的序号。
+
+    Args:
+        source: 输入（见 read_records()）
+        directory: 任务目录
+        shard: (分片序号, 分片总数)
+        workers: 工作进程数，默认 CPU 核数
+        chunk_size: 每块记录数；续跑时必须与之前相同
+        input_format: 'csv' 或 'jsonl'，默认按扩展名判断
+        language: 记录未指定语言时使用的语言；续跑时必须与之前相同
+        max_pending: 同时计算的块数上限
+        progress: 可选的 Progress，统计本次计算的记录
+
+    Returns:
+        本次运行的统计 {'shard', 'chunks', 'skipped', 'rows', 'errors'}
+
+    Raises:
+        ValueError: 如果参数无效，或与已有检查点的参数不一致
+
+    Example:
+        >>> # 机器 3（共 16 台）
+        >>> run_job("/shared/births.csv", "/shared/job", shard=(3, 16))
+    """
+    index, count = shard
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard: {index}/{count}")
+    _check_arguments("json", chunk_size)
+
+    shard_dir = os.path.join(directory, f"shard-{index:05d}-of-{count:05d}")
+    os.makedirs(shard_dir, exist_ok=True)
+    checkpoint_path = os.path.join(shard_dir, "checkpoint.json")
+    settings = {"shard": [index, count], "chunk_size": chunk_size, "language": language}
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        if {key: previous.get(key) for key in settings} != settings:
+            raise ValueError(f"Job settings differ from checkpoint {checkpoint_path}")
+    done = {name for name in os.listdir(shard_dir) if name.endswith(".jsonl")}
+
+    stats = {"shard": [index, count], "chunks": 0, "skipped": 0, "rows": 0, "errors": 0}
+
+    def chunk_path(number: int) -> str:
+        return os.path.join(shard_dir, f"chunk-{number:08d}.jsonl")
+
+    def save_checkpoint(complete: bool) -> None:
+        state = dict(settings, complete=complete, updated=time.time())
+        state.update((key, stats[key]) for key in ("chunks", "skipped", "rows", "errors"))
+        _write_atomic(checkpoint_path, lambda f: json.dump(state, f))
+
+    def todo() -> Iterator[_Chunk]:
+        numbered = (
+            (line, record)
+            for line, record in enumerate(read_records(source, input_format), 1)
+            if shard_of(record, count, language) == index
+        )
+        for number, group in enumerate(_groups(numbered, chunk_size)):
+            if os.path.basename(chunk_path(number)) in done:
+                stats["skipped"] += 1
+                continue
+            chunk = _make_chunk(group, language)
+            chunk.number = number
+            yield chunk
+
+    save_checkpoint(False)
+    for chunk in _compute_chunks(todo(), workers or os.cpu_count() or 1, "json", max_pending):
+        rows = progress.track(chunk.rows) if progress is not None else chunk.rows
+        counts = _write_atomic(chunk_path(chunk.number), partial(write_jsonl, rows))
+        stats["chunks"] += 1
+        stats["rows"] += counts["rows"]
+        stats["errors"] += counts["errors"]
+        save_checkpoint(False)
+    save_checkpoint(True)
+    return stats
+
+
+def _init_worker() -> None:
+    from iztro_py.runtime import warmup
+
+    warmup(precompute=False)
+
+
+def read_records(
+    source: Any, format: Optional[str] = None, encoding: str = "utf-8"
+) -> Iterator[Dict[str, Any]]:
+    """
+    逐条读取 CSV（带表头）或 JSONL 格式的出生记录
+
+    Args:
+        source: 文件路径、'-'（标准输入）或文本文件对象
+        format: 'csv' 或 'jsonl'；默认按扩展名判断，无法判断时为 jsonl
+        encoding: 文件编码
+
+    Returns:
+        记录迭代器；JSONL 中无法解析的行产出 {'_error': 错误信息}
+
+    Raises:
+        ValueError: 如果格式无效
+    """
+    if format is None:
+        name = source if isinstance(source, str) else getattr(source, "name", "")
+        format = "csv" if str(name).lower().endswith(".csv") else "jsonl"
+    if format not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown input format: {format!r}")
+
+    if source == "-":
+        yield from _read(sys.stdin, format)
+    elif isinstance(source, str):
+        with open(source, encoding=encoding, newline="") as f:
+            yield from _read(f, format)
+    else:
+        yield from _read(source, format)
+
+
+def _read(f: IO[str], format: str) -> Iterator[Dict[str, Any]]:
+    if format == "csv":
+        yield from csv.DictReader(f)
+        return
+    for text in f:
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            record = {"_error": f"Invalid JSON: {e}"}
+        yield record if isinstance(record, dict) else {"_error": "Record is not an object"}
+
+
+def write_jsonl(rows: Iterable[BatchRow], output: IO[str]) -> Dict[str, int]:
+    """
+    把 run_batch(render='json') 的结果写为 JSONL
+
+    每行为 {"line", "id"?, "chart"} 或 {"line", "id"?, "error"}。
+
+    Args:
+        rows: BatchRow 迭代器
+        output: 文本输出流
+
+    Returns:
+        {'rows', 'errors'}
+    """
+    counts = {"rows": 0, "errors": 0}
+    for row in rows:
+        prefix = '{"line":%d' % row.line
+        if row.id is not None:
+            prefix += ',"id":' + json.dumps(row.id, ensure_ascii=False)
+        if row.error is None:
+            result = row.result if isinstance(row.result, str) else json.dumps(row.result)
+            output.write(prefix + ',"chart":' + result + "}\n")
+        else:
+            output.write(prefix + ',"error":' + json.dumps(row.error, ensure_ascii=False) + "}\n")
+            counts["errors"] += 1
+        counts["rows"] += 1
+    return counts
+
+
+class Progress:
+    """
+    统计处理进度与吞吐量，可定期输出到流
+
+    Args:
+        stream: 输出流，为 None 时不输出
+        interval: 输出间隔（秒）
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None, interval: float = 2.0):
+        self.stream = stream
+        self.interval = interval
+        self.rows = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def track(self, rows: Iterable[BatchRow]) -> Iterator[BatchRow]:
+        """包装结果迭代器，边产出边计数"""
+        for row in rows:
+            self.rows += 1
+            if row.error is not None:
+                self.errors += 1
+            now = time.perf_counter()
+            if self.stream is not None and now - self._last >= self.interval:
+                self._last = now
+                self.stream.write(self.line() + "\n")
+                self.stream.flush()
+            yield row
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总：{'rows', 'errors', 'seconds', 'rows_per_sec'}"""
+        seconds = time.perf_counter() - self.started
+        return {
+            "rows": self.rows,
+            "errors": self.errors,
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(self.rows / seconds, 1) if seconds > 0 else 0.0,
+        }
+
+    def line(self) -> str:
+        s = self.summary()
+        return (
+            f"{s['rows']} rows, {s['errors']} errors, "
+            f"{s['seconds']:.1f}s, {s['rows_per_sec']:.0f} rows/s"
+        )
+
+
+__all__ = [
+    "RENDERERS",
+    "BatchRow",
+    "parse_record",
+    "compute",
+    "run_batch",
+    "shard_of",
+    "run_job",
+    "read_records",
+    "write_jsonl",
+    "Progress",
+]
@@ -0,0 +1,190 @@
+"""
+Benchmark suite for iztro-py
+
+Measures the library hot paths (chart building, horoscope, calendar
+conversion, serialization, star lookup and i18n rendering) and reports the
+results as JSON, so that releases can be compared before upgrading.
+
+Run from the command line:
+    $ python -m iztro_py.bench
+    $ python -m iztro_py.bench -n 2000 -b by_solar -b horoscope -o before.json
+
+Or from Python:
+    >>> from iztro_py.bench import run_benchmarks
+    >>> report = run_benchmarks(iterations=500, names=["by_solar"])
+    >>> report["benchmarks"]["by_solar"]["ops_per_sec"]
+"""
+
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# 基准名称 -> 准备函数；准备函数完成预处理并返回被测的无参操作，
+# 或 (操作, 清理函数)，清理函数在测量结束后调用（如关闭线程池）
+BenchmarkSetup = Callable[[], Union[Callable[[], Any], Tuple[Callable[[], Any], Callable[[], Any]]]]
+
+BENCHMARKS: Dict[str, BenchmarkSetup] = {}
+
+# 基准名称 -> 运行选项（max_iterations、allocations）
+BENCHMARK_OPTIONS: Dict[str, Dict[str, Any]] = {}
+
+
+def benchmark(
+    name: str, max_iterations: Optional[int] = None, allocations: bool = True
+) -> Callable[[BenchmarkSetup], BenchmarkSetup]:
+    """
+    注册基准的装饰器
+
+    Args:
+        name: 基准名称
+        max_iterations: 计时次数上限（用于启动子进程等较慢的操作）
+        allocations: 是否统计内存分配（对子进程没有意义）
+
+    Example:
+        >>> @benchmark("by_solar")
+        ... def _by_solar():
+        ...     return lambda: astro.by_solar("2000-8-16", 6, "男")
+    """
+
+    def register(setup: BenchmarkSetup) -> BenchmarkSetup:
+        BENCHMARKS[name] = setup
+        BENCHMARK_OPTIONS[name] = {"max_iterations": max_iterations, "allocations": allocations}
+        return setup
+
+    return register
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(
+    operation: Callable[[], Any],
+    iterations: int = 1000,
+    warmup: int = 50,
+    allocations: bool = True,
+) -> Dict[str, float]:
+    """
+    测量单个操作的吞吐量、延迟分布与内存分配
+
+    计时与内存统计分两轮进行（tracemalloc 会显著拖慢执行）。
+
+    Args:
+        operation: 被测的无参操作
+        iterations: 计时轮的执行次数
+        warmup: 预热次数
+        allocations: 是否统计内存分配
+
+    Returns:
+        ops_per_sec、p50_us、p99_us、mean_us，以及（统计分配时）
+        peak_alloc_bytes_per_op（单次操作期间的内存峰值增量均值）和
+        retained_bytes_per_op（操作后仍未释放的内存均值）
+    """
+    for _ in range(warmup):
+        operation()
+
+    clock = time.perf_counter_ns
+    samples: List[int] = []
+    append = samples.append
+    started = clock()
+    for _ in range(iterations):
+        begin = clock()
+        operation()
+        append(clock() - begin)
+    elapsed = clock() - started
+
+    samples.sort()
+    result = {
+        "iterations": iterations,
+        "ops_per_sec": iterations / (elapsed / 1e9) if elapsed else float("inf"),
+        "mean_us": sum(samples) / len(samples) / 1e3,
+        "p50_us": _percentile(samples, 0.50) / 1e3,
+        "p99_us": _percentile(samples, 0.99) / 1e3,
+    }
+
+    if allocations:
+        rounds = max(1, min(iterations, 200))
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            peak_total = 0
+            start_memory = tracemalloc.get_traced_memory()[0]
+            for _ in range(rounds):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                operation()
+                peak_total += tracemalloc.get_traced_memory()[1] - before
+            retained = tracemalloc.get_traced_memory()[0] - start_memory
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+        result["peak_alloc_bytes_per_op"] = peak_total / rounds
+        result["retained_bytes_per_op"] = retained / rounds
+
+    return result
+
+
+def run_benchmarks(
+    names: Optional[Sequence[str]] = None,
+    iterations: int = 1000,
+    warmup: int = 50,
+    allocations: bool = True,
+) -> Dict[str, Any]:
+    """
+    运行基准并生成报告
+
+    Args:
+        names: 要运行的基准名称，默认全部
+        iterations: 每个基准的计时次数
+        warmup: 每个基准的预热次数
+        allocations: 是否统计内存分配
+
+    Returns:
+        可直接序列化为 JSON 的报告
+
+    Raises:
+        ValueError: 如果基准名称不存在
+    """
+    from iztro_py import __version__
+    from iztro_py.bench import cases  # noqa: F401  注册内置基准
+
+    selected = list(names) if names else list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+    results = {}
+    for name in selected:
+        options = BENCHMARK_OPTIONS.get(name, {})
+        limit = options.get("max_iterations")
+        operation = BENCHMARKS[name]()
+        cleanup = None
+        if isinstance(operation, tuple):
+            operation, cleanup = operation
+        try:
+            results[name] = measure(
+                operation,
+                min(iterations, limit) if limit else iterations,
+                min(warmup, limit) if limit else warmup,
+                allocations and options.get("allocations", True),
+            )
+        finally:
+            if cleanup is not None:
+                cleanup()
+
+    return {
+        "iztro_py": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        # free-threaded 构建（PEP 703）上可能为 False，影响多线程基准
+        "gil_enabled": getattr(sys, "_is_gil_enabled", lambda: True)(),
+        "benchmarks": results,
+    }
+
+
+__all__ = ["BENCHMARKS", "BENCHMARK_OPTIONS", "benchmark", "measure", "run_benchmarks"]
@@ -0,0 +1,61 @@
+"""
+Command line entry point: python -m iztro_py.bench
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from iztro_py.bench import BENCHMARKS, run_benchmarks
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m iztro_py.bench",
+        description="Run the iztro-py benchmark suite and print a JSON report.",
+    )
+    parser.add_argument(
+        "-b",
+        "--benchmark",
+        action="append",
+        dest="names",
+        metavar="NAME",
+        help="benchmark to run (repeatable, default: all)",
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=1000)
+    parser.add_argument("-w", "--warmup", type=int, default=50)
+    parser.add_argument(
+        "--no-allocations", action="store_true", help="skip the tracemalloc allocation pass"
+    )
+    parser.add_argument("-o", "--output", help="write the report to this file instead of stdout")
+    parser.add_argument("-l", "--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        from iztro_py.bench import cases  # noqa: F401
+
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    try:
+        report = run_benchmarks(
+            names=args.names,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            allocations=not args.no_allocations,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
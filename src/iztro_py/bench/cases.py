@@ -0,0 +1,161 @@
+"""
+Built-in benchmarks for iztro-py
+
+Every benchmark cycles through the same fixed set of birth data, so results
+are comparable between runs and releases.
+"""
+
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import partial
+from itertools import cycle
+from typing import List, Tuple
+
+from iztro_py import astro
+from iztro_py.bench import benchmark
+from iztro_py.data.constants import MAJOR_STARS, MINOR_STARS
+from iztro_py.utils.calendar import _convert_solar_to_lunar, solar_to_lunar
+
+_GENDERS = ("男", "女")
+
+
+def sample_inputs(count: int = 64) -> List[Tuple[str, int, str]]:
+    """
+    生成固定的基准输入（阳历日期、时辰索引、性别）
+
+    Args:
+        count: 输入数量
+
+    Returns:
+        (solar_date, time_index, gender) 列表
+    """
+    start = date(1950, 1, 1)
+    inputs = []
+    for i in range(count):
+        day = start + timedelta(days=i * 397)
+        inputs.append((f"{day.year}-{day.month}-{day.day}", i % 13, _GENDERS[i % 2]))
+    return inputs
+
+
+def _sample_charts(count: int = 16):
+    return [astro.by_solar(*args) for args in sample_inputs(count)]
+
+
+@benchmark("by_solar")
+def _by_solar():
+    inputs = cycle(sample_inputs())
+    return lambda: astro.by_solar(*next(inputs))
+
+
+@benchmark("by_lunar")
+def _by_lunar():
+    lunar_inputs = []
+    for solar_date, time_index, gender in sample_inputs():
+        lunar = solar_to_lunar(*map(int, solar_date.split("-")))
+        lunar_date = f"{lunar.year}-{lunar.month}-{lunar.day}"
+        lunar_inputs.append((lunar_date, time_index, gender, lunar.is_leap_month))
+    inputs = cycle(lunar_inputs)
+    return lambda: astro.by_lunar(*next(inputs))
+
+
+@benchmark("horoscope")
+def _horoscope():
+    charts = cycle(_sample_charts())
+    return lambda: next(charts).horoscope("2024-6-1", 6)
+
+
+@benchmark("solar_to_lunar")
+def _solar_to_lunar():
+    dates = cycle([tuple(map(int, args[0].split("-"))) for args in sample_inputs()])
+    return lambda: solar_to_lunar(*next(dates))
+
+
+@benchmark("solar_to_lunar_uncached")
+def _solar_to_lunar_uncached():
+    # 绕过转换缓存，测量历法库本身的开销
+    convert = _convert_solar_to_lunar.__wrapped__
+    dates = cycle([tuple(map(int, args[0].split("-"))) for args in sample_inputs()])
+    return lambda: convert(*next(dates))
+
+
+@benchmark("to_iztro_dict")
+def _to_iztro_dict():
+    charts = cycle(_sample_charts())
+    return lambda: next(charts).to_iztro_dict()
+
+
+@benchmark("star_lookup")
+def _star_lookup():
+    chart = _sample_charts(1)[0]
+    names = cycle(MAJOR_STARS + MINOR_STARS)
+    return lambda: chart.star(next(names))
+
+
+@benchmark("i18n_render")
+def _i18n_render():
+    chart = _sample_charts(1)[0]
+    languages = cycle(["zh-CN", "zh-TW", "en-US", "ja-JP", "ko-KR", "vi-VN"])
+
+    def render():
+        lang = next(languages)
+        names = []
+        for palace in chart.palaces:
+            names.append(palace.translate_name(lang))
+            names.append(palace.translate_heavenly_stem(lang))
+            names.append(palace.translate_earthly_branch(lang))
+            for star in palace.major_stars + palace.minor_stars + palace.adjective_stars:
+                names.append(star.translate_name(lang))
+                names.append(star.translate_brightness(lang))
+        return names
+
+    return render
+
+
+def _build_charts(inputs: List[Tuple[str, int, str]]) -> None:
+    for args in inputs:
+        astro.by_solar(*args)
+
+
+def _by_solar_threads(threads: int):
+    inputs = sample_inputs()
+    chunks = [inputs[i::threads] for i in range(threads)]
+    executor = ThreadPoolExecutor(max_workers=threads)
+
+    def run():
+        for future in [executor.submit(_build_charts, chunk) for chunk in chunks]:
+            future.result()
+
+    return run, executor.shutdown
+
+
+# 多线程吞吐：每次操作由 N 个线程共同构建 64 张星盘，ops_per_sec 与
+# by_solar_threads_1 之比即扩展倍数。有 GIL 时不会明显超过 1，
+# 在 free-threaded 构建上应随线程数增长（见报告中的 gil_enabled）。
+for _threads in (1, 2, 4, 8):
+    benchmark(f"by_solar_threads_{_threads}", max_iterations=200, allocations=False)(
+        partial(_by_solar_threads, _threads)
+    )
+
+
+def _python(code: str):
+    command = [sys.executable, "-c", code]
+    return lambda: subprocess.run(command, check=True)
+
+
+# 冷启动：每次在新的解释器中执行。python_startup 是解释器本身的开销，
+# 其余两项减去它即为导入 iztro_py（及首张星盘）的耗时。
+@benchmark("python_startup", max_iterations=20, allocations=False)
+def _python_startup():
+    return _python("pass")
+
+
+@benchmark("import", max_iterations=20, allocations=False)
+def _import():
+    return _python("import iztro_py")
+
+
+@benchmark("import_first_chart", max_iterations=20, allocations=False)
+def _import_first_chart():
+    return _python("import iztro_py; iztro_py.by_solar('2000-8-16', 6, '男').to_iztro_dict()")
@@ -0,0 +1,388 @@
+"""
+Throughput and output parity against the JavaScript iztro
+
+Runs one randomized input set through iztro-py and through the reference
+iztro package in a single long-lived node process, compares the charts field
+by field and reports charts per second for both:
+
+    $ npm install            # installs iztro from package.json
+    $ python -m iztro_py.bench.parity -n 20000 --seed 1 -o parity.json
+
+Only fields that to_iztro_dict() produces are compared; fields that exist
+only in the JavaScript output are listed in the report under js_only_fields.
+The exit status is 1 when any chart differs, so the harness can gate CI.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from iztro_py import __version__, astro
+
+# node 端的工作脚本：第一行输出 {"ready", "version"}，之后每读入一行批次请求输出一行结果；
+# %(transform)s 为把星盘对象转换为输出值的 JS 函数
+_NODE_WORKER_TEMPLATE = r"""
+const readline = require('readline');
+const { astro } = require('iztro');
+const version = require('iztro/package.json').version;
+const transform = %(transform)s;
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+process.stdout.write(JSON.stringify({ ready: true, version }) + '\n');
+
+rl.on('line', (line) => {
+  const { inputs, language } = JSON.parse(line);
+  const charts = new Array(inputs.length);
+  const started = process.hrtime.bigint();
+  for (let i = 0; i < inputs.length; i++) {
+    const [solarDate, timeIndex, gender] = inputs[i];
+    try {
+      charts[i] = astro.bySolar(solarDate, timeIndex, gender, true, language);
+    } catch (e) {
+      charts[i] = { error: String(e && e.message ? e.message : e) };
+    }
+  }
+  const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+  const output = charts.map((chart) => (chart.error === undefined ? transform(chart) : chart));
+  // 星盘对象内部以 _ 开头的字段互相引用（宫位 <-> 星盘），序列化时跳过
+  const skipPrivate = (key, value) => (key.startsWith('_') ? undefined : value);
+  process.stdout.write(JSON.stringify({ seconds, charts: output }, skipPrivate) + '\n');
+});
+"""
+
+
+def node_worker(transform: str = "(chart) => chart") -> str:
+    """
+    生成 node 工作脚本
+
+    Args:
+        transform: 把 JS 星盘对象转换为输出值的 JS 函数表达式（默认输出整张星盘）
+
+    Returns:
+        可用 node -e 运行的脚本
+    """
+    return _NODE_WORKER_TEMPLATE % {"transform": transform}
+
+
+NODE_WORKER = node_worker()
+
+ChartInput = Tuple[str, int, str]
+
+_GENDERS = ("男", "女")
+
+
+def random_inputs(
+    count: int, seed: int = 0, start: date = date(1900, 1, 31), end: date = date(2100, 12, 31)
+) -> List[ChartInput]:
+    """
+    生成可复现的随机输入（阳历日期、时辰索引、性别）
+
+    Args:
+        count: 输入数量
+        seed: 随机种子
+        start: 最早日期
+        end: 最晚日期（含）
+
+    Returns:
+        (solar_date, time_index, gender) 列表
+    """
+    rng = random.Random(seed)
+    span = (end - start).days
+    inputs = []
+    for _ in range(count):
+        day = start + timedelta(days=rng.randint(0, span))
+        inputs.append(
+            (f"{day.year}-{day.month}-{day.day}", rng.randint(0, 12), rng.choice(_GENDERS))
+        )
+    return inputs
+
+
+class NodeIztro:
+    """
+    常驻的 node iztro 进程
+
+    Args:
+        node: node 可执行文件
+        root: 包含 node_modules/iztro 的目录，默认当前目录
+        script: 工作脚本（见 node_worker()）
+
+    Raises:
+        RuntimeError: 如果找不到 node 或 iztro 无法加载
+
+    Example:
+        >>> with NodeIztro() as js:
+        ...     seconds, charts = js.by_solar([('2000-8-16', 6, '男')])
+    """
+
+    def __init__(self, node: str = "node", root: Optional[str] = None, script: str = NODE_WORKER):
+        executable = shutil.which(node)
+        if executable is None:
+            raise RuntimeError(f"node executable not found: {node}")
+        root = os.path.abspath(root or os.getcwd())
+        env = dict(os.environ)
+        env["NODE_PATH"] = os.pathsep.join(
+            filter(None, [os.path.join(root, "node_modules"), env.get("NODE_PATH")])
+        )
+        self.process = subprocess.Popen(
+            [executable, "-e", script],
+            cwd=root,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+        )
+        ready = self.process.stdout.readline()
+        if not ready:
+            lines = self.process.stderr.read().strip().splitlines()
+            self.process.wait()
+            errors = [line for line in lines if line.startswith("Error")] or lines or [""]
+            raise RuntimeError(f"node iztro failed to start: {errors[0]}")
+        self.version = json.loads(ready)["version"]
+
+    def by_solar(
+        self, inputs: Sequence[ChartInput], language: str = "zh-CN"
+    ) -> Tuple[float, List[Dict[str, Any]]]:
+        """
+        在 node 中计算一批星盘
+
+        Returns:
+            (node 内 bySolar 的总耗时（秒）, 转换后的星盘列表；出错的输入为 {'error': ...}）
+        """
+        self.process.stdin.write(json.dumps({"inputs": inputs, "language": language}) + "\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"node iztro exited: {self.process.stderr.read().strip()}")
+        result = json.loads(line)
+        return result["seconds"], result["charts"]
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.process.stdout.close()
+        self.process.stderr.close()
+
+    def __enter__(self) -> "NodeIztro":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def python_by_solar(
+    inputs: Sequence[ChartInput], language: str = "zh-CN"
+) -> Tuple[float, List[Dict[str, Any]]]:
+    """
+    用 iztro-py 计算一批星盘，计时方式与 node 端相同（只计 by_solar）
+
+    Returns:
+        (by_solar 的总耗时（秒）, to_iztro_dict() 列表)
+    """
+    charts: List[Any] = []
+    clock = time.perf_counter
+    started = clock()
+    for solar_date, time_index, gender in inputs:
+        try:
+            charts.append(astro.by_solar(solar_date, time_index, gender, True, language))
+        except Exception as e:  # 与 node 端一致：单个输入出错不影响整批
+            charts.append(e)
+    seconds = clock() - started
+    return seconds, [
+        {"error": str(chart)} if isinstance(chart, Exception) else chart.to_iztro_dict()
+        for chart in charts
+    ]
+
+
+def compare(expected: Any, actual: Any, path: str = "") -> Iterator[Tuple[str, Any, Any]]:
+    """
+    逐字段比较 iztro-py 的输出与 JS 输出
+
+    只比较 actual（iztro-py）中存在的字段；列表按位置比较。
+
+    Args:
+        expected: JS 输出
+        actual: iztro-py 输出
+        path: 当前字段路径
+
+    Returns:
+        (字段路径, JS 值, iztro-py 值) 迭代器
+    """
+    if isinstance(actual, dict) and isinstance(expected, dict):
+        for key, value in actual.items():
+            yield from compare(expected.get(key), value, f"{path}.{key}" if path else key)
+    elif isinstance(actual, list) and isinstance(expected, list):
+        if len(actual) != len(expected):
+            yield f"{path}.length", len(expected), len(actual)
+        for i, (js_value, py_value) in enumerate(zip(expected, actual)):
+            yield from compare(js_value, py_value, f"{path}[{i}]")
+    elif expected != actual:
+        yield path, expected, actual
+
+
+def _pattern(path: str) -> str:
+    # palaces[3].majorStars[0].name -> palaces[].majorStars[].name
+    parts = []
+    depth = 0
+    for char in path:
+        if char == "[":
+            depth += 1
+            parts.append("[]")
+        elif char == "]":
+            depth -= 1
+        elif depth == 0:
+            parts.append(char)
+    return "".join(parts)
+
+
+def _js_only(expected: Any, actual: Any, path: str, fields: Set[str]) -> None:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key, value in expected.items():
+            child = f"{path}.{key}" if path else key
+            if key not in actual:
+                fields.add(child)
+            else:
+                _js_only(value, actual[key], child, fields)
+    elif isinstance(expected, list) and isinstance(actual, list) and expected and actual:
+        _js_only(expected[0], actual[0], f"{path}[]", fields)
+
+
+def run_parity(
+    count: int = 10000,
+    seed: int = 0,
+    batch_size: int = 1000,
+    language: str = "zh-CN",
+    node: str = "node",
+    root: Optional[str] = None,
+    max_examples: int = 20,
+) -> Dict[str, Any]:
+    """
+    运行一致性与吞吐量对比
+
+    Args:
+        count: 随机输入数量
+        seed: 随机种子
+        batch_size: 每批发送给 node 的输入数
+        language: 星盘语言
+        node: node 可执行文件
+        root: 包含 node_modules/iztro 的目录
+        max_examples: 报告中保留的差异示例数
+
+    Returns:
+        可直接序列化为 JSON 的报告
+
+    Raises:
+        RuntimeError: 如果 node iztro 不可用
+    """
+    inputs = random_inputs(count, seed)
+    mismatches: Dict[str, int] = {}
+    examples: List[Dict[str, Any]] = []
+    js_only: Set[str] = set()
+    mismatched_charts = 0
+    py_seconds = js_seconds = 0.0
+
+    # 两边都先预热，避免把 JIT/首次加载计入吞吐量
+    warmup_inputs = inputs[: min(200, len(inputs))]
+    python_by_solar(warmup_inputs, language)
+    with NodeIztro(node, root) as js:
+        js.by_solar(warmup_inputs, language)
+        for offset in range(0, len(inputs), batch_size):
+            batch = inputs[offset : offset + batch_size]
+            seconds, js_charts = js.by_solar(batch, language)
+            js_seconds += seconds
+            seconds, py_charts = python_by_solar(batch, language)
+            py_seconds += seconds
+
+            for args, js_chart, py_chart in zip(batch, js_charts, py_charts):
+                _js_only(js_chart, py_chart, "", js_only)
+                differences = list(compare(js_chart, py_chart))
+                if not differences:
+                    continue
+                mismatched_charts += 1
+                for path, js_value, py_value in differences:
+                    pattern = _pattern(path)
+                    mismatches[pattern] = mismatches.get(pattern, 0) + 1
+                    if len(examples) < max_examples:
+                        examples.append(
+                            {"input": list(args), "field": path, "js": js_value, "py": py_value}
+                        )
+        js_version = js.version
+
+    def throughput(seconds: float) -> Dict[str, float]:
+        return {
+            "seconds": round(seconds, 3),
+            "charts_per_sec": round(count / seconds, 1) if seconds else 0.0,
+        }
+
+    return {
+        "iztro_py": __version__,
+        "iztro_js": js_version,
+        "python": platform.python_version(),
+        "inputs": count,
+        "seed": seed,
+        "language": language,
+        "python_by_solar": throughput(py_seconds),
+        "node_by_solar": throughput(js_seconds),
+        # > 1 表示 iztro-py 比 JS 慢
+        "slowdown": round(py_seconds / js_seconds, 2) if js_seconds else None,
+        "mismatched_charts": mismatched_charts,
+        "mismatches": dict(sorted(mismatches.items(), key=lambda item: -item[1])),
+        "examples": examples,
+        "js_only_fields": sorted(_pattern(field) for field in js_only),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m iztro_py.bench.parity",
+        description="Compare iztro-py with the JavaScript iztro: output parity and throughput.",
+    )
+    parser.add_argument("-n", "--count", type=int, default=10000, help="random inputs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--language", default="zh-CN")
+    parser.add_argument("--node", default="node", help="node executable")
+    parser.add_argument("--root", help="directory containing node_modules/iztro (default: cwd)")
+    parser.add_argument("-o", "--output", help="write the report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_parity(
+            args.count, args.seed, args.batch_size, args.language, args.node, args.root
+        )
+    except RuntimeError as e:
+        print(f"parity: {e}", file=sys.stderr)
+        return 2
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if report["mismatched_charts"] else 0
+
+
+__all__ = [
+    "NODE_WORKER",
+    "node_worker",
+    "random_inputs",
+    "NodeIztro",
+    "python_by_solar",
+    "compare",
+    "run_parity",
+    "main",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
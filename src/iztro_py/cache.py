@@ -0,0 +1,841 @@
+"""
+Two-level chart cache for iztro-py
+
+Charts and horoscopes are deterministic, so each one only needs to be
+computed once. ChartCache keeps recent results in a bounded in-process LRU
+and, optionally, in a persistent store shared by all processes on the host,
+so restarted workers and separate CLI runs reuse earlier results:
+
+    >>> from iztro_py import cache
+    >>> charts = cache.ChartCache(cache.default_path())
+    >>> chart = charts.by_solar("2000-8-16", 6, "男")
+    >>> horoscope = charts.horoscope(chart, "2024-1-1", 6)
+
+Keys are versioned with CACHE_FORMAT and the library version, so an upgrade
+never returns results computed by older code. Cached charts and horoscopes
+are frozen (see FunctionalAstrolabe.freeze()), because every caller receives
+the same instance; use chart.thaw() for an editable copy.
+
+SharedMemoryStore keeps the encoded values in one shared memory segment
+instead, so all worker processes on a host share a single hot set. Every
+value in the segment is signed with a per-store secret, which the workers
+receive from the process that created the store:
+
+    >>> store = cache.SharedMemoryStore()
+    >>> charts = cache.ChartCache(store=store)
+    >>> # in a worker: cache.SharedMemoryStore(name, secret=secret)
+
+The persistent stores hold pickled values: only point it at a directory
+that is not writable by untrusted users.
+"""
+
+import hashlib
+import hmac
+import os
+import pickle
+import secrets
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from iztro_py import __version__, astro, instrumentation
+from iztro_py.astro.frozen import Freezable, freeze_model
+
+# 缓存值编码格式的版本；编码或计算结果的结构变化时递增
+CACHE_FORMAT = 1
+
+# instrumentation 中的缓存名称
+MEMORY_CACHE = "chart_memory"
+STORE_CACHE = "chart_store"
+
+# 星盘指纹使用的字段：完全由出生信息（及 fix_leap、语言）决定，且足以区分不同星盘
+_FINGERPRINT_FIELDS = (
+    "language",
+    "gender",
+    "solar_date",
+    "lunar_date",
+    "chinese_date",
+    "time",
+    "earthly_branch_of_soul_palace",
+    "earthly_branch_of_body_palace",
+    "five_elements_class",
+)
+
+_MISSING = object()
+
+
+def date_key(date_str: str) -> Hashable:
+    """
+    规范化请求中的日期，用于合并请求或生成缓存键
+
+    '2000-08-16' 与 '2000-8-16' 视为同一请求；无法解析时原样使用（计算时会报错）
+
+    Args:
+        date_str: 'YYYY-M-D' 格式的日期
+
+    Returns:
+        (年, 月, 日) 元组，或原字符串
+    """
+    try:
+        return tuple(int(part) for part in date_str.split("-"))
+    except (AttributeError, ValueError):
+        return date_str
+
+
+def chart_fingerprint(chart: Any) -> str:
+    """
+    计算星盘指纹
+
+    相同出生信息、fix_leap 和语言得到的星盘指纹相同，可用于合并请求或作为缓存键。
+    指纹只由星盘的出生信息字段计算，不反映创建后对星盘的修改。
+
+    Args:
+        chart: 星盘对象（Astrolabe 或 FunctionalAstrolabe）
+
+    Returns:
+        32 位十六进制字符串
+
+    Example:
+        >>> chart = astro.by_solar('2000-8-16', 6, '男')
+        >>> chart_fingerprint(chart) == chart_fingerprint(astro.by_solar('2000-08-16', 6, '男'))
+        True
+    """
+    values = [getattr(chart, field) for field in _FINGERPRINT_FIELDS]
+    # 出生日期按传入的字符串保存，'2000-08-16' 与 '2000-8-16' 需要视为相同
+    values[_FINGERPRINT_FIELDS.index("solar_date")] = date_key(chart.solar_date)
+    text = "\x1f".join(map(str, values))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def request_key(kind: str, *parts: Any) -> str:
+    """
+    生成带版本的缓存键
+
+    Args:
+        kind: 请求类型，如 'by_solar'
+        *parts: 请求参数（日期应先经过规范化）
+
+    Returns:
+        形如 '1/0.3.3/by_solar/2000-8-16/6/男/True/zh-CN' 的字符串
+    """
+    values = ["-".join(map(str, part)) if isinstance(part, tuple) else str(part) for part in parts]
+    return "/".join([str(CACHE_FORMAT), __version__, kind] + values)
+
+
+def default_path() -> str:
+    """
+    默认的持久化缓存文件路径
+
+    位于 $XDG_CACHE_HOME/iztro_py（默认 ~/.cache/iztro_py）下；目录不存在时自动创建。
+
+    Returns:
+        sqlite 数据库文件路径
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    directory = os.path.join(base, "iztro_py")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, "charts.sqlite3")
+
+
+# ============================================================================
+# Codec
+# ============================================================================
+
+
+class PickleCodec:
+    """
+    默认编码：pickle 后用 zlib 压缩（一张星盘约 1.5 KB）
+
+    Args:
+        level: zlib 压缩级别
+    """
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def encode(self, value: Any) -> bytes:
+        return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), self.level)
+
+    def decode(self, data: bytes) -> Any:
+        return pickle.loads(zlib.decompress(data))
+
+
+# ============================================================================
+# Persistent stores
+# ============================================================================
+
+
+class SQLiteStore:
+    """
+    基于 sqlite3 的持久化存储，可被多个线程和进程同时使用
+
+    Args:
+        path: 数据库文件路径
+        timeout: 等待其他进程释放写锁的秒数
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = 0
+
+    def _connect(self):
+        # fork 之后不能继续使用父进程的连接
+        if self._connection is None or self._pid != os.getpid():
+            import sqlite3
+
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS charts (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = (
+                self._connect().execute("SELECT value FROM charts WHERE key = ?", (key,)).fetchone()
+            )
+        return None if row is None else bytes(row[0])
+
+    def set(self, key: str, data: bytes) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("INSERT OR REPLACE INTO charts VALUES (?, ?)", (key, data))
+            connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM charts")
+            connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM charts").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+class DBMStore:
+    """
+    基于标准库 dbm 的持久化存储
+
+    并发能力取决于可用的 dbm 实现（dbm.dumb 不支持多进程同时写入），
+    多进程共享时应使用 SQLiteStore。
+
+    Args:
+        path: 数据库文件路径（部分实现会添加扩展名）
+    """
+
+    def __init__(self, path: str):
+        import dbm
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = dbm.open(path, "c")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._db.get(key.encode("utf-8"))
+
+    def set(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._db[key.encode("utf-8")] = data
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._db.keys()):
+                del self._db[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._db)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class _FileLock:
+    """跨进程写锁：POSIX 上使用 flock，否则退化为进程内的线程锁"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._file = None
+        self._pid = 0
+        try:
+            import fcntl
+
+            self._fcntl: Any = fcntl
+        except ImportError:  # pragma: no cover - Windows
+            self._fcntl = None
+
+    def __enter__(self) -> "_FileLock":
+        self._thread_lock.acquire()
+        if self._fcntl is not None:
+            # flock 锁属于打开的文件，fork 出的子进程必须重新打开
+            if self._file is None or self._pid != os.getpid():
+                # 不跟随符号链接，避免锁文件被预先替换为指向其他文件的链接
+                flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0)
+                self._file = os.fdopen(os.open(self.path, flags, 0o600), "r+b")
+                self._pid = os.getpid()
+            self._fcntl.flock(self._file.fileno(), self._fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._fcntl is not None:
+            self._fcntl.flock(self._file.fileno(), self._fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+
+class SharedMemoryStore:
+    """
+    基于 multiprocessing.shared_memory 的共享存储，同一主机上的所有进程共用一份
+
+    固定槽位的哈希表：键的哈希决定起始槽位，在其后 PROBES 个槽位内查找；
+    写入时优先使用相同键或空槽位，否则覆盖起始槽位。每个槽位带有顺序锁
+    （seqlock）计数，读取无需加锁，读到正在写入的槽位时重试或按未命中处理；
+    写入在跨进程的文件锁内进行。
+
+    值会被 pickle 解码，因此共享内存中的每个值都带有以 secret 为密钥的 HMAC，
+    校验失败的槽位按未命中处理；连接已有的共享内存前还会检查它属于当前用户
+    且其他用户不可访问。创建存储的进程把 name 与 secret 交给各 worker。
+
+    放不进一个槽位的值（超过 slot_size - 56 字节）不会被缓存。
+
+    Args:
+        name: 共享内存名称，同名的存储共享数据；为 None 时创建随机名称的新共享内存
+        secret: HMAC 密钥；为 None 时生成随机密钥（只能用于新建的共享内存，
+            连接已有的共享内存时必须传入创建者的 secret）
+        slots: 槽位数（只在创建时使用）
+        slot_size: 每个槽位的字节数（只在创建时使用）
+        lock_path: 写锁文件路径，默认在临时目录中按 name 生成
+
+    Raises:
+        ValueError: 如果同名共享内存不是由 SharedMemoryStore 创建的，
+            或连接已有的共享内存时没有传入 secret
+        PermissionError: 如果共享内存不属于当前用户，或其他用户可以访问
+
+    Example:
+        >>> store = SharedMemoryStore()
+        >>> charts = ChartCache(store=store, max_entries=256)
+        >>> worker_store = SharedMemoryStore(store.name, secret=store.secret)
+    """
+
+    MAGIC = b"IZTROSHM"
+    VERSION = 2
+    PROBES = 4
+    # 头部：magic、版本、槽位数、槽位大小
+    _HEADER = struct.Struct("<8sIII")
+    _HEADER_SIZE = 32
+    # 槽位头部：顺序计数、数据长度（含 HMAC）、键哈希
+    _SLOT = struct.Struct("<II16s")
+    # 每个值前的 HMAC-SHA256
+    _MAC_SIZE = 32
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        secret: Optional[bytes] = None,
+        slots: int = 4096,
+        slot_size: int = 4096,
+        lock_path: Optional[str] = None,
+    ):
+        from multiprocessing import shared_memory
+
+        if slots < 1 or slot_size <= self._SLOT.size + self._MAC_SIZE:
+            raise ValueError("slots must be positive and slot_size larger than the slot header")
+        size = self._HEADER_SIZE + slots * slot_size
+        # 共享存储的生命周期由 unlink() 显式管理，不交给 resource_tracker（见 _untrack）
+        options = {"track": False} if sys.version_info >= (3, 13) else {}
+        if name is None:
+            name = f"iztro_py_{secrets.token_hex(8)}"
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size, **options)
+            self._HEADER.pack_into(shm.buf, 0, self.MAGIC, self.VERSION, slots, slot_size)
+        except FileExistsError:
+            if secret is None:
+                raise ValueError(
+                    f"Shared memory {name!r} already exists; pass the secret of the store "
+                    "that created it"
+                )
+            shm = shared_memory.SharedMemory(name=name, **options)
+        _untrack(shm)
+        try:
+            _check_private(shm)
+        except PermissionError:
+            shm.close()
+            raise
+
+        for _ in range(100):
+            magic, version, slots, slot_size = self._HEADER.unpack_from(shm.buf, 0)
+            if magic != bytes(8):
+                break
+            # 其他进程刚创建，还未写入头部
+            time.sleep(0.001)
+        if magic != self.MAGIC or version != self.VERSION:
+            shm.close()
+            raise ValueError(f"Shared memory {name!r} is not an iztro_py chart store")
+
+        self.name = name
+        self.secret = secret if secret is not None else secrets.token_bytes(32)
+        self.slots = slots
+        self.slot_size = slot_size
+        self._shm = shm
+        self._buf = shm.buf
+        if lock_path is None:
+            import tempfile
+
+            lock_path = os.path.join(tempfile.gettempdir(), f"{name}.iztro_py.lock")
+        self._lock = _FileLock(lock_path)
+
+    def _mac(self, digest: bytes, data: bytes) -> bytes:
+        return hmac.new(self.secret, digest + data, hashlib.sha256).digest()
+
+    def _offsets(self, digest: bytes) -> List[int]:
+        home = int.from_bytes(digest[:8], "little") % self.slots
+        return [
+            self._HEADER_SIZE + ((home + i) % self.slots) * self.slot_size
+            for i in range(min(self.PROBES, self.slots))
+        ]
+
+    def _read(self, offset: int, digest: bytes) -> Optional[bytes]:
+        buf = self._buf
+        for _ in range(3):
+            seq, length, slot_digest = self._SLOT.unpack_from(buf, offset)
+            if seq & 1:
+                continue
+            if slot_digest != digest or not length:
+                data = None
+            else:
+                start = offset + self._SLOT.size
+                data = bytes(buf[start : start + length])
+            if self._SLOT.unpack_from(buf, offset)[0] == seq:
+                return data
+        # 多次读到正在写入的槽位，按未命中处理
+        return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        digest = _key_digest(key)
+        for offset in self._offsets(digest):
+            signed = self._read(offset, digest)
+            if signed is not None:
+                mac, data = signed[: self._MAC_SIZE], signed[self._MAC_SIZE :]
+                # 签名不符（其他密钥写入或被篡改）按未命中处理
+                if hmac.compare_digest(mac, self._mac(digest, data)):
+                    return data
+        return None
+
+    def set(self, key: str, data: bytes) -> None:
+        if len(data) > self.slot_size - self._SLOT.size - self._MAC_SIZE:
+            return
+        digest = _key_digest(key)
+        data = self._mac(digest, data) + data
+        with self._lock:
+            offsets = self._offsets(digest)
+            target = offsets[0]
+            for offset in offsets:
+                _, length, slot_digest = self._SLOT.unpack_from(self._buf, offset)
+                if slot_digest == digest or not length:
+                    target = offset
+                    break
+            self._write(target, digest, data)
+
+    def _write(self, offset: int, digest: bytes, data: bytes) -> None:
+        buf = self._buf
+        seq = self._SLOT.unpack_from(buf, offset)[0]
+        # 奇数表示正在写入，读取方会重试
+        struct.pack_into("<I", buf, offset, (seq + 1) & 0xFFFFFFFF)
+        start = offset + self._SLOT.size
+        buf[start : start + len(data)] = data
+        self._SLOT.pack_into(buf, offset, (seq + 1) & 0xFFFFFFFF, len(data), digest)
+        struct.pack_into("<I", buf, offset, (seq + 2) & 0xFFFFFFFF)
+
+    def clear(self) -> None:
+        with self._lock:
+            for slot in range(self.slots):
+                self._write(self._HEADER_SIZE + slot * self.slot_size, bytes(16), b"")
+
+    def __len__(self) -> int:
+        return sum(
+            1
+            for slot in range(self.slots)
+            if self._SLOT.unpack_from(self._buf, self._HEADER_SIZE + slot * self.slot_size)[1]
+        )
+
+    def close(self) -> None:
+        """断开本进程与共享内存的连接（数据保留，供其他进程继续使用）"""
+        if self._buf is not None:
+            self._buf.release()
+            self._buf = None
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """删除共享内存（所有进程都应先 close()，通常在服务停止时调用一次）"""
+        self.close()
+        if sys.version_info < (3, 13) and os.name == "posix":
+            from multiprocessing import resource_tracker
+
+            # unlink() 会向 resource_tracker 注销，先补上 _untrack() 移除的注册
+            resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+
+def _key_digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def _check_private(shm: Any) -> None:
+    """检查共享内存属于当前用户，且组和其他用户没有任何权限（仅 POSIX）"""
+    fd = getattr(shm, "_fd", -1)
+    if os.name != "posix" or fd < 0:
+        return
+    st = os.fstat(fd)
+    if st.st_uid != os.geteuid() or st.st_mode & 0o077:
+        raise PermissionError(
+            f"Shared memory {shm.name!r} must be owned by the current user "
+            f"and not accessible to others (uid={st.st_uid}, mode={st.st_mode & 0o777:o})"
+        )
+
+
+def _untrack(shm: Any) -> None:
+    # Python 3.13 之前，每个连接共享内存的进程退出时，resource_tracker 都会删除它，
+    # 导致其他 worker 的缓存失效；共享存储的生命周期改由 unlink() 显式管理
+    if sys.version_info < (3, 13) and os.name == "posix":
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+
+# ============================================================================
+# In-memory LRU
+# ============================================================================
+
+
+class LRUCache:
+    """
+    线程安全的 LRU，按条目数与编码后的字节数两个上限淘汰
+
+    Args:
+        max_entries: 最多条目数
+        max_bytes: 条目编码后总字节数的上限
+        name: 报告给 instrumentation 的缓存名称
+    """
+
+    def __init__(
+        self, max_entries: int = 4096, max_bytes: int = 64 << 20, name: str = MEMORY_CACHE
+    ):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """获取值并标记为最近使用；不存在时返回 default"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if instrumentation.is_enabled():
+            instrumentation.record_cache(self.name, entry is not None)
+        return default if entry is None else entry[0]
+
+    def put(self, key: str, value: Any, size: int) -> None:
+        """
+        存入值，必要时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            value: 值
+            size: 值的大小（字节），计入 max_bytes
+        """
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self.nbytes > self.max_bytes
+            ):
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.nbytes -= old_size
+                evicted += 1
+        if evicted and instrumentation.is_enabled():
+            instrumentation.record_cache_eviction(self.name, evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ============================================================================
+# Chart cache
+# ============================================================================
+
+
+def _freeze(value: Any) -> Any:
+    return value.freeze() if isinstance(value, Freezable) else freeze_model(value)
+
+
+class ChartCache:
+    """
+    两级星盘缓存：进程内 LRU + 可选的持久化存储
+
+    Args:
+        path: sqlite 数据库路径；为 None 且未指定 store 时只使用内存
+        store: 自定义持久化存储（需实现 get/set/clear/close），优先于 path
+        max_entries: 内存 LRU 的条目数上限
+        max_bytes: 内存 LRU 的字节数上限（按编码后的大小计算）
+        codec: 编码器（需实现 encode/decode），默认 PickleCodec
+
+    Example:
+        >>> charts = ChartCache('/var/cache/iztro/charts.sqlite3')
+        >>> chart = charts.by_solar('2000-8-16', 6, '男')
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        store: Any = None,
+        max_entries: int = 4096,
+        max_bytes: int = 64 << 20,
+        codec: Any = None,
+    ):
+        if store is None and path is not None:
+            store = SQLiteStore(path)
+        self.store = store
+        self.memory = LRUCache(max_entries, max_bytes)
+        self.codec = codec if codec is not None else PickleCodec()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        依次查找内存与持久化存储，都未命中时计算并写入两级缓存
+
+        Args:
+            key: 缓存键（见 request_key()）
+            compute: 计算函数
+
+        Returns:
+            冻结的结果
+        """
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        data = self.store.get(key) if self.store is not None else None
+        if self.store is not None and instrumentation.is_enabled():
+            instrumentation.record_cache(STORE_CACHE, data is not None)
+        if data is not None:
+            value = self.codec.decode(data)
+        else:
+            value = _freeze(compute())
+            data = self.codec.encode(value)
+            if self.store is not None:
+                self.store.set(key, data)
+
+        self.memory.put(key, value, len(data))
+        return value
+
+    def by_solar(
+        self,
+        solar_date: str,
+        time_index: int,
+        gender: str,
+        fix_leap: bool = True,
+        language: str = "zh-CN",
+    ) -> Any:
+        """带缓存的 astro.by_solar()，返回冻结的星盘"""
+        key = request_key("by_solar", date_key(solar_date), time_index, gender, fix_leap, language)
+        return self.get_or_compute(
+            key, lambda: astro.by_solar(solar_date, time_index, gender, fix_leap, language)
+        )
+
+    def by_lunar(
+        self,
+        lunar_date: str,
+        time_index: int,
+        gender: str,
+        is_leap_month: bool = False,
+        fix_leap: bool = True,
+        language: str = "zh-CN",
+    ) -> Any:
+        """带缓存的 astro.by_lunar()，返回冻结的星盘"""
+        key = request_key(
+            "by_lunar",
+            date_key(lunar_date),
+            time_index,
+            gender,
+            is_leap_month,
+            fix_leap,
+            language,
+        )
+        return self.get_or_compute(
+            key,
+            lambda: astro.by_lunar(
+                lunar_date, time_index, gender, is_leap_month, fix_leap, language
+            ),
+        )
+
+    def horoscope(self, chart: Any, solar_date: str, time_index: int = 0) -> Any:
+        """
+        带缓存的 chart.horoscope()，返回冻结的运限
+
+        冻结的星盘按内容摘要与目标日期缓存（thaw() 后修改再冻结的星盘使用不同的键）。
+        未冻结的星盘可能在创建后被修改，而计算内容摘要的开销与直接计算运限相当，
+        因此不经过缓存，直接计算。
+        """
+        if not getattr(chart, "frozen", False):
+            return _freeze(chart.horoscope(solar_date, time_index))
+        key = request_key("horoscope", chart.content_digest(), date_key(solar_date), time_index)
+        return self.get_or_compute(key, lambda: chart.horoscope(solar_date, time_index))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        缓存占用情况
+
+        Returns:
+            {'memory_entries', 'memory_bytes', 'store_entries'}（无持久化存储时不含最后一项）
+        """
+        result = {"memory_entries": len(self.memory), "memory_bytes": self.memory.nbytes}
+        if self.store is not None:
+            result["store_entries"] = len(self.store)
+        return result
+
+    def clear(self, memory_only: bool = False) -> None:
+        """清空缓存；memory_only 为 True 时保留持久化存储"""
+        self.memory.clear()
+        if self.store is not None and not memory_only:
+            self.store.clear()
+
+    def close(self) -> None:
+        """关闭持久化存储"""
+        if self.store is not None:
+            self.store.close()
+
+
+_default_cache: Optional[ChartCache] = None
+_default_lock = threading.Lock()
+
+
+def configure(path: Optional[str] = None, **options: Any) -> ChartCache:
+    """
+    替换模块级函数使用的默认 ChartCache（旧的缓存会被关闭）
+
+    Args:
+        path: sqlite 数据库路径，可使用 default_path()；为 None 时只使用内存
+        **options: 传给 ChartCache 的其他参数
+
+    Returns:
+        新的默认 ChartCache
+
+    Example:
+        >>> from iztro_py import cache
+        >>> cache.configure(cache.default_path())
+    """
+    global _default_cache
+    with _default_lock:
+        previous = _default_cache
+        _default_cache = ChartCache(path, **options)
+    if previous is not None:
+        previous.close()
+    return _default_cache
+
+
+def get_cache() -> ChartCache:
+    """获取默认 ChartCache（首次使用时创建仅内存的缓存）"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = ChartCache()
+    return _default_cache
+
+
+def by_solar(
+    solar_date: str,
+    time_index: int,
+    gender: str,
+    fix_leap: bool = True,
+    language: str = "zh-CN",
+) -> Any:
+    """
+    使用默认缓存的 astro.by_solar()
+
+    Example:
+        >>> chart = cache.by_solar('2000-8-16', 6, '男')
+    """
+    return get_cache().by_solar(solar_date, time_index, gender, fix_leap, language)
+
+
+def by_lunar(
+    lunar_date: str,
+    time_index: int,
+    gender: str,
+    is_leap_month: bool = False,
+    fix_leap: bool = True,
+    language: str = "zh-CN",
+) -> Any:
+    """
+    使用默认缓存的 astro.by_lunar()
+
+    Example:
+        >>> chart = cache.by_lunar('2000-7-17', 6, '男')
+    """
+    return get_cache().by_lunar(lunar_date, time_index, gender, is_leap_month, fix_leap, language)
+
+
+def horoscope(chart: Any, solar_date: str, time_index: int = 0) -> Any:
+    """
+    使用默认缓存的 chart.horoscope()
+
+    Example:
+        >>> horoscope = cache.horoscope(chart, '2024-1-1', 6)
+    """
+    return get_cache().horoscope(chart, solar_date, time_index)
+
+
+__all__ = [
+    "CACHE_FORMAT",
+    "MEMORY_CACHE",
+    "STORE_CACHE",
+    "date_key",
+    "chart_fingerprint",
+    "request_key",
+    "default_path",
+    "PickleCodec",
+    "SQLiteStore",
+    "DBMStore",
+    "SharedMemoryStore",
+    "LRUCache",
+    "ChartCache",
+    "configure",
+    "get_cache",
+    "by_solar",
+    "by_lunar",
+    "horoscope",
+]
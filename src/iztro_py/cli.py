@@ -0,0 +1,129 @@
+"""
+Command line interface: iztro-py (or python -m iztro_py)
+
+    iztro-py batch births.csv -o charts.jsonl -j 8
+    iztro-py batch births.jsonl --format columnar -o charts/
+    iztro-py batch /shared/births.csv --job-dir /shared/job --shard 3/16
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from iztro_py.batch import Progress, read_records, run_batch, run_job, write_jsonl
+
+
+def _shard(value: str) -> Tuple[int, int]:
+    index, _, count = value.partition("/")
+    try:
+        return int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard {value!r}, expected I/N") from None
+
+
+def _batch(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    if args.format == "columnar" and not args.output:
+        parser.error("--format columnar requires -o/--output DIRECTORY")
+    if args.job_dir and (args.output or args.format != "jsonl"):
+        parser.error("--job-dir writes JSONL chunk files and cannot be combined with -o/--format")
+    if args.shard and not args.job_dir:
+        parser.error("--shard requires --job-dir")
+
+    progress = Progress(None if args.quiet else sys.stderr, interval=args.progress_interval)
+    try:
+        if args.job_dir:
+            stats = run_job(
+                args.input,
+                args.job_dir,
+                shard=args.shard or (0, 1),
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                input_format=args.input_format,
+                language=args.language,
+                progress=progress,
+            )
+            if not args.quiet:
+                print(json.dumps(dict(progress.summary(), **stats)), file=sys.stderr)
+            return 0
+        records = read_records(args.input, args.input_format)
+        rows = progress.track(
+            run_batch(
+                records,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                render="json" if args.format == "jsonl" else "chart",
+                language=args.language,
+            )
+        )
+        if args.format == "jsonl":
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    write_jsonl(rows, f)
+            else:
+                write_jsonl(rows, sys.stdout)
+        else:
+            _write_columnar(rows, args.output)
+    except (OSError, ValueError) as e:
+        print(f"iztro-py batch: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(json.dumps(progress.summary()), file=sys.stderr)
+    return 0
+
+
+def _write_columnar(rows: Any, directory: str) -> None:
+    from iztro_py.columnar import export_columnar
+
+    def charts() -> Any:
+        # 列式输出无法包含出错的记录，改为写到标准错误
+        for row in rows:
+            if row.error is None:
+                yield row.result
+            else:
+                error: Dict[str, Any] = {"line": row.line, "error": row.error}
+                if row.id is not None:
+                    error["id"] = row.id
+                print(json.dumps(error, ensure_ascii=False), file=sys.stderr)
+
+    export_columnar(charts(), directory)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="iztro-py", description="iztro-py command line tools.")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+
+    batch = commands.add_parser(
+        "batch",
+        help="compute charts for a file of birth records",
+        description=(
+            "Read birth records (date, time_index or hour, gender, calendar, language) "
+            "from CSV or JSONL and write one chart per record, in input order."
+        ),
+    )
+    batch.add_argument("input", help="CSV/JSONL file, or - for standard input")
+    batch.add_argument("-o", "--output", help="output file (jsonl) or directory (columnar)")
+    batch.add_argument("--input-format", choices=["csv", "jsonl"], help="default: by extension")
+    batch.add_argument("--format", choices=["jsonl", "columnar"], default="jsonl")
+    batch.add_argument("-j", "--workers", type=int, help="worker processes (default: all cores)")
+    batch.add_argument("--chunk-size", type=int, default=1000, help="records per work unit")
+    batch.add_argument("--language", default="zh-CN", help="default output language")
+    batch.add_argument(
+        "--job-dir", help="resumable job: write checkpointed JSONL chunks into this directory"
+    )
+    batch.add_argument("--shard", type=_shard, help="with --job-dir: process shard I of N")
+    batch.add_argument(
+        "--progress-interval", type=float, default=2.0, help="seconds between progress lines"
+    )
+    batch.add_argument("-q", "--quiet", action="store_true", help="no progress or summary")
+    args = parser.parse_args(argv)
+
+    if args.command == "batch":
+        return _batch(args, batch)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+"""
+Columnar batch export for iztro-py
+
+Writes large numbers of astrolabes as one file per column, so that analytical
+tools can memory-map them instead of loading millions of Python dicts.
+
+Every categorical value is dictionary-encoded against a fixed dictionary
+(stems, branches, star names, ...), which keeps codes stable across chunks and
+across export runs. Columns are written as ``.npy`` files that ``numpy.load``
+can open with ``mmap_mode='r'``; the format is written directly, so NumPy is
+only needed for reading. When ``pyarrow`` is installed an Arrow IPC file with
+dictionary-typed columns is written alongside.
+
+Example:
+    >>> from iztro_py import astro
+    >>> from iztro_py.columnar import export_columnar, load_columnar
+    >>> charts = (astro.by_solar(f"2000-1-{d}", 6, "男") for d in range(1, 29))
+    >>> export_columnar(charts, "out/")
+    28
+    >>> columns = load_columnar("out/")  # 需要 numpy
+    >>> columns["star_ziweiMaj_palace"][:3]
+"""
+
+import json
+import os
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from iztro_py.astro.functional_astrolabe import FunctionalAstrolabe
+from iztro_py.data.constants import (
+    EARTHLY_BRANCHES,
+    HEAVENLY_STEMS,
+    MAJOR_STARS,
+    MINOR_STARS,
+    MUTAGEN,
+    TIME_RANGE,
+)
+from iztro_py.utils.calendar import (
+    ZODIAC_NAMES,
+    parse_formatted_chinese_date,
+    parse_formatted_lunar_date,
+)
+
+SCHEMA_FILE = "schema.json"
+ARROW_FILE = "charts.arrow"
+
+# .npy 头部固定长度，便于流式写入结束后回填行数
+_NPY_HEADER_SIZE = 128
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+# 固定字典（编码 0 表示 None 的字典以 None 开头）
+GENDERS: List[Optional[str]] = ["男", "女"]
+FIVE_ELEMENTS_CLASSES: List[Optional[str]] = ["水二局", "木三局", "金四局", "土五局", "火六局"]
+ZODIACS: List[Optional[str]] = [ZODIAC_NAMES[b] for b in EARTHLY_BRANCHES]
+SIGNS: List[Optional[str]] = [
+    "白羊座",
+    "金牛座",
+    "双子座",
+    "巨蟹座",
+    "狮子座",
+    "处女座",
+    "天秤座",
+    "天蝎座",
+    "射手座",
+    "摩羯座",
+    "水瓶座",
+    "双鱼座",
+]
+BRIGHTNESS: List[Optional[str]] = [None, "庙", "旺", "得", "利", "平", "不", "陷"]
+MUTAGENS: List[Optional[str]] = [None] + list(MUTAGEN)
+STARS: List[Optional[str]] = list(MAJOR_STARS) + list(MINOR_STARS)
+
+# 列类型：array 类型码 -> numpy dtype 描述
+_ENDIAN = "<" if sys.byteorder == "little" else ">"
+_DTYPES = {"B": "|u1", "b": "|i1", "h": _ENDIAN + "i2"}
+
+
+def _column_specs() -> List[Tuple[str, str, Optional[Sequence[Optional[str]]]]]:
+    """列定义：(列名, array 类型码, 字典)"""
+    specs: List[Tuple[str, str, Optional[Sequence[Optional[str]]]]] = [
+        ("solar_year", "h", None),
+        ("solar_month", "B", None),
+        ("solar_day", "B", None),
+        ("lunar_year", "h", None),
+        ("lunar_month", "B", None),
+        ("lunar_day", "B", None),
+        ("lunar_is_leap", "B", None),
+        ("time_index", "B", None),
+        ("gender", "B", GENDERS),
+        ("sign", "B", SIGNS),
+        ("zodiac", "B", ZODIACS),
+        ("five_elements_class", "B", FIVE_ELEMENTS_CLASSES),
+        ("soul_branch", "B", EARTHLY_BRANCHES),
+        ("body_branch", "B", EARTHLY_BRANCHES),
+        ("soul_star", "B", STARS),
+        ("body_star", "B", STARS),
+    ]
+
+    for pillar in ("year", "month", "day", "time"):
+        specs.append((f"{pillar}_stem", "B", HEAVENLY_STEMS))
+        specs.append((f"{pillar}_branch", "B", EARTHLY_BRANCHES))
+
+    for i in range(12):
+        specs.append((f"palace_{i}_stem", "B", HEAVENLY_STEMS))
+        specs.append((f"palace_{i}_branch", "B", EARTHLY_BRANCHES))
+        specs.append((f"palace_{i}_is_body", "B", None))
+
+    # 星曜所在宫位索引（-1 表示不在盘中）、亮度、四化
+    for star in STARS:
+        specs.append((f"star_{star}_palace", "b", None))
+        specs.append((f"star_{star}_brightness", "B", BRIGHTNESS))
+        specs.append((f"star_{star}_mutagen", "B", MUTAGENS))
+
+    return specs
+
+
+def _encoder(categories: Sequence[Optional[str]]) -> Dict[Optional[str], int]:
+    return {value: code for code, value in enumerate(categories)}
+
+
+def _npy_header(descr: str, rows: int) -> bytes:
+    """生成固定长度的 .npy v1.0 头部"""
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({rows},), }}"
+    padding = _NPY_HEADER_SIZE - len(_NPY_MAGIC) - 2 - len(header) - 1
+    text = (header + " " * padding + "\n").encode("latin1")
+    return _NPY_MAGIC + len(text).to_bytes(2, "little") + text
+
+
+class ColumnarWriter:
+    """
+    流式列式写入器
+
+    每累计 chunk_size 个星盘就把各列缓冲写入对应的 .npy 文件（以及 Arrow 记录批），
+    内存占用只与 chunk_size 有关，与总行数无关。
+
+    Args:
+        directory: 输出目录（不存在时自动创建）
+        chunk_size: 每个写入批次的行数
+        arrow: 是否写 Arrow IPC 文件；None 表示安装了 pyarrow 时自动写入
+    """
+
+    def __init__(self, directory: str, chunk_size: int = 65536, arrow: Optional[bool] = None):
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self._specs = _column_specs()
+        self._encoders = {
+            name: _encoder(categories)
+            for name, _, categories in self._specs
+            if categories is not None
+        }
+        self._buffers = {name: array(typecode) for name, typecode, _ in self._specs}
+        self._pending = 0
+        self._closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        self._files = {}
+        for name, typecode, _ in self._specs:
+            f = open(os.path.join(directory, f"{name}.npy"), "wb")
+            f.write(_npy_header(_DTYPES[typecode], 0))
+            self._files[name] = f
+
+        self._arrow_writer: Any = None
+        self._arrow_schema: Any = None
+        if arrow is None or arrow:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                if arrow:
+                    raise
+            else:
+                self._open_arrow()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write(self, chart: Union[FunctionalAstrolabe, Dict[str, Any]]) -> None:
+        """
+        写入一个星盘
+
+        Args:
+            chart: FunctionalAstrolabe 或 to_iztro_dict() 的输出
+        """
+        if self._closed:
+            raise ValueError("ColumnarWriter is closed")
+        if isinstance(chart, dict):
+            chart = FunctionalAstrolabe.from_iztro_dict(chart)
+
+        # 先编码整行，全部成功后再追加，避免出错时各列长度不一致
+        encoded = []
+        for name, value in self._row(chart):
+            encoder = self._encoders.get(name)
+            if encoder is not None:
+                try:
+                    value = encoder[value]
+                except KeyError:
+                    raise ValueError(f"Unexpected value for column {name}: {value!r}")
+            encoded.append((self._buffers[name], value))
+
+        appended = 0
+        try:
+            for buffer, value in encoded:
+                buffer.append(value)
+                appended += 1
+        except (OverflowError, TypeError) as e:
+            # 数值超出列类型范围：撤销本行已追加的值
+            for buffer, _ in encoded[:appended]:
+                buffer.pop()
+            raise ValueError(f"Value out of range for column type: {e}")
+
+        self._pending += 1
+        if self._pending >= self.chunk_size:
+            self.flush()
+
+    def write_many(self, charts: Iterable[Union[FunctionalAstrolabe, Dict[str, Any]]]) -> int:
+        """
+        写入多个星盘（可以是生成器）
+
+        Returns:
+            本次写入的行数
+        """
+        count = 0
+        for chart in charts:
+            self.write(chart)
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        """把缓冲中的行写入磁盘"""
+        if not self._pending:
+            return
+
+        if self._arrow_writer is not None:
+            self._write_arrow_batch()
+
+        for name, buffer in self._buffers.items():
+            buffer.tofile(self._files[name])
+            del buffer[:]
+
+        self.rows += self._pending
+        self._pending = 0
+
+    def close(self) -> None:
+        """写入剩余数据，回填 .npy 头部中的行数，并写出 schema.json"""
+        if self._closed:
+            return
+        self.flush()
+
+        for name, typecode, _ in self._specs:
+            f = self._files[name]
+            f.seek(0)
+            f.write(_npy_header(_DTYPES[typecode], self.rows))
+            f.close()
+
+        if self._arrow_writer is not None:
+            self._arrow_writer.close()
+
+        schema = {
+            "rows": self.rows,
+            "columns": {
+                name: {"dtype": _DTYPES[typecode], "categories": categories}
+                for name, typecode, categories in self._specs
+            },
+        }
+        with open(os.path.join(self.directory, SCHEMA_FILE), "w", encoding="utf-8") as f:
+            json.dump(schema, f, ensure_ascii=False, indent=2)
+
+        self._closed = True
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row(chart: FunctionalAstrolabe) -> List[Tuple[str, Any]]:
+        """将星盘展开为 (列名, 原始值) 列表，顺序与列定义一致"""
+        year, month, day = (int(x) for x in chart.solar_date.split("-"))
+        lunar = chart.raw_lunar_date or parse_formatted_lunar_date(chart.lunar_date)
+        pillars = chart.raw_chinese_date or parse_formatted_chinese_date(chart.chinese_date)
+
+        row: List[Tuple[str, Any]] = [
+            ("solar_year", year),
+            ("solar_month", month),
+            ("solar_day", day),
+            ("lunar_year", lunar.year),
+            ("lunar_month", lunar.month),
+            ("lunar_day", lunar.day),
+            ("lunar_is_leap", int(lunar.is_leap_month)),
+            ("time_index", TIME_RANGE.index(chart.time_range)),
+            ("gender", chart.gender),
+            ("sign", chart.sign),
+            ("zodiac", chart.zodiac),
+            ("five_elements_class", chart.five_elements_class),
+            ("soul_branch", chart.earthly_branch_of_soul_palace),
+            ("body_branch", chart.earthly_branch_of_body_palace),
+            ("soul_star", chart.soul),
+            ("body_star", chart.body),
+        ]
+
+        for pillar in ("year", "month", "day", "time"):
+            row.append((f"{pillar}_stem", getattr(pillars, f"{pillar}_stem")))
+            row.append((f"{pillar}_branch", getattr(pillars, f"{pillar}_branch")))
+
+        stars: Dict[str, Tuple[int, Optional[str], Optional[str]]] = {}
+        for palace in chart.palaces:
+            row.append((f"palace_{palace.index}_stem", palace.heavenly_stem))
+            row.append((f"palace_{palace.index}_branch", palace.earthly_branch))
+            row.append((f"palace_{palace.index}_is_body", int(palace.is_body_palace)))
+            for star in palace.major_stars.interned() + palace.minor_stars.interned():
+                stars[star.name] = (palace.index, star.brightness, star.mutagen)
+
+        for name in STARS:
+            palace_index, brightness, mutagen = stars.get(name, (-1, None, None))
+            row.append((f"star_{name}_palace", palace_index))
+            row.append((f"star_{name}_brightness", brightness))
+            row.append((f"star_{name}_mutagen", mutagen))
+
+        return row
+
+    def _open_arrow(self) -> None:
+        import pyarrow as pa
+
+        fields = []
+        for name, typecode, categories in self._specs:
+            value_type = {"B": pa.uint8(), "b": pa.int8(), "h": pa.int16()}[typecode]
+            if categories is None:
+                fields.append(pa.field(name, value_type))
+            else:
+                fields.append(pa.field(name, pa.dictionary(pa.uint8(), pa.string())))
+        self._arrow_schema = pa.schema(fields)
+        self._arrow_writer = pa.ipc.new_file(
+            os.path.join(self.directory, ARROW_FILE), self._arrow_schema
+        )
+
+    def _write_arrow_batch(self) -> None:
+        import pyarrow as pa
+
+        columns = []
+        for name, typecode, categories in self._specs:
+            buffer = self._buffers[name]
+            if categories is None:
+                columns.append(pa.array(buffer, type=self._arrow_schema.field(name).type))
+                continue
+            # 字典中的 None（编码 0）以空值表示
+            if categories[0] is None:
+                indices = pa.array([code or None for code in buffer], type=pa.uint8())
+            else:
+                indices = pa.array(buffer, type=pa.uint8())
+            dictionary = pa.array([c or "" for c in categories], type=pa.string())
+            columns.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+
+        batch = pa.RecordBatch.from_arrays(columns, schema=self._arrow_schema)
+        self._arrow_writer.write_batch(batch)
+
+
+def export_columnar(
+    charts: Iterable[Union[FunctionalAstrolabe, Dict[str, Any]]],
+    directory: str,
+    chunk_size: int = 65536,
+    arrow: Optional[bool] = None,
+) -> int:
+    """
+    将一批星盘导出为列式文件
+
+    Args:
+        charts: 星盘或 to_iztro_dict() 输出的可迭代对象（建议使用生成器）
+        directory: 输出目录
+        chunk_size: 每个写入批次的行数
+        arrow: 是否写 Arrow IPC 文件；None 表示安装了 pyarrow 时自动写入
+
+    Returns:
+        写入的总行数
+    """
+    with ColumnarWriter(directory, chunk_size=chunk_size, arrow=arrow) as writer:
+        writer.write_many(charts)
+    return writer.rows
+
+
+def load_columnar(directory: str, mmap: bool = True) -> Dict[str, Any]:
+    """
+    读取列式导出结果（需要 numpy）
+
+    Args:
+        directory: export_columnar 的输出目录
+        mmap: 是否以内存映射方式打开
+
+    Returns:
+        列名到 numpy 数组的映射；字典编码列的取值见 read_schema()
+    """
+    import numpy as np
+
+    schema = read_schema(directory)
+    mode = "r" if mmap else None
+    return {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+        for name in schema["columns"]
+    }
+
+
+def read_schema(directory: str) -> Dict[str, Any]:
+    """
+    读取导出目录中的 schema.json（行数、各列 dtype 与字典）
+    """
+    with open(os.path.join(directory, SCHEMA_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+__all__ = [
+    "ColumnarWriter",
+    "export_columnar",
+    "load_columnar",
+    "read_schema",
+]
@@ -4,9 +4,10 @@ Star brightness (星耀亮度) data and calculations
 Contains brightness information for stars based on their palace positions.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from iztro_py.data.types import StarName, Brightness, EarthlyBranchName
-from iztro_py.data.constants import EARTHLY_BRANCHES
+from iztro_py.data.constants import EARTHLY_BRANCHES, STAR_CODES, STAR_NAMES
+from iztro_py.star.pool import replace_star
 
 
 # ============================================================================
@@ -47,6 +48,28 @@ STAR_BRIGHTNESS: Dict[StarName, List[Optional[Brightness]]] = {
     # 辅星的亮度通常不标注，这里可以留空或使用默认值
 }
 
+# 亮度编码，0 表示未定义
+BRIGHTNESS_LEVELS: Tuple[Optional[Brightness], ...] = (
+    None,
+    "庙",
+    "旺",
+    "得",
+    "利",
+    "平",
+    "不",
+    "陷",
+)
+
+# 紧凑亮度表：星曜编码为 code（见 STAR_CODES）、地支索引为 i（子丑寅…亥）
+# 的亮度编码位于 BRIGHTNESS_TABLE[code * 12 + i]。
+# 查表只读取这一个 bytes 对象，不触碰各星曜的列表和字符串，多进程 fork 后
+# 不会因为引用计数写入而复制这些内存页。
+BRIGHTNESS_TABLE: bytes = bytes(
+    BRIGHTNESS_LEVELS.index(STAR_BRIGHTNESS[name][(i - 2) % 12]) if name in STAR_BRIGHTNESS else 0
+    for name in STAR_NAMES
+    for i in range(12)
+)
+
 
 def get_star_brightness(
     star_name: StarName, palace_branch: EarthlyBranchName
@@ -61,35 +84,14 @@ def get_star_brightness(
     Returns:
         亮度等级，如果没有定义则返回None
     """
-    if star_name not in STAR_BRIGHTNESS:
+    code = STAR_CODES.get(star_name)
+    if code is None:
         return None
 
-    brightness_list = STAR_BRIGHTNESS[star_name]
-
     # 地支索引：子丑寅卯辰巳午未申酉戌亥 (0-11)
-    # 亮度列表索引：寅卯辰巳午未申酉戌亥子丑 (0-11)
-    # 需要转换索引
     branch_index = EARTHLY_BRANCHES.index(palace_branch)
 
-    # 转换索引：子(0)->10, 丑(1)->11, 寅(2)->0, ...
-    brightness_index_map = {
-        0: 10,  # 子
-        1: 11,  # 丑
-        2: 0,  # 寅
-        3: 1,  # 卯
-        4: 2,  # 辰
-        5: 3,  # 巳
-        6: 4,  # 午
-        7: 5,  # 未
-        8: 6,  # 申
-        9: 7,  # 酉
-        10: 8,  # 戌
-        11: 9,  # 亥
-    }
-
-    brightness_index = brightness_index_map[branch_index]
-
-    return brightness_list[brightness_index]
+    return BRIGHTNESS_LEVELS[BRIGHTNESS_TABLE[code * 12 + branch_index]]
 
 
 def apply_brightness_to_palaces(palaces: List[Dict[str, Any]]) -> None:
@@ -100,16 +102,18 @@ def apply_brightness_to_palaces(palaces: List[Dict[str, Any]]) -> None:
         palaces: 宫位列表
 
     Note:
-        直接修改palaces列表，不返回值
+        直接修改palaces列表，不返回值；星曜是共享实例，
+        会被替换为星曜池中带亮度的实例，而不是原地修改
     """
     for palace in palaces:
         palace_branch = palace["earthly_branch"]
 
         # 为主星添加亮度
-        for star in palace["major_stars"]:
+        major_stars = palace["major_stars"]
+        for i, star in enumerate(major_stars):
             brightness = get_star_brightness(star.name, palace_branch)
             if brightness:
-                star.brightness = brightness
+                major_stars[i] = replace_star(star, brightness=brightness)
 
         # 辅星通常不标注亮度，但可以预留接口
         # for star in palace['minor_stars']:
@@ -5,7 +5,7 @@ This module contains all constant values, lookup tables, and reference data
 used for Zi Wei Dou Shu calculations.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from iztro_py.data.types import (
     HeavenlyStemName,
     EarthlyBranchName,
@@ -92,6 +92,14 @@ EARTHLY_BRANCHES: List[EarthlyBranchName] = [
     "haiEarthly",  # 亥
 ]
 
+# 名称 -> 索引，代替热路径上的 list.index()
+HEAVENLY_STEM_INDEX: Dict[HeavenlyStemName, int] = {
+    name: i for i, name in enumerate(HEAVENLY_STEMS)
+}
+EARTHLY_BRANCH_INDEX: Dict[EarthlyBranchName, int] = {
+    name: i for i, name in enumerate(EARTHLY_BRANCHES)
+}
+
 
 # ============================================================================
 # Palaces (十二宫位)
@@ -156,6 +164,10 @@ MINOR_STARS: List[StarName] = [
     "tianmaMin",  # 天马
 ]
 
+# 星曜编码：紧凑查找表（bytes）中用星曜在 STAR_NAMES 中的位置表示星曜
+STAR_NAMES: Tuple[StarName, ...] = tuple(MAJOR_STARS + MINOR_STARS)
+STAR_CODES: Dict[StarName, int] = {name: code for code, name in enumerate(STAR_NAMES)}
+
 
 # ============================================================================
 # Mutagenesis (四化)
@@ -5,8 +5,9 @@ Contains detailed information about the ten heavenly stems including
 yin-yang, five elements, clashes, and mutagen (四化) configurations.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from iztro_py.data.types import HeavenlyStemName, YinYang, FiveElements, StarName, Mutagen
+from iztro_py.data.constants import STAR_CODES
 
 
 class HeavenlyStem:
@@ -107,6 +108,17 @@ HEAVENLY_STEMS_CONFIG: Dict[HeavenlyStemName, HeavenlyStem] = {
     ),
 }
 
+MUTAGEN_TYPES: Tuple[Mutagen, ...] = ("禄", "权", "科", "忌")
+
+# 紧凑四化表：天干 stem 的禄权科忌四颗星的编码（见 STAR_CODES）位于
+# MUTAGEN_TABLE[MUTAGEN_ROWS[stem]:MUTAGEN_ROWS[stem] + 4]
+MUTAGEN_ROWS: Dict[HeavenlyStemName, int] = {
+    stem: row * 4 for row, stem in enumerate(HEAVENLY_STEMS_CONFIG)
+}
+MUTAGEN_TABLE: bytes = bytes(
+    STAR_CODES[name] for config in HEAVENLY_STEMS_CONFIG.values() for name in config.mutagen
+)
+
 
 # ============================================================================
 # Helper Functions
@@ -137,14 +149,13 @@ def get_mutagen_type(heavenly_stem: HeavenlyStemName, star_name: StarName) -> Op
     Returns:
         四化类型：'禄'、'权'、'科'、'忌'，如果不是四化星则返回 None
     """
-    mutagen_stars = HEAVENLY_STEMS_CONFIG[heavenly_stem].mutagen
-    mutagen_types: List[Mutagen] = ["禄", "权", "科", "忌"]
-
-    if star_name in mutagen_stars:
-        index = mutagen_stars.index(star_name)
-        return mutagen_types[index]
+    row = MUTAGEN_ROWS[heavenly_stem]
+    code = STAR_CODES.get(star_name)
+    if code is None:
+        return None
 
-    return None
+    index = MUTAGEN_TABLE.find(code, row, row + 4)
+    return MUTAGEN_TYPES[index - row] if index >= 0 else None
 
 
 def get_yin_yang(heavenly_stem: HeavenlyStemName) -> YinYang:
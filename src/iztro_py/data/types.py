@@ -8,15 +8,13 @@ Based on the original TypeScript definitions from iztro.
 from enum import Enum
 from typing import Any, Dict, Literal, Optional, List, Tuple, Union
 from pydantic import BaseModel, Field, ConfigDict
+from iztro_py.i18n import set_language, t
 
 
 def _translate_name(key: str, lang: Optional[str] = None) -> str:
     """
     翻译名称的辅助函数
-    延迟导入 i18n 模块以避免循环依赖
     """
-    from iztro_py.i18n import t
-
     # 尝试多个可能的键
     # 1. 直接作为星曜名称
     if key in [
@@ -318,7 +316,6 @@ class Star(BaseModel):
         """
         if not self.brightness:
             return None
-        from iztro_py.i18n import t
 
         # 亮度直接就是中文，需要映射到英文键
         brightness_map = {
@@ -449,8 +446,6 @@ class Astrolabe(BaseModel):
         Args:
             lang: 目标语言代码
         """
-        from iztro_py.i18n import set_language
-
         self.language = lang
         set_language(lang)
 
@@ -11,14 +11,20 @@
 - vi-VN: Tiếng Việt
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
+
+# 支持的语言列表
+SUPPORTED_LANGUAGES = ["zh-CN", "zh-TW", "en-US", "ja-JP", "ko-KR", "vi-VN"]
 
 # 当前语言设置
 _current_language = "zh-CN"
 
-# 语言资源缓存
+# 语言资源缓存（首次使用某语言时才加载，包括默认的 zh-CN）
 _locales: Dict[str, Dict[str, Any]] = {}
 
+# 反向翻译表缓存（语言 -> 分类 -> 译文 -> 键名）
+_reverse_tables: Dict[str, Dict[str, Dict[str, str]]] = {}
+
 
 def set_language(lang: str) -> None:
     """
@@ -29,7 +35,7 @@ def set_language(lang: str) -> None:
               不支持的语言将降级为 'zh-CN'
     """
     global _current_language
-    supported = ["zh-CN", "zh-TW", "en-US", "ja-JP", "ko-KR", "vi-VN"]
+    supported = SUPPORTED_LANGUAGES
 
     # 如果语言不支持，降级到中文，但不报错
     if lang not in supported:
@@ -94,6 +100,22 @@ def _load_locale(lang: str) -> None:
         raise ValueError(f"Language resource not found: {lang}")
 
 
+def preload_locales(languages: Optional[Iterable[str]] = None) -> None:
+    """
+    预先加载语言资源（不改变当前语言）
+
+    Args:
+        languages: 语言代码列表，默认加载所有支持的语言
+
+    Raises:
+        ValueError: 如果语言不受支持
+    """
+    for lang in SUPPORTED_LANGUAGES if languages is None else languages:
+        if lang not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported language: {lang}")
+        _load_locale(lang)
+
+
 def t(key: str, lang: Optional[str] = None) -> str:
     """
     翻译函数
@@ -125,6 +147,43 @@ def t(key: str, lang: Optional[str] = None) -> str:
     return value if isinstance(value, str) else key
 
 
+def get_reverse_table(lang: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+    """
+    获取反向翻译表（译文 -> 英文键）
+
+    按分类分别建表，避免不同分类中同名译文冲突（如英文的天干“戊”与地支“午”均为 "Wu"）。
+    主星与辅星合并到 'stars' 分类。表在首次使用时构建并缓存。
+
+    Args:
+        lang: 可选，指定语言。如不指定则使用当前语言
+
+    Returns:
+        {'palaces': {...}, 'stars': {...}, 'heavenlyStem': {...}, 'earthlyBranch': {...}}
+    """
+    target_lang = lang or _current_language
+
+    table = _reverse_tables.get(target_lang)
+    if table is not None:
+        return table
+
+    if target_lang not in _locales:
+        _load_locale(target_lang)
+    locale = _locales.get(target_lang, {})
+
+    stars = dict(locale.get("stars", {}).get("major", {}))
+    stars.update(locale.get("stars", {}).get("minor", {}))
+    sections = {
+        "palaces": locale.get("palaces", {}),
+        "stars": stars,
+        "heavenlyStem": locale.get("heavenlyStem", {}),
+        "earthlyBranch": locale.get("earthlyBranch", {}),
+    }
+
+    table = {name: {v: k for k, v in entries.items()} for name, entries in sections.items()}
+    _reverse_tables[target_lang] = table
+    return table
+
+
 def translate_dict(data: Dict[str, Any], lang: Optional[str] = None) -> Dict[str, Any]:
     """
     翻译字典中的值
@@ -149,8 +208,12 @@ def translate_dict(data: Dict[str, Any], lang: Optional[str] = None) -> Dict[str
     return result
 
 
-# 默认加载中文
-_load_locale("zh-CN")
-
-
-__all__ = ["set_language", "get_language", "t", "translate_dict"]
+__all__ = [
+    "SUPPORTED_LANGUAGES",
+    "set_language",
+    "get_language",
+    "preload_locales",
+    "t",
+    "get_reverse_table",
+    "translate_dict",
+]
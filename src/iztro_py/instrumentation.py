@@ -0,0 +1,285 @@
+"""
+Opt-in instrumentation for iztro-py
+
+Records how long each stage of the chart building pipeline takes, and
+whether internal caches were hit, without attaching a profiler. When nothing
+is recording, the pipeline only pays for one check per chart.
+
+Record the charts built inside a block (scoped to the current thread or
+asyncio task):
+    >>> from iztro_py import astro, instrumentation
+    >>> with instrumentation.record() as rec:
+    ...     astro.by_solar("2000-8-16", 6, "男")
+    >>> rec.summary()["by_solar"]["major_stars"]["mean"]
+
+Or receive every pipeline run process-wide, e.g. to feed a metrics system
+(iztro_py.metrics is built on these listeners):
+    >>> def on_stages(pipeline, stages, labels):
+    ...     print(pipeline, stages)
+    >>> instrumentation.add_listener(on_stages)
+
+Pipelines: by_solar (stages in BY_SOLAR_STAGES), by_solar_fields (only the
+stages the requested fields need), by_solar_all_hours (stages summed over the
+13 hours), horoscope, solar_to_lunar, lunar_to_solar and to_iztro_dict
+(labelled with the output language).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# 星盘构建流水线（by_solar）的阶段，按执行顺序
+BY_SOLAR_STAGES: Tuple[str, ...] = (
+    "parse_date",
+    "solar_to_lunar",
+    "pillars",
+    "zodiac_sign",
+    "soul_body",
+    "five_elements_class",
+    "soul_body_stars",
+    "init_palaces",
+    "major_stars",
+    "minor_stars",
+    "mutagen",
+    "brightness",
+    "build_model",
+    "functional_wrap",
+)
+
+# 缓存事件
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_EVICTION = "eviction"
+
+StageListener = Callable[[str, Dict[str, float], Dict[str, str]], None]
+CacheListener = Callable[[str, str], None]
+
+_stage_listeners: List[StageListener] = []
+_cache_listeners: List[CacheListener] = []
+_recorders: ContextVar[Tuple["Recorder", ...]] = ContextVar("iztro_py_recorders", default=())
+
+# 打开的记录器与已注册监听器的总数；为 0 时所有埋点直接跳过
+_active = 0
+_active_lock = threading.Lock()
+
+
+def _add_active(delta: int) -> None:
+    global _active
+    with _active_lock:
+        _active += delta
+
+
+class Recorder:
+    """
+    记录器：收集 record() 代码块中的各阶段耗时与缓存命中情况
+
+    Attributes:
+        runs: 每次流水线执行的 (流水线名称, {阶段: 秒}) 列表
+        cache_hits: 各缓存的命中次数
+        cache_misses: 各缓存的未命中次数
+        cache_evictions: 各缓存的淘汰条目数
+    """
+
+    def __init__(self) -> None:
+        self.runs: List[Tuple[str, Dict[str, float]]] = []
+        self.cache_hits: Dict[str, int] = {}
+        self.cache_misses: Dict[str, int] = {}
+        self.cache_evictions: Dict[str, int] = {}
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        按流水线和阶段汇总耗时
+
+        Returns:
+            {流水线: {阶段: {'count', 'total', 'mean', 'max'}}}，时间单位为秒
+        """
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for pipeline, stages in self.runs:
+            pipeline_summary = result.setdefault(pipeline, {})
+            for stage, seconds in stages.items():
+                item = pipeline_summary.setdefault(
+                    stage, {"count": 0, "total": 0.0, "mean": 0.0, "max": 0.0}
+                )
+                item["count"] += 1
+                item["total"] += seconds
+                item["max"] = max(item["max"], seconds)
+        for pipeline_summary in result.values():
+            for item in pipeline_summary.values():
+                item["mean"] = item["total"] / item["count"]
+        return result
+
+
+class StageTimer:
+    """
+    单次流水线执行的阶段计时器
+
+    每次调用 timer(stage) 记录从上一次调用（或创建计时器）到现在的耗时，
+    同一阶段多次调用（如一次排出多个时辰）时累加；
+    finish() 将结果分发给记录器和监听器。
+    """
+
+    __slots__ = ("pipeline", "labels", "stages", "_last")
+
+    def __init__(self, pipeline: str, labels: Optional[Dict[str, str]] = None) -> None:
+        self.pipeline = pipeline
+        self.labels = labels or {}
+        self.stages: Dict[str, float] = {}
+        self._last = time.perf_counter_ns()
+
+    def __call__(self, stage: str) -> None:
+        now = time.perf_counter_ns()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last) / 1e9
+        self._last = now
+
+    def finish(self) -> None:
+        report(self.pipeline, self.stages, self.labels)
+
+
+def is_enabled() -> bool:
+    """是否有任何记录器或监听器处于活动状态（埋点据此决定是否采集）"""
+    return _active > 0
+
+
+def stage_timer(pipeline: str, labels: Optional[Dict[str, str]] = None) -> Optional[StageTimer]:
+    """
+    为一次流水线执行创建阶段计时器
+
+    Args:
+        pipeline: 流水线名称
+        labels: 附加标签（如输出语言），原样传给监听器
+
+    Returns:
+        计时器；未启用计时时返回None，调用方据此跳过全部计时代码
+    """
+    if not _active or not (_stage_listeners or _recorders.get()):
+        return None
+    return StageTimer(pipeline, labels)
+
+
+def report(
+    pipeline: str, stages: Dict[str, float], labels: Optional[Dict[str, str]] = None
+) -> None:
+    """
+    报告一次已完成的流水线执行，分发给记录器和监听器
+
+    用于转发在其他地方（如工作进程中）计时的执行；本进程内的执行由 StageTimer 报告。
+
+    Args:
+        pipeline: 流水线名称
+        stages: 阶段 -> 耗时（秒）
+        labels: 附加标签
+    """
+    for recorder in _recorders.get():
+        recorder.runs.append((pipeline, stages))
+    for listener in tuple(_stage_listeners):
+        listener(pipeline, stages, labels or {})
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """
+    报告一次缓存访问（调用方应先检查 is_enabled()）
+
+    Args:
+        cache: 缓存名称
+        hit: 是否命中
+    """
+    for recorder in _recorders.get():
+        counts = recorder.cache_hits if hit else recorder.cache_misses
+        counts[cache] = counts.get(cache, 0) + 1
+    event = CACHE_HIT if hit else CACHE_MISS
+    for listener in tuple(_cache_listeners):
+        listener(cache, event)
+
+
+def record_cache_eviction(cache: str, count: int = 1) -> None:
+    """
+    报告缓存淘汰（调用方应先检查 is_enabled()）
+
+    Args:
+        cache: 缓存名称
+        count: 淘汰的条目数
+    """
+    for recorder in _recorders.get():
+        recorder.cache_evictions[cache] = recorder.cache_evictions.get(cache, 0) + count
+    for _ in range(count):
+        for listener in tuple(_cache_listeners):
+            listener(cache, CACHE_EVICTION)
+
+
+@contextmanager
+def record() -> Iterator[Recorder]:
+    """
+    在代码块内记录流水线阶段耗时与缓存命中
+
+    记录范围限于当前线程 / asyncio 任务（基于 contextvars），可以嵌套。
+
+    Yields:
+        Recorder对象
+    """
+    recorder = Recorder()
+    token = _recorders.set(_recorders.get() + (recorder,))
+    _add_active(1)
+    try:
+        yield recorder
+    finally:
+        _add_active(-1)
+        _recorders.reset(token)
+
+
+def add_listener(listener: StageListener) -> None:
+    """
+    注册全局阶段监听器，每次流水线执行结束后以 (流水线名称, {阶段: 秒}, 标签) 调用
+
+    监听器在构建星盘的线程中同步调用，应尽量轻量；其抛出的异常会传递给调用方。
+
+    Args:
+        listener: 回调函数
+    """
+    _stage_listeners.append(listener)
+    _add_active(1)
+
+
+def remove_listener(listener: StageListener) -> None:
+    """注销全局阶段监听器"""
+    _stage_listeners.remove(listener)
+    _add_active(-1)
+
+
+def add_cache_listener(listener: CacheListener) -> None:
+    """
+    注册全局缓存监听器，每次缓存事件以 (缓存名称, 事件) 调用，
+    事件为 CACHE_HIT / CACHE_MISS / CACHE_EVICTION
+
+    Args:
+        listener: 回调函数
+    """
+    _cache_listeners.append(listener)
+    _add_active(1)
+
+
+def remove_cache_listener(listener: CacheListener) -> None:
+    """注销全局缓存监听器"""
+    _cache_listeners.remove(listener)
+    _add_active(-1)
+
+
+__all__ = [
+    "BY_SOLAR_STAGES",
+    "CACHE_HIT",
+    "CACHE_MISS",
+    "CACHE_EVICTION",
+    "Recorder",
+    "StageTimer",
+    "is_enabled",
+    "stage_timer",
+    "report",
+    "record_cache",
+    "record_cache_eviction",
+    "record",
+    "add_listener",
+    "remove_listener",
+    "add_cache_listener",
+    "remove_cache_listener",
+]
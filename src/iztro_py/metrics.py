@@ -0,0 +1,379 @@
+"""
+Runtime metrics for iztro-py
+
+Counts charts built, horoscopes computed, cache hits/misses/evictions,
+calendar conversions and renders per language, with latency histograms, and
+exports them as a dict or in the Prometheus text exposition format.
+
+Metrics are collected through iztro_py.instrumentation listeners, so they
+are disabled (and cost nothing) until enable() is called:
+    >>> from iztro_py import astro, metrics
+    >>> metrics.enable()
+    >>> chart = astro.by_solar("2000-8-16", 6, "男")
+    >>> metrics.snapshot()["iztro_charts_built_total"]["samples"]
+    [{'labels': {}, 'value': 1}]
+    >>> print(metrics.to_prometheus())  # 用于服务自身的 /metrics 端点
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Sequence, Tuple
+
+from iztro_py import instrumentation
+
+# 默认直方图分桶（秒），覆盖从微秒级的历法转换到整张星盘构建
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class _Metric:
+    """指标基类"""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def reset(self) -> None:
+        """清空所有数据"""
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """
+    单调递增的计数器
+
+    Example:
+        >>> CACHE_HITS.inc(cache="solar_to_lunar")
+    """
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        增加计数
+
+        Args:
+            amount: 增量
+            **labels: 标签值
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """获取指定标签的当前计数"""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = list(self._values.items())
+        return [{"labels": self._labels(key), "value": value} for key, value in items]
+
+    def exposition(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(sample['labels'])} {_format_value(sample['value'])}"
+            for sample in self.samples()
+        ]
+
+
+class Histogram(_Metric):
+    """
+    延迟直方图
+
+    Example:
+        >>> CHART_BUILD_SECONDS.observe(0.0006)
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        记录一次观测值
+
+        Args:
+            value: 观测值（秒）
+            **labels: 标签值
+        """
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [各分桶计数（最后一个为 +Inf）, 总和, 次数]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = [
+                (key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()
+            ]
+        result = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                buckets[_format_value(bound)] = cumulative
+            result.append(
+                {"labels": self._labels(key), "buckets": buckets, "sum": total, "count": count}
+            )
+        return result
+
+    def exposition(self) -> List[str]:
+        lines = []
+        for sample in self.samples():
+            labels = sample["labels"]
+            for bound, cumulative in sample["buckets"].items():
+                bucket_labels = dict(labels, le=bound)
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(sample['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {sample['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        注册指标
+
+        Raises:
+            ValueError: 如果同名指标已存在
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        导出所有指标的快照
+
+        Returns:
+            {指标名: {'type', 'help', 'samples'}}
+        """
+        return {
+            name: {"type": metric.type, "help": metric.documentation, "samples": metric.samples()}
+            for name, metric in self._metrics.items()
+        }
+
+    def to_prometheus(self) -> str:
+        """导出 Prometheus 文本格式（text/plain; version=0.0.4）"""
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.exposition())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """清空所有指标的数据"""
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+CHARTS_BUILT = REGISTRY.register(Counter("iztro_charts_built_total", "Charts built."))
+CHART_BUILD_SECONDS = REGISTRY.register(
+    Histogram("iztro_chart_build_seconds", "Time to build a chart.")
+)
+CHART_STAGE_SECONDS = REGISTRY.register(
+    Histogram("iztro_chart_stage_seconds", "Time per chart spent in each build stage.", ["stage"])
+)
+HOROSCOPES = REGISTRY.register(Counter("iztro_horoscopes_total", "Horoscopes computed."))
+HOROSCOPE_SECONDS = REGISTRY.register(
+    Histogram("iztro_horoscope_seconds", "Time to compute a horoscope.")
+)
+CALENDAR_CONVERSIONS = REGISTRY.register(
+    Counter("iztro_calendar_conversions_total", "Calendar conversions.", ["direction"])
+)
+CALENDAR_CONVERSION_SECONDS = REGISTRY.register(
+    Histogram("iztro_calendar_conversion_seconds", "Time per calendar conversion.", ["direction"])
+)
+RENDERS = REGISTRY.register(
+    Counter("iztro_renders_total", "Charts rendered with to_iztro_dict.", ["language"])
+)
+RENDER_SECONDS = REGISTRY.register(
+    Histogram("iztro_render_seconds", "Time to render a chart with to_iztro_dict.", ["language"])
+)
+CACHE_HITS = REGISTRY.register(Counter("iztro_cache_hits_total", "Cache hits.", ["cache"]))
+CACHE_MISSES = REGISTRY.register(Counter("iztro_cache_misses_total", "Cache misses.", ["cache"]))
+CACHE_EVICTIONS = REGISTRY.register(
+    Counter("iztro_cache_evictions_total", "Cache entries evicted.", ["cache"])
+)
+
+_CACHE_COUNTERS = {
+    instrumentation.CACHE_HIT: CACHE_HITS,
+    instrumentation.CACHE_MISS: CACHE_MISSES,
+    instrumentation.CACHE_EVICTION: CACHE_EVICTIONS,
+}
+
+
+# 构建星盘的流水线 -> 每次执行构建的星盘数
+_CHART_PIPELINES = {"by_solar": 1, "by_solar_fields": 1, "by_solar_all_hours": 13}
+
+
+def _on_stages(pipeline: str, stages: Dict[str, float], labels: Dict[str, str]) -> None:
+    seconds = sum(stages.values())
+    charts = _CHART_PIPELINES.get(pipeline)
+    if charts is not None:
+        # 一次排出多张星盘时，按每张星盘的平均耗时计入直方图
+        CHARTS_BUILT.inc(charts)
+        for _ in range(charts):
+            CHART_BUILD_SECONDS.observe(seconds / charts)
+            for stage, stage_seconds in stages.items():
+                CHART_STAGE_SECONDS.observe(stage_seconds / charts, stage=stage)
+    elif pipeline == "horoscope":
+        HOROSCOPES.inc()
+        HOROSCOPE_SECONDS.observe(seconds)
+    elif pipeline in ("solar_to_lunar", "lunar_to_solar"):
+        CALENDAR_CONVERSIONS.inc(direction=pipeline)
+        CALENDAR_CONVERSION_SECONDS.observe(seconds, direction=pipeline)
+    elif pipeline == "to_iztro_dict":
+        language = labels.get("language", "")
+        RENDERS.inc(language=language)
+        RENDER_SECONDS.observe(seconds, language=language)
+
+
+def _on_cache(cache: str, event: str) -> None:
+    counter = _CACHE_COUNTERS.get(event)
+    if counter is not None:
+        counter.inc(cache=cache)
+
+
+_enabled = False
+_enable_lock = threading.Lock()
+
+
+def enable() -> None:
+    """开始采集指标（重复调用无副作用）"""
+    global _enabled
+    with _enable_lock:
+        if not _enabled:
+            instrumentation.add_listener(_on_stages)
+            instrumentation.add_cache_listener(_on_cache)
+            _enabled = True
+
+
+def disable() -> None:
+    """停止采集指标，已采集的数据保留"""
+    global _enabled
+    with _enable_lock:
+        if _enabled:
+            instrumentation.remove_listener(_on_stages)
+            instrumentation.remove_cache_listener(_on_cache)
+            _enabled = False
+
+
+def is_enabled() -> bool:
+    """是否正在采集指标"""
+    return _enabled
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """导出默认注册表的快照，见 MetricsRegistry.snapshot()"""
+    return REGISTRY.snapshot()
+
+
+def to_prometheus() -> str:
+    """导出默认注册表的 Prometheus 文本格式"""
+    return REGISTRY.to_prometheus()
+
+
+def reset() -> None:
+    """清空默认注册表的数据"""
+    REGISTRY.reset()
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "REGISTRY",
+    "CHARTS_BUILT",
+    "CHART_BUILD_SECONDS",
+    "CHART_STAGE_SECONDS",
+    "HOROSCOPES",
+    "HOROSCOPE_SECONDS",
+    "CALENDAR_CONVERSIONS",
+    "CALENDAR_CONVERSION_SECONDS",
+    "RENDERS",
+    "RENDER_SECONDS",
+    "CACHE_HITS",
+    "CACHE_MISSES",
+    "CACHE_EVICTIONS",
+    "enable",
+    "disable",
+    "is_enabled",
+    "snapshot",
+    "to_prometheus",
+    "reset",
+]
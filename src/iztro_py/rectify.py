@@ -0,0 +1,280 @@
+"""
+Birth-time rectification (定盘) for iztro-py
+
+When the birth hour is unknown, each of the 13 candidate hours (time_index
+0-12) is scored by how strongly its chart activates the palace of each known
+life event in the year it happened, and the hours are ranked by total score:
+
+    >>> from iztro_py.rectify import rectify
+    >>> events = [("2015-10-1", "marriage"), ("2019-3-2", "career")]
+    >>> best = rectify("1990-5-17", "女", events)[0]
+    >>> best.time_index, best.score
+
+An event is a (solar date, category) pair. The category is a key of
+EVENT_CATEGORIES (marriage, career, wealth, ...) or a palace name
+('spousePalace', '夫妻宫'). Activations checked for each event, with weights
+from ACTIVATION_WEIGHTS:
+
+    decadal          the decadal (大限) palace is the event palace
+    age              the age (小限) palace is the event palace
+    yearly           the yearly (流年) palace is the event palace
+    decadal_mutagen  a decadal-stem mutagen star (四化) sits in the event palace
+    yearly_mutagen   a yearly-stem mutagen star sits in the event palace
+
+These are the palaces and stars FunctionalAstrolabe.horoscope() reports for
+the event date, computed as one batch instead of 13 x N horoscope() calls.
+The 13 charts come from a single astro.by_solar_all_hours(fields=...) call.
+Event-date work (pillars, nominal age, yearly mutagen) runs once per event.
+Each chart only contributes lookup tables: star -> palace and branch -> palace.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from iztro_py import astro
+from iztro_py.columnar import FIVE_ELEMENTS_CLASSES
+from iztro_py.data.constants import EARTHLY_BRANCH_INDEX
+from iztro_py.data.earthly_branches import EARTHLY_BRANCHES_CONFIG
+from iztro_py.data.heavenly_stems import get_mutagen
+from iztro_py.data.types import FiveElementsClass, GenderName, HeavenlyStemName
+from iztro_py.utils.calendar import get_heavenly_stem_and_earthly_branch_date, parse_solar_date
+from iztro_py.utils.helpers import (
+    calculate_nominal_age,
+    get_decadal_palace_index,
+    get_palace_index_by_name,
+)
+
+# 事件类别 -> 本命宫位
+EVENT_CATEGORIES: Dict[str, str] = {
+    "life": "soulPalace",
+    "parents": "parentsPalace",
+    "spirit": "spiritPalace",
+    "property": "propertyPalace",
+    "career": "careerPalace",
+    "friends": "friendsPalace",
+    "travel": "surfacePalace",
+    "relocation": "surfacePalace",
+    "health": "healthPalace",
+    "accident": "healthPalace",
+    "wealth": "wealthPalace",
+    "children": "childrenPalace",
+    "marriage": "spousePalace",
+    "divorce": "spousePalace",
+    "siblings": "siblingsPalace",
+}
+
+# 各类引动的默认权重（四化按星计数，每颗星计一次）
+ACTIVATION_WEIGHTS: Dict[str, float] = {
+    "decadal": 3.0,
+    "age": 1.0,
+    "yearly": 2.0,
+    "decadal_mutagen": 1.0,
+    "yearly_mutagen": 1.0,
+}
+
+# 一次排盘需要的字段
+_FIELDS = (
+    "five_elements_class",
+    "raw_chinese_date",
+    "palaces.heavenly_stem",
+    "palaces.earthly_branch",
+    "palaces.major_stars",
+    "palaces.minor_stars",
+)
+
+# (阳历日期, 类别)
+Event = Tuple[str, str]
+
+
+class Candidate:
+    """
+    一个候选时辰的评分
+
+    Attributes:
+        time_index: 时辰索引 (0-12)
+        score: 总分（所有事件引动权重之和）
+        hits: 与事件一一对应，每个事件被引动的项目（如 ['yearly', 'decadal_mutagen']）
+    """
+
+    __slots__ = ("time_index", "score", "hits")
+
+    def __init__(self, time_index: int, score: float, hits: List[List[str]]):
+        self.time_index = time_index
+        self.score = score
+        self.hits = hits
+
+    def __repr__(self) -> str:
+        return f"Candidate(time_index={self.time_index}, score={self.score})"
+
+
+class _ChartTables:
+    """一张候选星盘上计算运限所需的查找表"""
+
+    __slots__ = ("five_class", "gender", "yin_yang", "stems", "branch_palace", "star_palace")
+
+    def __init__(self, row: Dict, gender: str):
+        palaces = row["palaces"]
+        self.five_class = FiveElementsClass(
+            FIVE_ELEMENTS_CLASSES.index(row["five_elements_class"]) + 2
+        )
+        self.gender = gender
+        self.yin_yang = EARTHLY_BRANCHES_CONFIG[row["raw_chinese_date"].year_branch].yin_yang
+        self.stems = [palace["heavenly_stem"] for palace in palaces]
+        # 地支索引 -> 宫位序号；星曜 -> 宫位序号（宫位按命宫起排，命宫序号为 0）
+        self.branch_palace = [0] * 12
+        self.star_palace: Dict[str, int] = {}
+        for i, palace in enumerate(palaces):
+            self.branch_palace[EARTHLY_BRANCH_INDEX[palace["earthly_branch"]]] = i
+            for star in palace["major_stars"]:
+                self.star_palace[star.name] = i
+            for star in palace["minor_stars"]:
+                self.star_palace[star.name] = i
+
+    def activations(
+        self,
+        palace: int,
+        nominal_age: int,
+        yearly_branch: int,
+        yearly_mutagen: Sequence[str],
+    ) -> List[str]:
+        """事件宫位在某一流年被引动的项目（与 horoscope() 的大限、小限、流年一致）"""
+        hits = []
+        decadal = get_decadal_palace_index(
+            nominal_age, self.five_class, 0, self.gender, self.yin_yang
+        )
+        if decadal == palace:
+            hits.append("decadal")
+        if self.gender == "男":
+            age = (nominal_age - 1) % 12
+        else:
+            age = (1 - nominal_age) % 12
+        if age == palace:
+            hits.append("age")
+        if self.branch_palace[yearly_branch] == palace:
+            hits.append("yearly")
+        star_palace = self.star_palace
+        for star in get_mutagen(self.stems[decadal]):
+            if star_palace.get(star) == palace:
+                hits.append("decadal_mutagen")
+        for star in yearly_mutagen:
+            if star_palace.get(star) == palace:
+                hits.append("yearly_mutagen")
+        return hits
+
+
+def event_palace(category: str) -> int:
+    """
+    事件类别对应的本命宫位序号
+
+    Args:
+        category: EVENT_CATEGORIES 的键，或宫位名称（'spousePalace'、'夫妻宫' 等）
+
+    Returns:
+        宫位序号 (0-11，命宫为 0)
+
+    Raises:
+        ValueError: 无法识别的类别
+    """
+    index = get_palace_index_by_name(EVENT_CATEGORIES.get(category, category))
+    if index is None:
+        raise ValueError(f"Unknown event category: {category!r}")
+    return index
+
+
+def _yearly(solar_date: str) -> Tuple[int, int, HeavenlyStemName]:
+    """事件日期的 (年份, 流年地支索引, 流年天干)，各候选星盘共用"""
+    year, month, day = parse_solar_date(solar_date)
+    pillars = get_heavenly_stem_and_earthly_branch_date(year, month, day, 0)
+    return year, EARTHLY_BRANCH_INDEX[pillars.year_branch], pillars.year_stem
+
+
+def score_hours(
+    solar_date: str,
+    gender: GenderName,
+    events: Iterable[Event],
+    fix_leap: bool = True,
+    weights: Optional[Dict[str, float]] = None,
+) -> List[Candidate]:
+    """
+    为 13 个候选时辰逐一评分（按时辰索引排列，不排序）
+
+    Args:
+        solar_date: 出生阳历日期
+        gender: 性别 ('男' 或 '女')
+        events: (阳历日期, 类别) 序列
+        fix_leap: 是否修正闰月（默认True）
+        weights: 覆盖 ACTIVATION_WEIGHTS 中的部分权重
+
+    Returns:
+        13 个 Candidate，下标即时辰索引
+
+    Raises:
+        ValueError: 事件类别无法识别，或日期无效
+    """
+    weight = dict(ACTIVATION_WEIGHTS)
+    if weights:
+        weight.update(weights)
+
+    # 与候选时辰无关的部分：每个事件只算一次
+    birth_year = parse_solar_date(solar_date)[0]
+    prepared = []
+    for event_date, category in events:
+        year, yearly_branch, yearly_stem = _yearly(event_date)
+        prepared.append(
+            (
+                event_palace(category),
+                calculate_nominal_age(birth_year, year),
+                yearly_branch,
+                get_mutagen(yearly_stem),
+            )
+        )
+
+    rows = astro.by_solar_all_hours(solar_date, gender, fix_leap, fields=_FIELDS)
+    candidates = []
+    for time_index, row in enumerate(rows):
+        tables = _ChartTables(row, gender)
+        hits = [tables.activations(*event) for event in prepared]
+        score = sum(weight[hit] for event_hits in hits for hit in event_hits)
+        candidates.append(Candidate(time_index, score, hits))
+    return candidates
+
+
+def rectify(
+    solar_date: str,
+    gender: GenderName,
+    events: Iterable[Event],
+    fix_leap: bool = True,
+    weights: Optional[Dict[str, float]] = None,
+) -> List[Candidate]:
+    """
+    定盘：按已知事件为候选时辰排序
+
+    Args:
+        solar_date: 出生阳历日期
+        gender: 性别 ('男' 或 '女')
+        events: (阳历日期, 类别) 序列，类别见 EVENT_CATEGORIES
+        fix_leap: 是否修正闰月（默认True）
+        weights: 覆盖 ACTIVATION_WEIGHTS 中的部分权重
+
+    Returns:
+        13 个 Candidate，按得分从高到低排列（同分按时辰索引）
+
+    Raises:
+        ValueError: 事件类别无法识别，或日期无效
+
+    Example:
+        >>> ranked = rectify('1990-5-17', '女', [('2015-10-1', 'marriage')])
+        >>> [c.time_index for c in ranked[:3]]
+    """
+    candidates = score_hours(solar_date, gender, events, fix_leap, weights)
+    return sorted(candidates, key=lambda candidate: -candidate.score)
+
+
+__all__ = [
+    "EVENT_CATEGORIES",
+    "ACTIVATION_WEIGHTS",
+    "Event",
+    "Candidate",
+    "event_palace",
+    "score_hours",
+    "rectify",
+]
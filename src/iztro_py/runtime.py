@@ -0,0 +1,241 @@
+"""
+Runtime warmup for iztro-py
+
+The library loads modules, locales and lookup tables on first use, which
+makes the first requests after a deploy much slower than steady state.
+warmup() does all of that work up front, e.g. in a pre-fork server hook:
+
+    >>> import iztro_py
+    >>> iztro_py.warmup(languages=["zh-CN", "en-US"])
+    {'imports': 0.21, 'locales': 0.01, 'reverse_tables': 0.0, 'star_pool': 0.3, 'charts': 0.01}
+
+Modules that own a precomputed table or cache register a filler with
+register_precompute(), so warmup() stays in sync with the library.
+
+Pre-fork servers should call freeze_for_fork() right after warmup(), so the
+cyclic garbage collector in each worker leaves the shared objects (and their
+copy-on-write memory pages) alone:
+
+    >>> # gunicorn.conf.py, with preload_app = True
+    >>> def when_ready(server):
+    ...     import iztro_py
+    ...     iztro_py.warmup()
+    ...     iztro_py.freeze_for_fork()
+"""
+
+import gc
+import importlib
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+# 热路径上用到的全部模块（包括各处函数内导入的模块）
+WARMUP_MODULES: Sequence[str] = (
+    "iztro_py.data",
+    "iztro_py.data.types",
+    "iztro_py.data.constants",
+    "iztro_py.data.brightness",
+    "iztro_py.data.heavenly_stems",
+    "iztro_py.data.earthly_branches",
+    "iztro_py.i18n",
+    "iztro_py.utils",
+    "iztro_py.utils.calendar",
+    "iztro_py.utils.helpers",
+    "iztro_py.star.pool",
+    "iztro_py.star.location",
+    "iztro_py.star.major_star",
+    "iztro_py.star.minor_star",
+    "iztro_py.star.mutagen",
+    "iztro_py.astro",
+    "iztro_py.astro.palace",
+    "iztro_py.astro.horoscope",
+    "iztro_py.astro.frozen",
+    "iztro_py.astro.functional_astrolabe",
+    "iztro_py.astro.functional_palace",
+    "iztro_py.astro.functional_star",
+    "iztro_py.astro.functional_surpalaces",
+    "iztro_py.instrumentation",
+)
+
+# 预计算项：名称 -> 填充函数（参数为需要预热的语言列表）
+PrecomputeFunc = Callable[[List[str]], None]
+
+_PRECOMPUTE: Dict[str, PrecomputeFunc] = {}
+# precompute=True 时执行的预计算项
+_DEFAULT_PRECOMPUTE: List[str] = []
+
+
+def register_precompute(
+    name: str, default: bool = True
+) -> Callable[[PrecomputeFunc], PrecomputeFunc]:
+    """
+    注册预计算项的装饰器
+
+    Args:
+        name: 预计算项名称
+        default: 是否包含在 warmup(precompute=True) 中
+
+    Example:
+        >>> @register_precompute("my_table")
+        ... def _fill(languages):
+        ...     build_my_table()
+    """
+
+    def register(func: PrecomputeFunc) -> PrecomputeFunc:
+        _PRECOMPUTE[name] = func
+        if default and name not in _DEFAULT_PRECOMPUTE:
+            _DEFAULT_PRECOMPUTE.append(name)
+        return func
+
+    return register
+
+
+def precompute_names(default_only: bool = False) -> List[str]:
+    """
+    列出已注册的预计算项
+
+    Args:
+        default_only: 只列出默认执行的项
+
+    Returns:
+        名称列表（按注册顺序）
+    """
+    return list(_DEFAULT_PRECOMPUTE) if default_only else list(_PRECOMPUTE)
+
+
+def warmup(
+    languages: Optional[Iterable[str]] = None,
+    precompute: Union[bool, Iterable[str]] = True,
+) -> Dict[str, float]:
+    """
+    预热：导入所有模块、加载语言资源并填充预计算表与缓存
+
+    可重复调用；已完成的工作会被跳过或很快完成。不改变当前语言设置。
+
+    Args:
+        languages: 需要预热的语言，默认所有支持的语言
+        precompute: True 执行默认预计算项，False 不执行，
+            也可以传入预计算项名称列表（见 precompute_names()）
+
+    Returns:
+        各步骤耗时（秒）
+
+    Raises:
+        ValueError: 如果语言或预计算项名称无效
+
+    Example:
+        >>> import iztro_py
+        >>> iztro_py.warmup(languages=['zh-CN'], precompute=['reverse_tables'])
+    """
+    timings: Dict[str, float] = {}
+
+    started = time.perf_counter()
+    for module in WARMUP_MODULES:
+        importlib.import_module(module)
+    timings["imports"] = time.perf_counter() - started
+
+    from iztro_py.i18n import SUPPORTED_LANGUAGES, preload_locales
+
+    selected_languages = list(SUPPORTED_LANGUAGES if languages is None else languages)
+    started = time.perf_counter()
+    preload_locales(selected_languages)
+    timings["locales"] = time.perf_counter() - started
+
+    if precompute is True:
+        names = list(_DEFAULT_PRECOMPUTE)
+    elif precompute is False:
+        names = []
+    else:
+        names = list(precompute)
+    unknown = [name for name in names if name not in _PRECOMPUTE]
+    if unknown:
+        raise ValueError(f"Unknown precompute item(s): {', '.join(unknown)}")
+
+    for name in names:
+        started = time.perf_counter()
+        _PRECOMPUTE[name](selected_languages)
+        timings[name] = time.perf_counter() - started
+
+    return timings
+
+
+def freeze_for_fork() -> int:
+    """
+    把当前所有存活对象移入 GC 的永久代（gc.freeze），供 fork 前调用
+
+    子进程的垃圾回收不再遍历这些对象，避免为修改 GC 头部而复制父进程的
+    内存页。应在 warmup() 之后、fork 之前调用；fork 后的子进程无需处理。
+
+    Returns:
+        永久代中的对象数量
+
+    Example:
+        >>> import iztro_py
+        >>> iztro_py.warmup()
+        >>> iztro_py.freeze_for_fork()
+        52731
+    """
+    # 先回收垃圾，避免把它们永久保留下来
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+# ============================================================================
+# Built-in precompute items
+# ============================================================================
+
+
+@register_precompute("reverse_tables")
+def _fill_reverse_tables(languages: List[str]) -> None:
+    """反向翻译表（from_iztro_dict 使用）"""
+    from iztro_py.i18n import get_reverse_table
+
+    for lang in languages:
+        get_reverse_table(lang)
+
+
+@register_precompute("star_pool")
+def _fill_star_pool(languages: List[str]) -> None:
+    """
+    星曜池：遍历十个年干、各月份与时辰，覆盖实际出现的全部星曜状态（约 300 个）
+    """
+    from iztro_py.astro import by_solar
+
+    day = date(2000, 1, 1)
+    for i in range(522):
+        by_solar(f"{day.year}-{day.month}-{day.day}", i % 13, "男")
+        day += timedelta(days=7)
+
+
+@register_precompute("charts")
+def _fill_charts(languages: List[str]) -> None:
+    """每种语言构建、渲染一张星盘并计算运限，触发各处的首次调用路径"""
+    from iztro_py.astro import by_solar
+
+    for lang in languages:
+        chart = by_solar("2000-8-16", 6, "女", language=lang)
+        chart.to_iztro_dict()
+        chart.horoscope("2024-1-1", 6)
+        chart.star("ziweiMaj").surrounded_palaces()
+
+
+@register_precompute("calendar", default=False)
+def _fill_calendar(languages: List[str]) -> None:
+    """阳历转农历缓存：1940-2040 年的每一天（约 0.7 秒，默认不执行）"""
+    from iztro_py.utils.calendar import solar_to_lunar
+
+    day = date(1940, 1, 1)
+    end = date(2041, 1, 1)
+    while day < end:
+        solar_to_lunar(day.year, day.month, day.day)
+        day += timedelta(days=1)
+
+
+__all__ = [
+    "WARMUP_MODULES",
+    "register_precompute",
+    "precompute_names",
+    "warmup",
+    "freeze_for_fork",
+]
@@ -0,0 +1,336 @@
+"""
+Chart search for iztro-py
+
+Finds every birth date and hour in a date range whose chart matches a
+predicate, without building the charts:
+
+    >>> from iztro_py.search import search, star_in
+    >>> for solar_date, time_index in search(star_in("紫微", "命宫", mutagen="权"),
+    ...                                      "1950-1-1", "2030-12-31"):
+    ...     print(solar_date, time_index)
+
+Star placement depends on only a few inputs: the year pillar, the lunar
+month, the lunar day and the hour. They take 60 x 12 x 30 x 13 = 280,800
+combinations, called chart classes here. For the late zi hour (time_index
+12) the lunar day is the next day's. Gender does not affect star
+placement. search() runs in two steps:
+
+1. Evaluate the predicate once per chart class (ChartClass). Each class is
+   assembled from the component tables in iztro_py.astro.palace and
+   iztro_py.star.
+2. Walk the lunar calendar of the range one day at a time. The converter
+   is only called near month ends. Each (date, hour) whose class matched
+   is yielded as soon as it is reached.
+
+Results follow the same rules as astro.by_solar(). Any chart it returns
+for a yielded (date, time_index), with either gender, satisfies the
+predicate.
+"""
+
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from iztro_py.astro.palace import SOUL_BODY_TABLE, SOUL_STEM_TABLE
+from iztro_py.data.brightness import get_star_brightness
+from iztro_py.data.constants import EARTHLY_BRANCHES, HEAVENLY_STEMS, STAR_CODES
+from iztro_py.data.heavenly_stems import get_mutagen_type
+from iztro_py.data.types import Brightness, FiveElementsClass, Mutagen
+from iztro_py.i18n import get_reverse_table
+from iztro_py.star.location import get_start_indices_by_day
+from iztro_py.star.major_star import TIANFU_LAYOUT, ZIWEI_LAYOUT, StarLayout
+from iztro_py.star.minor_star import (
+    BY_BRANCH_TIME,
+    BY_MONTH,
+    BY_STEM,
+    BY_TIME,
+    KONGJIE_BY_TIME,
+    LUCUN_BY_STEM,
+    TIANMA_BY_BRANCH,
+)
+from iztro_py.utils.calendar import parse_solar_date, solar_to_lunar
+from iztro_py.utils.helpers import get_five_elements_class, get_palace_index_by_name
+
+
+class ChartClass:
+    """
+    一类星盘：年柱、农历月、起紫微的农历日与时辰相同的星盘，安星结果完全相同
+
+    Attributes:
+        year_pillar: 年柱的六十甲子序号（甲子 = 0）；与 by_solar 相同按阳历年 y 计算，
+            即 (y - 4) % 60
+        year_stem: 年干
+        year_branch: 年支
+        lunar_month: 农历月 (1-12)
+        lunar_day: 起紫微所用的农历日 (1-30)，晚子时为次日的农历日
+        time_index: 时辰索引 (0-12)
+        soul_branch: 命宫地支
+        body_branch: 身宫地支
+        five_elements_class: 五行局
+    """
+
+    __slots__ = (
+        "year_pillar",
+        "year_stem",
+        "year_branch",
+        "lunar_month",
+        "lunar_day",
+        "time_index",
+        "soul_branch",
+        "body_branch",
+        "five_elements_class",
+        "_soul_index",
+        "_major",
+        "_minor",
+    )
+
+    def __init__(
+        self,
+        year_pillar: int,
+        lunar_month: int,
+        lunar_day: int,
+        time_index: int,
+        soul_index: int,
+        body_index: int,
+        five_elements_class: FiveElementsClass,
+        major: Dict[str, int],
+        minor: Dict[str, int],
+    ):
+        self.year_pillar = year_pillar
+        self.year_stem = HEAVENLY_STEMS[year_pillar % 10]
+        self.year_branch = EARTHLY_BRANCHES[year_pillar % 12]
+        self.lunar_month = lunar_month
+        self.lunar_day = lunar_day
+        self.time_index = time_index
+        self.soul_branch = EARTHLY_BRANCHES[soul_index]
+        self.body_branch = EARTHLY_BRANCHES[body_index]
+        self.five_elements_class = five_elements_class
+        self._soul_index = soul_index
+        self._major = major
+        self._minor = minor
+
+    def branch_of(self, star_name: str) -> Optional[int]:
+        """
+        星曜所在地支索引（子 = 0）
+
+        Args:
+            star_name: 主星或辅星的键名（如 'ziweiMaj'）
+
+        Returns:
+            地支索引；不是主星或辅星时返回None
+        """
+        branch = self._major.get(star_name)
+        if branch is None:
+            branch = self._minor.get(star_name)
+        return branch
+
+    def palace_of(self, star_name: str) -> Optional[int]:
+        """
+        星曜所在宫位序号（命宫 = 0，顺序同 PALACES）
+
+        Args:
+            star_name: 主星或辅星的键名
+
+        Returns:
+            宫位序号；不是主星或辅星时返回None
+        """
+        branch = self.branch_of(star_name)
+        return None if branch is None else (branch - self._soul_index) % 12
+
+    def mutagen_of(self, star_name: str) -> Optional[Mutagen]:
+        """星曜的生年四化（没有时返回None）"""
+        return get_mutagen_type(self.year_stem, star_name)
+
+    def brightness_of(self, star_name: str) -> Optional[Brightness]:
+        """星曜在所在宫位的亮度（没有时返回None）"""
+        branch = self.branch_of(star_name)
+        return None if branch is None else get_star_brightness(star_name, EARTHLY_BRANCHES[branch])
+
+    def __repr__(self) -> str:
+        return (
+            f"ChartClass(year_pillar={self.year_pillar}, month={self.lunar_month}, "
+            f"day={self.lunar_day}, time_index={self.time_index})"
+        )
+
+
+def _layout_branches(*layouts: StarLayout) -> Dict[str, int]:
+    """把 (地支索引, 星曜) 排布合并为 星名 -> 地支索引"""
+    return {star.name: branch for layout in layouts for branch, star in layout}
+
+
+def chart_classes(year_pillars: Optional[Iterable[int]] = None) -> Iterator[ChartClass]:
+    """
+    枚举星盘类
+
+    Args:
+        year_pillars: 可选，只枚举这些年柱（六十甲子序号，甲子 = 0；
+            阳历年 y 为 (y - 4) % 60）
+
+    Yields:
+        ChartClass，按年柱、农历月、时辰、农历日的顺序
+    """
+    pillars = range(60) if year_pillars is None else sorted(set(year_pillars))
+    majors: Dict[Tuple[int, int], Dict[str, int]] = {}
+    for pillar in pillars:
+        stem_index, branch_index = pillar % 10, pillar % 12
+        for month in range(1, 13):
+            for time_index in range(13):
+                soul_index, body_index = SOUL_BODY_TABLE[(month - 1) * 13 + time_index]
+                five_class = get_five_elements_class(
+                    SOUL_STEM_TABLE[stem_index * 12 + soul_index], EARTHLY_BRANCHES[soul_index]
+                )
+                minor = _layout_branches(
+                    BY_MONTH[month - 1],
+                    BY_TIME[time_index],
+                    BY_STEM[stem_index],
+                    BY_BRANCH_TIME[branch_index * 13 + time_index],
+                    KONGJIE_BY_TIME[time_index],
+                    LUCUN_BY_STEM[stem_index],
+                    TIANMA_BY_BRANCH[branch_index],
+                )
+                for lunar_day in range(1, 31):
+                    major = majors.get((five_class.value, lunar_day))
+                    if major is None:
+                        ziwei, tianfu = get_start_indices_by_day(five_class.value, lunar_day)
+                        major = _layout_branches(ZIWEI_LAYOUT[ziwei], TIANFU_LAYOUT[tianfu])
+                        majors[(five_class.value, lunar_day)] = major
+                    yield ChartClass(
+                        pillar,
+                        month,
+                        lunar_day,
+                        time_index,
+                        soul_index,
+                        body_index,
+                        five_class,
+                        major,
+                        minor,
+                    )
+
+
+def _lunar_days(start: date, end: date) -> Iterator[Tuple[date, int, int]]:
+    """
+    逐日给出 (阳历日期, 农历月, 农历日)，包括 end
+
+    农历月只有 29 或 30 天，日数小于 29 时次日必然是同月的下一天，
+    因此只在月末附近调用历法转换。
+    """
+    day = start
+    lunar = solar_to_lunar(day.year, day.month, day.day)
+    month, lunar_day = lunar.month, lunar.day
+    one_day = timedelta(days=1)
+    while day <= end:
+        yield day, month, lunar_day
+        day += one_day
+        if lunar_day < 29:
+            lunar_day += 1
+        else:
+            lunar = solar_to_lunar(day.year, day.month, day.day)
+            month, lunar_day = lunar.month, lunar.day
+
+
+def star_in(
+    star: str,
+    palace: Union[int, str],
+    mutagen: Optional[Mutagen] = None,
+    brightness: Optional[Union[Brightness, Iterable[Brightness]]] = None,
+) -> Callable[[ChartClass], bool]:
+    """
+    构造谓词：某星曜落在某宫位（可选：带某种生年四化、亮度）
+
+    Args:
+        star: 星曜键名或中文名（'ziweiMaj' / '紫微'）
+        palace: 宫位序号（命宫 = 0）、键名或中文名（'soulPalace' / '命宫'）
+        mutagen: 可选，要求的生年四化（'禄'/'权'/'科'/'忌'）
+        brightness: 可选，要求的亮度，或亮度集合（如 ('庙', '旺')）
+
+    Returns:
+        接受 ChartClass 的谓词
+
+    Raises:
+        ValueError: 星曜或宫位名称无法识别
+    """
+    star_name = get_reverse_table("zh-CN")["stars"].get(star, star)
+    if star_name not in STAR_CODES:
+        raise ValueError(f"Unknown major or minor star: {star!r}")
+    palace_index = palace if isinstance(palace, int) else get_palace_index_by_name(palace)
+    if palace_index is None or not 0 <= palace_index < 12:
+        raise ValueError(f"Unknown palace: {palace!r}")
+    levels: Optional[Set[str]] = None
+    if brightness is not None:
+        levels = {brightness} if isinstance(brightness, str) else set(brightness)
+
+    def predicate(chart_class: ChartClass) -> bool:
+        if chart_class.palace_of(star_name) != palace_index:
+            return False
+        if mutagen is not None and chart_class.mutagen_of(star_name) != mutagen:
+            return False
+        if levels is not None and chart_class.brightness_of(star_name) not in levels:
+            return False
+        return True
+
+    return predicate
+
+
+def search(
+    predicate: Callable[[ChartClass], bool],
+    start: str,
+    end: str,
+) -> Iterator[Tuple[str, int]]:
+    """
+    查找日期范围内星盘满足谓词的全部出生日期与时辰
+
+    Args:
+        predicate: 接受 ChartClass、返回是否匹配的函数（可用 star_in() 构造并组合）
+        start: 起始阳历日期（含）
+        end: 结束阳历日期（含）
+
+    Yields:
+        (阳历日期 'YYYY-M-D', 时辰索引)，按日期、时辰升序
+
+    Raises:
+        ValueError: 日期无效或 end 早于 start
+
+    Example:
+        >>> zi_wei = star_in('紫微', '命宫', mutagen='权')
+        >>> both = lambda c: zi_wei(c) and c.five_elements_class.value == 2
+        >>> next(search(both, '1950-1-1', '2030-12-31'))
+    """
+    start_date = date(*parse_solar_date(start))
+    end_date = date(*parse_solar_date(end))
+    if end_date < start_date:
+        raise ValueError(f"End date {end} is before start date {start}")
+
+    # 1. 按星盘类求值；键为 (年柱, 农历月, 农历日)
+    pillars = {(year - 4) % 60 for year in range(start_date.year, end_date.year + 1)}
+    day_hours: Dict[Tuple[int, int, int], List[int]] = {}
+    late_zi: Set[Tuple[int, int, int]] = set()
+    for chart_class in chart_classes(pillars):
+        if predicate(chart_class):
+            key = (chart_class.year_pillar, chart_class.lunar_month, chart_class.lunar_day)
+            if chart_class.time_index == 12:
+                late_zi.add(key)
+            else:
+                day_hours.setdefault(key, []).append(chart_class.time_index)
+
+    if not day_hours and not late_zi:
+        return
+
+    # 2. 逐日展开；晚子时按次日的农历日（同一农历月）匹配
+    days = _lunar_days(start_date, end_date + timedelta(days=1))
+    previous = next(days)
+    for current in days:
+        day, month, lunar_day = previous
+        pillar = (day.year - 4) % 60
+        solar_date = f"{day.year}-{day.month}-{day.day}"
+        for time_index in day_hours.get((pillar, month, lunar_day), ()):
+            yield solar_date, time_index
+        if (pillar, month, current[2]) in late_zi:
+            yield solar_date, 12
+        previous = current
+
+
+__all__ = [
+    "ChartClass",
+    "chart_classes",
+    "star_in",
+    "search",
+]
@@ -0,0 +1,544 @@
+"""
+Reference HTTP service for iztro-py
+
+A small asyncio HTTP/1.1 server (standard library only) for teams that
+expose charts over HTTP:
+
+    $ python -m iztro_py.serve --port 8080 --workers 4
+
+Endpoints (all responses are JSON):
+
+    GET  /chart?date=2000-8-16&time_index=6&gender=男
+         to_iztro_dict() of the chart; query fields as in iztro_py.batch
+         (date, time_index or hour, gender, calendar, is_leap_month,
+         fix_leap, language)
+    GET  /horoscope?...&target_date=2024-1-1&target_time_index=6
+         the horoscope of that chart at the target date
+    POST /batch
+         body: a list of records (or {"records": [...]});
+         response: {"results": [{"chart": ...} | {"error": ...}, ...]}
+    GET  /healthz, GET /metrics (with --metrics, Prometheus text format)
+
+Design:
+
+- One event loop serves any number of keep-alive connections; charts are
+  computed in a process pool (or a thread pool with --threads) through an
+  iztro_py.aio.AioRunner, so identical concurrent requests are computed once.
+- Rendered responses are kept in an in-process LRU. ETags are derived from
+  the chart fingerprint and the library version, and If-None-Match requests
+  are answered with 304 without rendering anything.
+- At most max_queue computations may wait for a worker; beyond that the
+  server answers 503 with Retry-After instead of queueing without bound.
+- With --metrics, each worker process collects the instrumentation events
+  of its own computations and returns them with the result; the server
+  replays them into iztro_py.metrics, so /metrics covers the whole pool.
+  Events of a computation that raised are lost, and responses served from
+  the response cache only count as cache hits.
+- An unexpected error while handling a request is answered with 500 and
+  the connection is closed; the traceback is printed to stderr.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from iztro_py import __version__, instrumentation, metrics
+from iztro_py.aio import AioRunner
+from iztro_py.batch import compute, parse_record
+from iztro_py.cache import LRUCache, chart_fingerprint, date_key, request_key
+from iztro_py.runtime import warmup
+
+# instrumentation 中的响应缓存名称
+RESPONSE_CACHE = "serve_response"
+
+_JSON_SEPARATORS = (",", ":")
+
+# 工作进程中采集的埋点事件（见 _init_worker()）；主进程与线程池中为 None
+_worker_events: Optional[List[Tuple[Any, ...]]] = None
+
+
+class HTTPError(Exception):
+    """以指定状态码结束请求的错误"""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=_JSON_SEPARATORS).encode("utf-8")
+
+
+def _etag(*parts: Any) -> str:
+    text = "/".join(map(str, (__version__,) + parts))
+    return '"%s"' % hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def render_chart(request: Tuple[Any, ...]) -> Tuple[str, bytes]:
+    """
+    计算并渲染星盘（在工作进程中运行）
+
+    Args:
+        request: 规范化的星盘请求（见 iztro_py.batch.parse_record()）
+
+    Returns:
+        (ETag, to_iztro_dict() 的 JSON)
+    """
+    chart = compute(request)
+    return _etag(chart_fingerprint(chart)), _dumps(chart.to_iztro_dict())
+
+
+def render_horoscope(
+    request: Tuple[Any, ...], target_date: str, target_time_index: int
+) -> Tuple[str, bytes]:
+    """
+    计算并渲染运限（在工作进程中运行）
+
+    Args:
+        request: 规范化的星盘请求
+        target_date: 运限日期（阳历）
+        target_time_index: 运限时辰索引
+
+    Returns:
+        (ETag, 运限的 JSON)
+    """
+    chart = compute(request)
+    horoscope = chart.horoscope(target_date, target_time_index)
+    etag = _etag(chart_fingerprint(chart), date_key(target_date), target_time_index)
+    return etag, _dumps(horoscope.model_dump(mode="json"))
+
+
+def _init_worker(collect_metrics: bool) -> None:
+    """工作进程初始化：预热，并按需采集埋点事件"""
+    global _worker_events
+    warmup(None, False)
+    if collect_metrics:
+        events: List[Tuple[Any, ...]] = []
+        instrumentation.add_listener(lambda *run: events.append(("stages",) + run))
+        instrumentation.add_cache_listener(lambda *event: events.append(("cache",) + event))
+        _worker_events = events
+
+
+def _run_in_worker(func: Callable[..., Any], *args: Any) -> Tuple[Any, List[Tuple[Any, ...]]]:
+    """执行 func(*args)，连同本次执行采集的埋点事件一起返回"""
+    if _worker_events is None:
+        return func(*args), []
+    del _worker_events[:]
+    value = func(*args)
+    events = list(_worker_events)
+    del _worker_events[:]
+    return value, events
+
+
+def _replay(events: List[Tuple[Any, ...]]) -> None:
+    """在主进程中重放工作进程的埋点事件"""
+    if not instrumentation.is_enabled():
+        return
+    for kind, *event in events:
+        if kind == "stages":
+            instrumentation.report(*event)
+        elif event[1] == instrumentation.CACHE_EVICTION:
+            instrumentation.record_cache_eviction(event[0])
+        else:
+            instrumentation.record_cache(event[0], event[1] == instrumentation.CACHE_HIT)
+
+
+class ChartService:
+    """
+    HTTP 端点背后的计算与缓存（与 HTTP 协议无关，便于嵌入其他框架）
+
+    Args:
+        runner: 执行计算的 AioRunner，默认使用线程池
+        max_queue: 等待工作进程的计算数上限，超出时返回 503
+        cache_entries: 响应缓存的条目数上限
+        cache_bytes: 响应缓存的字节数上限
+        max_batch: /batch 每个请求的记录数上限
+        language: 请求未指定语言时使用的语言
+    """
+
+    def __init__(
+        self,
+        runner: Optional[AioRunner] = None,
+        max_queue: int = 1024,
+        cache_entries: int = 16384,
+        cache_bytes: int = 256 << 20,
+        max_batch: int = 1000,
+        language: str = "zh-CN",
+    ):
+        if max_queue < 1 or max_batch < 1:
+            raise ValueError("max_queue and max_batch must be positive")
+        self.runner = runner if runner is not None else AioRunner()
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.language = language
+        self.cache = LRUCache(cache_entries, cache_bytes, name=RESPONSE_CACHE)
+        self.waiting = 0
+
+    def cached(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """只查缓存，不计算"""
+        return self.cache.get(key)
+
+    async def _get(self, key: str, func: Callable[..., Any], *args: Any) -> Tuple[str, bytes]:
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        if self.waiting >= self.max_queue:
+            raise HTTPError(503, "Server busy", {"Retry-After": "1"})
+        self.waiting += 1
+        try:
+            value, events = await self.runner.run(key, _run_in_worker, func, *args)
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+        finally:
+            self.waiting -= 1
+        _replay(events)
+        self.cache.put(key, value, len(value[1]))
+        return value
+
+    def _request(self, params: Dict[str, Any]) -> Tuple[Any, ...]:
+        try:
+            return parse_record(params, self.language)
+        except (TypeError, ValueError) as e:
+            raise HTTPError(400, str(e)) from None
+
+    def chart_key(self, params: Dict[str, Any]) -> str:
+        """/chart 请求的缓存键"""
+        return request_key("serve_chart", *self._request(params))
+
+    def horoscope_key(self, params: Dict[str, Any]) -> Tuple[str, Tuple[Any, ...]]:
+        """/horoscope 请求的缓存键与 render_horoscope() 的参数"""
+        request = self._request(params)
+        target_date = str(params.get("target_date") or "")
+        try:
+            target_time_index = int(params.get("target_time_index") or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid target_time_index") from None
+        if not target_date or not 0 <= target_time_index <= 12:
+            raise HTTPError(400, "Missing target_date or invalid target_time_index")
+        args = (request, target_date, target_time_index)
+        return (
+            request_key("serve_horoscope", *request, date_key(target_date), target_time_index),
+            args,
+        )
+
+    async def chart(self, params: Dict[str, Any]) -> Tuple[str, bytes]:
+        """
+        /chart：计算（或从缓存取得）星盘
+
+        Returns:
+            (ETag, JSON)
+
+        Raises:
+            HTTPError: 参数无效（400）或队列已满（503）
+        """
+        request = self._request(params)
+        return await self._get(request_key("serve_chart", *request), render_chart, request)
+
+    async def horoscope(self, params: Dict[str, Any]) -> Tuple[str, bytes]:
+        """/horoscope：计算（或从缓存取得）运限，参数见 chart() 与模块说明"""
+        key, args = self.horoscope_key(params)
+        return await self._get(key, render_horoscope, *args)
+
+    async def _batch_item(self, record: Any) -> Tuple[str, bytes]:
+        if not isinstance(record, dict):
+            raise HTTPError(400, "Record is not an object")
+        return await self.chart(record)
+
+    async def batch(self, records: Any) -> bytes:
+        """
+        /batch：批量计算星盘，结果按输入顺序排列，单条记录出错不影响其他记录
+
+        Raises:
+            HTTPError: 请求体格式无效（400）、记录过多（413）或队列已满（503）
+        """
+        if isinstance(records, dict):
+            records = records.get("records")
+        if not isinstance(records, list):
+            raise HTTPError(400, "Expected a list of records")
+        if len(records) > self.max_batch:
+            raise HTTPError(413, f"At most {self.max_batch} records per batch")
+
+        results = await asyncio.gather(
+            *(self._batch_item(record) for record in records), return_exceptions=True
+        )
+        parts: List[bytes] = []
+        for result in results:
+            if isinstance(result, HTTPError) and result.status == 503:
+                raise result
+            if isinstance(result, HTTPError):
+                parts.append(b'{"error":' + _dumps(result.message) + b"}")
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                parts.append(b'{"chart":' + result[1] + b"}")
+        return b'{"results":[' + b",".join(parts) + b"]}"
+
+
+# ============================================================================
+# HTTP server
+# ============================================================================
+
+
+async def _read_request(
+    reader: asyncio.StreamReader, timeout: float, max_body: int
+) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    """读取一个请求；连接关闭或空闲超时返回 None"""
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except asyncio.TimeoutError:
+        return None
+    if not line:
+        return None
+    try:
+        # 规范要求百分号编码，但也接受直接以 UTF-8 发送的非 ASCII 查询参数
+        method, target, version = line.decode("utf-8", "replace").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line") from None
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= 100:
+            raise HTTPError(431, "Too many headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "transfer-encoding" in headers:
+        raise HTTPError(501, "Chunked request bodies are not supported")
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length") from None
+    if length > max_body:
+        raise HTTPError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+
+def _response(
+    status: int, body: bytes, headers: Dict[str, str], keep_alive: bool, content_type: str
+) -> bytes:
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    if status != 304:
+        lines.append(f"Content-Type: {content_type}")
+        lines.append(f"Content-Length: {len(body)}")
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head if status == 304 else head + body
+
+
+class _Handler:
+    """把 HTTP 请求分派到 ChartService"""
+
+    def __init__(self, service: ChartService, keepalive_timeout: float, max_body: int):
+        self.service = service
+        self.keepalive_timeout = keepalive_timeout
+        self.max_body = max_body
+
+    async def __call__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await _read_request(reader, self.keepalive_timeout, self.max_body)
+                    if request is None:
+                        break
+                    method, target, version, headers, body = request
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = (
+                        connection != "close"
+                        if version == "HTTP/1.1"
+                        else connection == "keep-alive"
+                    )
+                    status, payload, extra, content_type = await self.dispatch(
+                        method, target, headers, body
+                    )
+                except HTTPError as e:
+                    status, payload, extra = e.status, _dumps({"error": e.message}), e.headers
+                    content_type = "application/json; charset=utf-8"
+                    # 请求体可能没有读完，无法继续复用连接
+                    keep_alive = keep_alive and e.status < 500 and e.status != 413
+                except Exception:
+                    traceback.print_exc(file=sys.stderr)
+                    status, payload, extra = 500, _dumps({"error": "Internal server error"}), {}
+                    content_type = "application/json; charset=utf-8"
+                    keep_alive = False
+                writer.write(_response(status, payload, extra, keep_alive, content_type))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(
+        self, method: str, target: str, headers: Dict[str, str], body: bytes
+    ) -> Tuple[int, bytes, Dict[str, str], str]:
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        content_type = "application/json; charset=utf-8"
+
+        if url.path in ("/chart", "/horoscope"):
+            if method != "GET":
+                raise HTTPError(405, "Method not allowed", {"Allow": "GET"})
+            if url.path == "/chart":
+                key = self.service.chart_key(params)
+                compute = self.service.chart
+            else:
+                key = self.service.horoscope_key(params)[0]
+                compute = self.service.horoscope
+            cached = self.service.cached(key)
+            if cached is not None and headers.get("if-none-match") == cached[0]:
+                return 304, b"", {"ETag": cached[0]}, content_type
+            etag, payload = cached if cached is not None else await compute(params)
+            if headers.get("if-none-match") == etag:
+                return 304, b"", {"ETag": etag}, content_type
+            return 200, payload, {"ETag": etag, "Cache-Control": "max-age=86400"}, content_type
+
+        if url.path == "/batch":
+            if method != "POST":
+                raise HTTPError(405, "Method not allowed", {"Allow": "POST"})
+            try:
+                records = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "Invalid JSON body") from None
+            return 200, await self.service.batch(records), {}, content_type
+
+        if url.path == "/healthz":
+            status = {"status": "ok", "waiting": self.service.waiting, "version": __version__}
+            return 200, _dumps(status), {"Cache-Control": "no-store"}, content_type
+
+        if url.path == "/metrics" and metrics.is_enabled():
+            payload = metrics.to_prometheus().encode("utf-8")
+            return 200, payload, {"Cache-Control": "no-store"}, "text/plain; version=0.0.4"
+
+        raise HTTPError(404, "Not found")
+
+
+async def start_server(
+    service: Optional[ChartService] = None,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    keepalive_timeout: float = 15.0,
+    max_body: int = 8 << 20,
+    backlog: int = 1024,
+) -> asyncio.AbstractServer:
+    """
+    在当前事件循环中启动 HTTP 服务
+
+    Args:
+        service: ChartService，默认使用线程池的服务
+        host: 监听地址
+        port: 监听端口，0 表示任意空闲端口
+        keepalive_timeout: 空闲连接保持的秒数
+        max_body: 请求体字节数上限
+        backlog: 监听队列长度
+
+    Returns:
+        asyncio Server（端口见 server.sockets[0].getsockname()）
+
+    Example:
+        >>> server = await start_server(ChartService(), port=8080)
+        >>> await server.serve_forever()
+    """
+    handler = _Handler(service or ChartService(), keepalive_timeout, max_body)
+    return await asyncio.start_server(handler, host, port, backlog=backlog)
+
+
+def make_runner(
+    workers: Optional[int] = None, threads: bool = False, collect_metrics: bool = False
+) -> AioRunner:
+    """
+    创建服务使用的 AioRunner：默认每个 CPU 一个预热过的工作进程
+
+    返回的 AioRunner 不拥有执行器，调用方负责 runner.executor.shutdown()。
+
+    Args:
+        workers: 工作进程（或线程）数，默认 CPU 核数
+        threads: 使用线程池（星盘计算受 GIL 限制，只适合低负载或调试）
+        collect_metrics: 工作进程采集埋点事件并随结果返回（见模块说明）
+    """
+    workers = workers or os.cpu_count() or 1
+    if threads:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(collect_metrics,)
+        )
+    return AioRunner(executor, max_workers=workers, max_pending=workers * 2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m iztro_py.serve", description="iztro-py HTTP chart service."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--threads", action="store_true", help="use threads instead of processes")
+    parser.add_argument("--max-queue", type=int, default=1024, help="waiting computations")
+    parser.add_argument("--max-batch", type=int, default=1000, help="records per /batch request")
+    parser.add_argument("--cache-entries", type=int, default=16384)
+    parser.add_argument("--cache-mb", type=int, default=256)
+    parser.add_argument("--keepalive", type=float, default=15.0, help="idle connection seconds")
+    parser.add_argument("--language", default="zh-CN", help="default chart language")
+    parser.add_argument("--metrics", action="store_true", help="serve /metrics")
+    args = parser.parse_args(argv)
+
+    warmup(precompute=False)
+    if args.metrics:
+        metrics.enable()
+    runner = make_runner(args.workers, args.threads, collect_metrics=args.metrics)
+    service = ChartService(
+        runner,
+        max_queue=args.max_queue,
+        cache_entries=args.cache_entries,
+        cache_bytes=args.cache_mb << 20,
+        max_batch=args.max_batch,
+        language=args.language,
+    )
+
+    async def serve() -> None:
+        server = await start_server(service, args.host, args.port, args.keepalive)
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"iztro-py serving on http://{host}:{port}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        runner.executor.shutdown(wait=False)
+    return 0
+
+
+__all__ = [
+    "RESPONSE_CACHE",
+    "HTTPError",
+    "render_chart",
+    "render_horoscope",
+    "ChartService",
+    "start_server",
+    "make_runner",
+    "main",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,9 @@ especially Ziwei (紫微) and Tianfu (天府).
 from typing import Dict, Tuple
 from datetime import date, timedelta
 from iztro_py.data.types import FiveElementsClass, HeavenlyStemName, EarthlyBranchName
-from iztro_py.data.constants import fix_index, ZIWEI_START_POSITIONS
+from iztro_py.data.constants import fix_index, TIANFU_GROUP, ZIWEI_GROUP, ZIWEI_START_POSITIONS
 from iztro_py.utils.calendar import parse_solar_date, solar_to_lunar
+from iztro_py.utils.helpers import get_five_elements_class
 
 
 def get_ziwei_index(five_elements_class: FiveElementsClass, lunar_day: int) -> int:
@@ -107,6 +108,65 @@ def get_star_indices(five_elements_class: FiveElementsClass, lunar_day: int) ->
     return ziwei_index, tianfu_index
 
 
+def _start_indices(class_value: int, lunar_day: int) -> Tuple[int, int]:
+    """
+    紫微/天府起局的原始算法（仅用于生成 START_INDEX_TABLE）
+
+    “六五四三二，酉午亥辰丑；局数除日数，商数宫前走；若见数无余，便要起虎口，日数小于局，还直宫中守。”
+    """
+    # 寻找最小 offset 使 (lunar_day + offset) 能被 class_value 整除
+    offset = -1
+    remainder = -1
+    while remainder != 0:
+        offset += 1
+        divisor = lunar_day + offset
+        remainder = divisor % class_value
+        quotient = divisor // class_value
+
+    # 商对 12 取模（以寅为0的坐标系）
+    quotient %= 12
+
+    # 起始紫微索引（寅为0坐标系）
+    node_ziwei_index = quotient - 1
+
+    # 循环次数为偶数：逆时针加 offset；奇数：顺时针减 offset
+    if offset % 2 == 0:
+        node_ziwei_index += offset
+    else:
+        node_ziwei_index -= offset
+    node_ziwei_index = fix_index(node_ziwei_index)
+
+    # 天府星位置与紫微星相对（同一坐标系下）
+    node_tianfu_index = fix_index(12 - node_ziwei_index)
+
+    # iztro 的索引以寅宫为0，而本库以子宫为0，需要转换：ours = (iztro + 2) % 12
+    ziwei_index = fix_index(node_ziwei_index + 2)
+    tianfu_index = fix_index(node_tianfu_index + 2)
+    return ziwei_index, tianfu_index
+
+
+# (紫微索引, 天府索引)：START_INDEX_TABLE[(五行局数 - 2) * 30 + 农历日 - 1]，导入时生成
+START_INDEX_TABLE: Tuple[Tuple[int, int], ...] = tuple(
+    _start_indices(class_value, lunar_day)
+    for class_value in range(2, 7)
+    for lunar_day in range(1, 31)
+)
+
+
+def get_start_indices_by_day(five_elements_class_value: int, lunar_day: int) -> Tuple[int, int]:
+    """
+    按五行局数与农历日查表得到紫微与天府索引
+
+    Args:
+        five_elements_class_value: 五行局数值 (2-6)
+        lunar_day: 农历日 (1-30)，晚子时应传入次日的农历日
+
+    Returns:
+        (紫微索引, 天府索引)
+    """
+    return START_INDEX_TABLE[(five_elements_class_value - 2) * 30 + lunar_day - 1]
+
+
 def get_start_indices(
     solar_date_str: str,
     time_index: int,
@@ -124,6 +184,8 @@ def get_start_indices(
     - 晚子时（time_index==12）按次日处理（跨月则顺延到下一月初一）
     - 五行局按命宫干支起局
 
+    已知农历日与五行局时可直接调用 get_start_indices_by_day。
+
     Returns:
         (紫微索引, 天府索引)
     """
@@ -142,40 +204,8 @@ def get_start_indices(
     # 五行局数值
     # 直接使用传入的命宫干支计算的五行局数值
     # 复用已有查表逻辑
-    from iztro_py.utils.helpers import get_five_elements_class
-
     five_cls = get_five_elements_class(heavenly_stem_of_soul, earthly_branch_of_soul)
-    class_value: int = five_cls.value
-
-    # 寻找最小 offset 使 (lunar_day + offset) 能被 class_value 整除
-    offset = -1
-    remainder = -1
-    while remainder != 0:
-        offset += 1
-        divisor = lunar_day + offset
-        remainder = divisor % class_value
-        quotient = divisor // class_value
-
-    # 商对 12 取模（以寅为0的坐标系）
-    quotient %= 12
-
-    # 起始紫微索引（寅为0坐标系）
-    node_ziwei_index = quotient - 1
-
-    # 循环次数为偶数：逆时针加 offset；奇数：顺时针减 offset
-    if offset % 2 == 0:
-        node_ziwei_index += offset
-    else:
-        node_ziwei_index -= offset
-    node_ziwei_index = fix_index(node_ziwei_index)
-
-    # 天府星位置与紫微星相对（同一坐标系下）
-    node_tianfu_index = fix_index(12 - node_ziwei_index)
-
-    # iztro 的索引以寅宫为0，而本库以子宫为0，需要转换：ours = (iztro + 2) % 12
-    ziwei_index = fix_index(node_ziwei_index + 2)
-    tianfu_index = fix_index(node_tianfu_index + 2)
-    return ziwei_index, tianfu_index
+    return get_start_indices_by_day(five_cls.value, lunar_day)
 
 
 def get_major_star_positions(ziwei_index: int, tianfu_index: int) -> Dict[str, int]:
@@ -192,8 +222,6 @@ def get_major_star_positions(ziwei_index: int, tianfu_index: int) -> Dict[str, i
     Returns:
         星曜名称到宫位索引的映射字典
     """
-    from iztro_py.data.constants import ZIWEI_GROUP, TIANFU_GROUP
-
     positions = {}
 
     # 紫微星系（逆行）
@@ -4,9 +4,29 @@ Major stars placement for iztro-py
 Functions for placing the 14 major stars (主星) into palaces.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from iztro_py.data.types import Star, FiveElementsClass
-from iztro_py.star.location import get_major_star_positions
+from iztro_py.data.constants import EARTHLY_BRANCH_INDEX, TIANFU_GROUP, ZIWEI_GROUP, fix_index
+from iztro_py.star.location import get_tianfu_index, get_ziwei_index
+from iztro_py.star.pool import InternedStar, intern_star
+
+# (地支索引, 主星)，按放置顺序排列
+StarLayout = Tuple[Tuple[int, InternedStar], ...]
+
+
+def _group_layout(group: List[str], start: int, step: int) -> StarLayout:
+    """生成某一星系从 start 起按 step 方向排布的 (地支索引, 主星) 序列，空位跳过"""
+    return tuple(
+        (fix_index(start + step * offset), intern_star(star_name, "major"))
+        for offset, star_name in enumerate(group)
+        if star_name
+    )
+
+
+# 紫微星系（逆行）与天府星系（顺行）在各起始宫位下的排布，导入时生成：
+# ZIWEI_LAYOUT[紫微索引]、TIANFU_LAYOUT[天府索引]
+ZIWEI_LAYOUT: Tuple[StarLayout, ...] = tuple(_group_layout(ZIWEI_GROUP, i, -1) for i in range(12))
+TIANFU_LAYOUT: Tuple[StarLayout, ...] = tuple(_group_layout(TIANFU_GROUP, i, 1) for i in range(12))
 
 
 def place_major_stars(
@@ -27,40 +47,22 @@ def place_major_stars(
     Note:
         直接修改palaces列表，不返回值
     """
-    from iztro_py.data.constants import EARTHLY_BRANCHES
-
     # 兼容旧API：如果第一个参数是 FiveElementsClass，则按旧算法计算索引
     if isinstance(arg1, FiveElementsClass):
-        from iztro_py.star.location import get_ziwei_index, get_tianfu_index
-
         five_class: FiveElementsClass = arg1
         lunar_day: int = arg2
         ziwei_index = get_ziwei_index(five_class, lunar_day)
         tianfu_index = get_tianfu_index(ziwei_index)
     else:
-        ziwei_index = int(arg1)
-        tianfu_index = int(arg2)
-
-    # 获取所有主星位置（地支索引）
-    star_positions = get_major_star_positions(ziwei_index, tianfu_index)
-
-    # 将星曜放置到对应宫位
-    # 注意：star_positions 中的索引是地支索引，需要转换为宫位索引
-    for star_name, earthly_branch_index in star_positions.items():
-        star = Star(
-            name=star_name,
-            type="major",
-            scope="origin",
-            brightness=None,  # 后续计算
-            mutagen=None,  # 后续计算
-        )
-
-        # 查找具有该地支的宫位
-        target_branch = EARTHLY_BRANCHES[earthly_branch_index]
-        for palace in palaces:
-            if palace["earthly_branch"] == target_branch:
-                palace["major_stars"].append(star)
-                break
+        ziwei_index = int(arg1) % 12
+        tianfu_index = int(arg2) % 12
+
+    # 宫位按地支顺序从命宫排起，地支索引 b 所在宫位即 palaces[(b - 命宫地支) % 12]
+    # 亮度与四化在后续步骤中替换为对应的共享实例
+    start = EARTHLY_BRANCH_INDEX[palaces[0]["earthly_branch"]]
+    for layout in (ZIWEI_LAYOUT[ziwei_index], TIANFU_LAYOUT[tianfu_index]):
+        for branch_index, star in layout:
+            palaces[(branch_index - start) % 12]["major_stars"].append(star)
 
 
 def get_major_stars_in_palace(palace: dict) -> List[Star]:
@@ -4,9 +4,10 @@ Minor stars placement for iztro-py
 Functions for placing the 14 minor stars (辅星) into palaces.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Tuple
 from iztro_py.data.types import Star, HeavenlyStemName, EarthlyBranchName
-from iztro_py.data.constants import HEAVENLY_STEMS, EARTHLY_BRANCHES
+from iztro_py.star.pool import InternedStar, intern_star
+from iztro_py.data.constants import HEAVENLY_STEM_INDEX, EARTHLY_BRANCH_INDEX
 from iztro_py.star.location import (
     get_minor_star_position_zuofu,
     get_minor_star_position_youbi,
@@ -18,25 +19,78 @@ from iztro_py.star.location import (
     get_minor_star_positions_lucun_yangtuo_tianma,
 )
 
+# (地支索引, 辅星)，按放置顺序排列
+StarLayout = Tuple[Tuple[int, InternedStar], ...]
 
-def _find_palace_by_branch_index(
-    palaces: List[Dict[str, Any]], branch_index: int
-) -> Optional[Dict[str, Any]]:
-    """
-    根据地支索引查找对应的宫位
 
-    Args:
-        palaces: 宫位列表
-        branch_index: 地支索引 (0-11)
+def _layout(*placements: Tuple[int, str, str]) -> StarLayout:
+    """由 (地支索引, 星名, 类型) 生成 (地支索引, 共享星曜实例) 序列"""
+    return tuple((branch, intern_star(name, star_type)) for branch, name, star_type in placements)
 
-    Returns:
-        对应的宫位字典，如果未找到则返回None
-    """
-    target_branch = EARTHLY_BRANCHES[branch_index]
-    for palace in palaces:
-        if palace["earthly_branch"] == target_branch:
-            return palace
-    return None
+
+# 辅星只取决于农历月、时辰、年干、年支四个因子，按因子各建一张小表，导入时生成
+
+# 左辅、右弼：BY_MONTH[lunar_month - 1]
+BY_MONTH: Tuple[StarLayout, ...] = tuple(
+    _layout(
+        (get_minor_star_position_zuofu(month), "zuofuMin", "soft"),
+        (get_minor_star_position_youbi(month), "youbiMin", "soft"),
+    )
+    for month in range(1, 13)
+)
+
+# 文昌、文曲：BY_TIME[time_index]
+BY_TIME: Tuple[StarLayout, ...] = tuple(
+    _layout(
+        (get_minor_star_position_wenchang(time), "wenchangMin", "soft"),
+        (get_minor_star_position_wenqu(time), "wenquMin", "soft"),
+    )
+    for time in range(13)
+)
+
+# 天魁、天钺：BY_STEM[year_stem_index]
+BY_STEM: Tuple[StarLayout, ...] = tuple(
+    _layout(
+        (get_minor_star_positions_kuiyue(stem)[0], "tiankuiMin", "soft"),
+        (get_minor_star_positions_kuiyue(stem)[1], "tianyueMin", "soft"),
+    )
+    for stem in range(10)
+)
+
+# 火星、铃星：BY_BRANCH_TIME[year_branch_index * 13 + time_index]
+BY_BRANCH_TIME: Tuple[StarLayout, ...] = tuple(
+    _layout(
+        (get_minor_star_positions_huoling(branch, time)[0], "huoxingMin", "tough"),
+        (get_minor_star_positions_huoling(branch, time)[1], "lingxingMin", "tough"),
+    )
+    for branch in range(12)
+    for time in range(13)
+)
+
+# 地空、地劫：KONGJIE_BY_TIME[time_index]
+KONGJIE_BY_TIME: Tuple[StarLayout, ...] = tuple(
+    _layout(
+        (get_minor_star_positions_kongjie(time)[0], "dikongMin", "tough"),
+        (get_minor_star_positions_kongjie(time)[1], "dijieMin", "tough"),
+    )
+    for time in range(13)
+)
+
+# 禄存、擎羊、陀罗（按年干）：LUCUN_BY_STEM[year_stem_index]
+LUCUN_BY_STEM: Tuple[StarLayout, ...] = tuple(
+    _layout(
+        (get_minor_star_positions_lucun_yangtuo_tianma(stem, 0)[0], "lucunMin", "lucun"),
+        (get_minor_star_positions_lucun_yangtuo_tianma(stem, 0)[1], "qingyangMin", "tough"),
+        (get_minor_star_positions_lucun_yangtuo_tianma(stem, 0)[2], "tuoluoMin", "tough"),
+    )
+    for stem in range(10)
+)
+
+# 天马（按年支）：TIANMA_BY_BRANCH[year_branch_index]
+TIANMA_BY_BRANCH: Tuple[StarLayout, ...] = tuple(
+    _layout((get_minor_star_positions_lucun_yangtuo_tianma(0, branch)[3], "tianmaMin", "tianma"))
+    for branch in range(12)
+)
 
 
 def place_minor_stars(
@@ -49,8 +103,11 @@ def place_minor_stars(
     """
     将14颗辅星安置到宫位中
 
+    依次放置：左辅右弼（月）、文昌文曲（时）、天魁天钺（年干）、火铃（年支与时）、
+    空劫（时）、禄存羊陀（年干）、天马（年支），位置均查表得到。
+
     Args:
-        palaces: 宫位列表
+        palaces: 宫位列表（按地支顺序从命宫排起，即 initialize_palaces 的结果）
         lunar_month: 农历月
         time_index: 时辰索引
         year_stem: 年干
@@ -59,86 +116,21 @@ def place_minor_stars(
     Note:
         直接修改palaces列表，不返回值
     """
-    year_stem_index = HEAVENLY_STEMS.index(year_stem)
-    year_branch_index = EARTHLY_BRANCHES.index(year_branch)
-
-    # 1. 左辅、右弼（按农历月）
-    zuofu_index = get_minor_star_position_zuofu(lunar_month)
-    youbi_index = get_minor_star_position_youbi(lunar_month)
-
-    zuofu_palace = _find_palace_by_branch_index(palaces, zuofu_index)
-    if zuofu_palace:
-        zuofu_palace["minor_stars"].append(Star(name="zuofuMin", type="soft", scope="origin"))
-
-    youbi_palace = _find_palace_by_branch_index(palaces, youbi_index)
-    if youbi_palace:
-        youbi_palace["minor_stars"].append(Star(name="youbiMin", type="soft", scope="origin"))
-
-    # 2. 文昌、文曲（按时辰）
-    wenchang_index = get_minor_star_position_wenchang(time_index)
-    wenqu_index = get_minor_star_position_wenqu(time_index)
-
-    wenchang_palace = _find_palace_by_branch_index(palaces, wenchang_index)
-    if wenchang_palace:
-        wenchang_palace["minor_stars"].append(Star(name="wenchangMin", type="soft", scope="origin"))
-
-    wenqu_palace = _find_palace_by_branch_index(palaces, wenqu_index)
-    if wenqu_palace:
-        wenqu_palace["minor_stars"].append(Star(name="wenquMin", type="soft", scope="origin"))
-
-    # 3. 天魁、天钺（按年干）
-    kuai_index, yue_index = get_minor_star_positions_kuiyue(year_stem_index)
-
-    kuai_palace = _find_palace_by_branch_index(palaces, kuai_index)
-    if kuai_palace:
-        kuai_palace["minor_stars"].append(Star(name="tiankuiMin", type="soft", scope="origin"))
-
-    yue_palace = _find_palace_by_branch_index(palaces, yue_index)
-    if yue_palace:
-        yue_palace["minor_stars"].append(Star(name="tianyueMin", type="soft", scope="origin"))
-
-    # 4. 火星、铃星（按年支和时辰）
-    huo_index, ling_index = get_minor_star_positions_huoling(year_branch_index, time_index)
-
-    huo_palace = _find_palace_by_branch_index(palaces, huo_index)
-    if huo_palace:
-        huo_palace["minor_stars"].append(Star(name="huoxingMin", type="tough", scope="origin"))
-
-    ling_palace = _find_palace_by_branch_index(palaces, ling_index)
-    if ling_palace:
-        ling_palace["minor_stars"].append(Star(name="lingxingMin", type="tough", scope="origin"))
-
-    # 5. 地空、地劫（按时辰）
-    kong_index, jie_index = get_minor_star_positions_kongjie(time_index)
-
-    kong_palace = _find_palace_by_branch_index(palaces, kong_index)
-    if kong_palace:
-        kong_palace["minor_stars"].append(Star(name="dikongMin", type="tough", scope="origin"))
-
-    jie_palace = _find_palace_by_branch_index(palaces, jie_index)
-    if jie_palace:
-        jie_palace["minor_stars"].append(Star(name="dijieMin", type="tough", scope="origin"))
-
-    # 6. 禄存、擎羊、陀罗、天马（按年干支）
-    lucun_index, yang_index, tuo_index, tianma_index = (
-        get_minor_star_positions_lucun_yangtuo_tianma(year_stem_index, year_branch_index)
-    )
-
-    lucun_palace = _find_palace_by_branch_index(palaces, lucun_index)
-    if lucun_palace:
-        lucun_palace["minor_stars"].append(Star(name="lucunMin", type="lucun", scope="origin"))
-
-    yang_palace = _find_palace_by_branch_index(palaces, yang_index)
-    if yang_palace:
-        yang_palace["minor_stars"].append(Star(name="qingyangMin", type="tough", scope="origin"))
-
-    tuo_palace = _find_palace_by_branch_index(palaces, tuo_index)
-    if tuo_palace:
-        tuo_palace["minor_stars"].append(Star(name="tuoluoMin", type="tough", scope="origin"))
-
-    tianma_palace = _find_palace_by_branch_index(palaces, tianma_index)
-    if tianma_palace:
-        tianma_palace["minor_stars"].append(Star(name="tianmaMin", type="tianma", scope="origin"))
+    year_stem_index = HEAVENLY_STEM_INDEX[year_stem]
+    year_branch_index = EARTHLY_BRANCH_INDEX[year_branch]
+
+    start = EARTHLY_BRANCH_INDEX[palaces[0]["earthly_branch"]]
+    for layout in (
+        BY_MONTH[(lunar_month - 1) % 12],
+        BY_TIME[time_index],
+        BY_STEM[year_stem_index],
+        BY_BRANCH_TIME[year_branch_index * 13 + time_index],
+        KONGJIE_BY_TIME[time_index],
+        LUCUN_BY_STEM[year_stem_index],
+        TIANMA_BY_BRANCH[year_branch_index],
+    ):
+        for branch_index, star in layout:
+            palaces[(branch_index - start) % 12]["minor_stars"].append(star)
 
 
 def get_minor_stars_in_palace(palace: dict) -> List[Star]:
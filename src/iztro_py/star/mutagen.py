@@ -7,6 +7,7 @@ Functions for calculating and applying mutagen transformations to stars.
 from typing import Any, Dict, List, Optional, Tuple
 from iztro_py.data.types import HeavenlyStemName, StarName, Mutagen
 from iztro_py.data.heavenly_stems import get_mutagen, get_mutagen_type
+from iztro_py.star.pool import replace_star
 
 
 def apply_mutagen_to_palaces(palaces: List[Dict[str, Any]], year_stem: HeavenlyStemName) -> None:
@@ -20,24 +21,16 @@ def apply_mutagen_to_palaces(palaces: List[Dict[str, Any]], year_stem: HeavenlyS
         year_stem: 年干
 
     Note:
-        直接修改palaces列表，不返回值
+        直接修改palaces列表，不返回值；星曜是共享实例，
+        带四化的星曜会被替换为星曜池中对应的实例，而不是原地修改
     """
-    # 获取该年干对应的四化星
-    mutagen_stars = get_mutagen(year_stem)  # [禄星, 权星, 科星, 忌星]
-
-    # 遍历所有宫位
+    # 遍历所有宫位的主星与辅星
     for palace in palaces:
-        # 检查主星
-        for star in palace["major_stars"]:
-            mutagen_type = get_mutagen_type(year_stem, star.name)
-            if mutagen_type:
-                star.mutagen = mutagen_type
-
-        # 检查辅星
-        for star in palace["minor_stars"]:
-            mutagen_type = get_mutagen_type(year_stem, star.name)
-            if mutagen_type:
-                star.mutagen = mutagen_type
+        for stars in (palace["major_stars"], palace["minor_stars"]):
+            for i, star in enumerate(stars):
+                mutagen_type = get_mutagen_type(year_stem, star.name)
+                if mutagen_type:
+                    stars[i] = replace_star(star, mutagen=mutagen_type)
 
 
 def get_mutagen_stars(year_stem: HeavenlyStemName) -> Dict[Mutagen, StarName]:
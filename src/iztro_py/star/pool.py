@@ -0,0 +1,99 @@
+"""
+Star pool (星曜池) for iztro-py
+
+A chart only ever contains a few hundred distinct star states
+(name, type, scope, brightness, mutagen). The placement functions take their
+Star instances from this pool instead of allocating a new model per chart, so
+every chart shares the same immutable Star objects.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from pydantic import ConfigDict
+from iztro_py.data.types import Brightness, Mutagen, Scope, Star, StarName, StarType
+
+_StarKey = Tuple[str, str, str, Optional[str], Optional[str]]
+
+
+class InternedStar(Star):
+    """
+    不可变的共享星曜
+
+    由星曜池创建并在所有星盘间共享，因此禁止修改；
+    需要不同的亮度或四化时使用 replace_star() 获取对应的共享实例。
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    def __copy__(self) -> "InternedStar":
+        return self
+
+    def __deepcopy__(self, memo: Any = None) -> "InternedStar":
+        return self
+
+    def __reduce__(self) -> Any:
+        # 加载时取回池中的实例
+        return (intern_star, (self.name, self.type, self.scope, self.brightness, self.mutagen))
+
+
+_POOL: Dict[_StarKey, InternedStar] = {}
+
+
+def intern_star(
+    name: StarName,
+    type: StarType,
+    scope: Scope = "origin",
+    brightness: Optional[Brightness] = None,
+    mutagen: Optional[Mutagen] = None,
+) -> InternedStar:
+    """
+    获取指定状态的共享星曜实例
+
+    Args:
+        name: 星曜名称
+        type: 星曜类型
+        scope: 作用范围（默认本命）
+        brightness: 亮度
+        mutagen: 四化
+
+    Returns:
+        共享的不可变星曜
+    """
+    key = (name, type, scope, brightness, mutagen)
+    star = _POOL.get(key)
+    if star is None:
+        star = InternedStar(
+            name=name, type=type, scope=scope, brightness=brightness, mutagen=mutagen
+        )
+        # setdefault 保证并发创建时所有调用方拿到同一个实例
+        star = _POOL.setdefault(key, star)
+    return star
+
+
+def replace_star(
+    star: Star,
+    brightness: Optional[Brightness] = None,
+    mutagen: Optional[Mutagen] = None,
+) -> InternedStar:
+    """
+    获取在 star 基础上修改了亮度/四化后的共享实例（原实例不变）
+
+    Args:
+        star: 原星曜
+        brightness: 新亮度，None 表示保持不变
+        mutagen: 新四化，None 表示保持不变
+
+    Returns:
+        共享的不可变星曜
+    """
+    return intern_star(
+        star.name,
+        star.type,
+        star.scope,
+        brightness if brightness is not None else star.brightness,
+        mutagen if mutagen is not None else star.mutagen,
+    )
+
+
+def pool_size() -> int:
+    """返回星曜池中的实例数量"""
+    return len(_POOL)
@@ -6,8 +6,11 @@ and calculating heavenly stems and earthly branches (天干地支).
 """
 
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Tuple, Optional
-from lunarcalendar import Converter, Solar, Lunar, DateNotExist
+from types import ModuleType
+
+from iztro_py import instrumentation
 
 from iztro_py.data.types import (
     LunarDate,
@@ -28,6 +31,32 @@ from iztro_py.data.constants import (
 # Solar to Lunar Conversion
 # ============================================================================
 
+# lunarcalendar 在第一次历法转换时才导入（导入它需要数十毫秒）
+_lunarcalendar: Optional[ModuleType] = None
+
+
+def _calendar_lib() -> ModuleType:
+    """返回 lunarcalendar 模块，首次调用时导入"""
+    global _lunarcalendar
+    if _lunarcalendar is None:
+        import lunarcalendar
+
+        _lunarcalendar = lunarcalendar
+    return _lunarcalendar
+
+
+@lru_cache(maxsize=65536)
+def _convert_solar_to_lunar(year: int, month: int, day: int) -> Tuple[int, int, int, bool]:
+    """
+    调用 lunarcalendar 做阳历转农历，返回 (年, 月, 日, 是否闰月)
+
+    lunarcalendar 每次转换都会动态创建一个临时类（自带引用环，只能由循环垃圾回收释放），
+    历法转换结果又是确定的，因此在这里缓存结果。
+    """
+    lib = _calendar_lib()
+    lunar = lib.Converter.Solar2Lunar(lib.Solar(year, month, day))
+    return lunar.year, lunar.month, lunar.day, lunar.isleap
+
 
 def solar_to_lunar(year: int, month: int, day: int, fix_leap: bool = True) -> LunarDate:
     """
@@ -45,22 +74,31 @@ def solar_to_lunar(year: int, month: int, day: int, fix_leap: bool = True) -> Lu
     Raises:
         ValueError: 如果日期无效
     """
+    timer = instrumentation.stage_timer("solar_to_lunar")
     try:
-        solar = Solar(year, month, day)
-        lunar = Converter.Solar2Lunar(solar)
-
-        is_leap = lunar.isleap
+        if instrumentation.is_enabled():
+            hits = _convert_solar_to_lunar.cache_info().hits
+            lunar_year, lunar_month, lunar_day, is_leap = _convert_solar_to_lunar(year, month, day)
+            instrumentation.record_cache(
+                "solar_to_lunar", _convert_solar_to_lunar.cache_info().hits > hits
+            )
+        else:
+            lunar_year, lunar_month, lunar_day, is_leap = _convert_solar_to_lunar(year, month, day)
 
         # 修正闰月：如果在闰月的前半月，调整为前一个月
-        if fix_leap and is_leap and lunar.day <= 15:
+        if fix_leap and is_leap and lunar_day <= 15:
             # 调整为前一个月的非闰月
             is_leap = False
 
-        return LunarDate(year=lunar.year, month=lunar.month, day=lunar.day, is_leap_month=is_leap)
+        result = LunarDate(year=lunar_year, month=lunar_month, day=lunar_day, is_leap_month=is_leap)
+        if timer:
+            timer("convert")
+            timer.finish()
+        return result
 
-    except DateNotExist:
-        raise ValueError(f"Invalid solar date: {year}-{month}-{day}")
     except Exception as e:
+        if isinstance(e, _calendar_lib().DateNotExist):
+            raise ValueError(f"Invalid solar date: {year}-{month}-{day}")
         raise ValueError(f"Error converting solar to lunar: {e}")
 
 
@@ -115,15 +153,20 @@ def lunar_to_solar(
     Raises:
         ValueError: 如果日期无效
     """
+    timer = instrumentation.stage_timer("lunar_to_solar")
     try:
-        lunar = Lunar(year, month, day, isleap=is_leap_month)
-        solar = Converter.Lunar2Solar(lunar)
+        lib = _calendar_lib()
+        lunar = lib.Lunar(year, month, day, isleap=is_leap_month)
+        solar = lib.Converter.Lunar2Solar(lunar)
+        if timer:
+            timer("convert")
+            timer.finish()
 
         return solar.year, solar.month, solar.day
 
-    except DateNotExist:
-        raise ValueError(f"Invalid lunar date: {year}-{month}-{day} (leap={is_leap_month})")
     except Exception as e:
+        if isinstance(e, _calendar_lib().DateNotExist):
+            raise ValueError(f"Invalid lunar date: {year}-{month}-{day} (leap={is_leap_month})")
         raise ValueError(f"Error converting lunar to solar: {e}")
 
 
@@ -398,6 +441,55 @@ def get_sign(month: int, day: int) -> str:
 # ============================================================================
 
 
+# 农历月份与日期的中文写法
+_LUNAR_NUMBERS = ["〇", "一", "二", "三", "四", "五", "六", "七", "八", "九", "十"]
+_LUNAR_MONTHS = ["", "正", "二", "三", "四", "五", "六", "七", "八", "九", "十", "冬", "腊"]
+
+# 天干地支中文映射
+_STEM_NAMES = {
+    "jiaHeavenly": "甲",
+    "yiHeavenly": "乙",
+    "bingHeavenly": "丙",
+    "dingHeavenly": "丁",
+    "wuHeavenly": "戊",
+    "jiHeavenly": "己",
+    "gengHeavenly": "庚",
+    "xinHeavenly": "辛",
+    "renHeavenly": "壬",
+    "guiHeavenly": "癸",
+}
+
+_BRANCH_NAMES = {
+    "ziEarthly": "子",
+    "chouEarthly": "丑",
+    "yinEarthly": "寅",
+    "maoEarthly": "卯",
+    "chenEarthly": "辰",
+    "siEarthly": "巳",
+    "wuEarthly": "午",
+    "weiEarthly": "未",
+    "shenEarthly": "申",
+    "youEarthly": "酉",
+    "xuEarthly": "戌",
+    "haiEarthly": "亥",
+}
+
+
+def _format_lunar_day(day: int) -> str:
+    """农历日期数字转中文，如 17 -> 十七"""
+    if day <= 10:
+        return f"初{_LUNAR_NUMBERS[day]}"
+    elif day < 20:
+        return f"十{_LUNAR_NUMBERS[day - 10]}"
+    elif day == 20:
+        return "二十"
+    elif day < 30:
+        return f"廿{_LUNAR_NUMBERS[day - 20]}"
+    elif day == 30:
+        return "三十"
+    return str(day)
+
+
 def format_lunar_date(lunar_date: LunarDate) -> str:
     """
     格式化农历日期为中文字符串
@@ -408,34 +500,16 @@ def format_lunar_date(lunar_date: LunarDate) -> str:
     Returns:
         格式化后的字符串，如 "2000年七月十八" 或 "2000年闰七月十八"
     """
-    # 数字转中文
-    chinese_numbers = ["〇", "一", "二", "三", "四", "五", "六", "七", "八", "九", "十"]
-    months = ["", "正", "二", "三", "四", "五", "六", "七", "八", "九", "十", "冬", "腊"]
-
     # 月份
     if lunar_date.month <= 12:
-        month_str = months[lunar_date.month]
+        month_str = _LUNAR_MONTHS[lunar_date.month]
     else:
         month_str = str(lunar_date.month)
 
     if lunar_date.is_leap_month:
         month_str = f"闰{month_str}"
 
-    # 日期
-    if lunar_date.day <= 10:
-        day_str = f"初{chinese_numbers[lunar_date.day]}"
-    elif lunar_date.day < 20:
-        day_str = f"十{chinese_numbers[lunar_date.day - 10]}"
-    elif lunar_date.day == 20:
-        day_str = "二十"
-    elif lunar_date.day < 30:
-        day_str = f"廿{chinese_numbers[lunar_date.day - 20]}"
-    elif lunar_date.day == 30:
-        day_str = "三十"
-    else:
-        day_str = str(lunar_date.day)
-
-    return f"{lunar_date.year}年{month_str}月{day_str}"
+    return f"{lunar_date.year}年{month_str}月{_format_lunar_day(lunar_date.day)}"
 
 
 def format_chinese_date(chinese_date: HeavenlyStemAndEarthlyBranchDate) -> str:
@@ -448,34 +522,8 @@ def format_chinese_date(chinese_date: HeavenlyStemAndEarthlyBranchDate) -> str:
     Returns:
         格式化后的字符串，如 "庚辰年七月十八 午时"
     """
-    # 天干地支中文映射
-    stem_names = {
-        "jiaHeavenly": "甲",
-        "yiHeavenly": "乙",
-        "bingHeavenly": "丙",
-        "dingHeavenly": "丁",
-        "wuHeavenly": "戊",
-        "jiHeavenly": "己",
-        "gengHeavenly": "庚",
-        "xinHeavenly": "辛",
-        "renHeavenly": "壬",
-        "guiHeavenly": "癸",
-    }
-
-    branch_names = {
-        "ziEarthly": "子",
-        "chouEarthly": "丑",
-        "yinEarthly": "寅",
-        "maoEarthly": "卯",
-        "chenEarthly": "辰",
-        "siEarthly": "巳",
-        "wuEarthly": "午",
-        "weiEarthly": "未",
-        "shenEarthly": "申",
-        "youEarthly": "酉",
-        "xuEarthly": "戌",
-        "haiEarthly": "亥",
-    }
+    stem_names = _STEM_NAMES
+    branch_names = _BRANCH_NAMES
 
     year_str = f"{stem_names[chinese_date.year_stem]}{branch_names[chinese_date.year_branch]}"
     month_str = f"{stem_names[chinese_date.month_stem]}{branch_names[chinese_date.month_branch]}"
@@ -483,3 +531,76 @@ def format_chinese_date(chinese_date: HeavenlyStemAndEarthlyBranchDate) -> str:
     time_str = f"{stem_names[chinese_date.time_stem]}{branch_names[chinese_date.time_branch]}"
 
     return f"{year_str}年{month_str}月{day_str}日 {time_str}时"
+
+
+# ============================================================================
+# Parse Formatted Strings
+# ============================================================================
+
+_LUNAR_MONTH_LOOKUP = {name: i for i, name in enumerate(_LUNAR_MONTHS) if name}
+_LUNAR_DAY_LOOKUP = {_format_lunar_day(d): d for d in range(1, 31)}
+_STEM_LOOKUP = {v: k for k, v in _STEM_NAMES.items()}
+_BRANCH_LOOKUP = {v: k for k, v in _BRANCH_NAMES.items()}
+
+
+def parse_formatted_lunar_date(text: str) -> LunarDate:
+    """
+    解析 format_lunar_date 生成的农历日期字符串（逆运算）
+
+    Args:
+        text: 如 "2000年七月十七" 或 "2023年闰二月初五"
+
+    Returns:
+        LunarDate对象
+
+    Raises:
+        ValueError: 如果字符串格式无效
+    """
+    try:
+        year_str, rest = text.split("年", 1)
+        month_str, day_str = rest.split("月", 1)
+        is_leap = month_str.startswith("闰")
+        if is_leap:
+            month_str = month_str[1:]
+        return LunarDate(
+            year=int(year_str),
+            month=_LUNAR_MONTH_LOOKUP[month_str],
+            day=_LUNAR_DAY_LOOKUP[day_str],
+            is_leap_month=is_leap,
+        )
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid lunar date string: {text}")
+
+
+def parse_formatted_chinese_date(text: str) -> HeavenlyStemAndEarthlyBranchDate:
+    """
+    解析 format_chinese_date 生成的干支日期字符串（逆运算）
+
+    Args:
+        text: 如 "庚辰年甲申月乙卯日 壬午时"
+
+    Returns:
+        HeavenlyStemAndEarthlyBranchDate对象
+
+    Raises:
+        ValueError: 如果字符串格式无效
+    """
+    chars = text.replace(" ", "")
+    if len(chars) != 12 or chars[2::3] != "年月日时":
+        raise ValueError(f"Invalid chinese date string: {text}")
+
+    try:
+        pillars = [(_STEM_LOOKUP[chars[i]], _BRANCH_LOOKUP[chars[i + 1]]) for i in (0, 3, 6, 9)]
+    except KeyError:
+        raise ValueError(f"Invalid chinese date string: {text}")
+
+    return HeavenlyStemAndEarthlyBranchDate(
+        year_stem=pillars[0][0],
+        year_branch=pillars[0][1],
+        month_stem=pillars[1][0],
+        month_branch=pillars[1][1],
+        day_stem=pillars[2][0],
+        day_branch=pillars[2][1],
+        time_stem=pillars[3][0],
+        time_branch=pillars[3][1],
+    )
@@ -0,0 +1,536 @@
+"""
+Exhaustive differential verification against a golden corpus
+
+The golden corpus holds the core fields of every chart class from 1900 to
+2100 (every solar date x time index 0-12 x gender), generated once from the
+JavaScript iztro:
+
+    $ npm install
+    $ python -m iztro_py.verify generate golden/ -j 8
+
+and every later build is checked against it in parallel (a few minutes on a
+multicore machine):
+
+    $ python -m iztro_py.verify check golden/ -j 8 -o report.json
+
+Core fields: soul and body palace branches, five elements class, and for each
+major and minor star its palace branch, brightness and mutagen.
+
+Corpus layout: manifest.json plus one lzma-compressed file per year
+(YYYY.bin.xz). A year file is the concatenation of fixed-width records in
+the order date, time index, gender ('男' then '女'), so records carry no keys:
+
+    byte 0      soul palace branch index (子 = 0 ... 亥 = 11)
+    byte 1      body palace branch index
+    byte 2      five elements class (2-6)
+    2 bytes     per star in STAR_NAMES order: palace branch index (255 if
+                absent), then brightness code << 3 | mutagen code
+                (codes: BRIGHTNESS_LEVELS / 1 + MUTAGEN_TYPES index, 0 = none)
+
+Records of charts the reference could not compute are all 0xFF and are
+reported as unverified. generate --reference python writes the same corpus
+from iztro-py itself, to pin current behaviour before a rewrite.
+"""
+
+import argparse
+import hashlib
+import json
+import lzma
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from iztro_py import __version__, astro
+from iztro_py.bench.parity import NodeIztro, node_worker
+from iztro_py.columnar import FIVE_ELEMENTS_CLASSES
+from iztro_py.data.brightness import BRIGHTNESS_LEVELS
+from iztro_py.data.constants import EARTHLY_BRANCHES, STAR_CODES, STAR_NAMES
+from iztro_py.data.heavenly_stems import MUTAGEN_TYPES
+from iztro_py.i18n import get_reverse_table
+
+# 语料格式版本；记录布局变化时递增
+CORPUS_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+RECORD_SIZE = 3 + 2 * len(STAR_NAMES)
+GENDERS = ("男", "女")
+LANGUAGE = "zh-CN"
+
+# 参考实现无法计算的星盘
+MISSING_RECORD = b"\xff" * RECORD_SIZE
+
+_ABSENT = 255
+# 未填写星曜的记录：各星曜均不在盘中
+_EMPTY_RECORD = bytes(3) + bytes((_ABSENT, 0)) * len(STAR_NAMES)
+_BRANCH_CODES = {name: i for i, name in enumerate(EARTHLY_BRANCHES)}
+_BRIGHTNESS_CODES = {level: i for i, level in enumerate(BRIGHTNESS_LEVELS) if level}
+_MUTAGEN_CODES = {mutagen: i + 1 for i, mutagen in enumerate(MUTAGEN_TYPES)}
+_FIVE_ELEMENTS_CODES = {name: i + 2 for i, name in enumerate(FIVE_ELEMENTS_CLASSES)}
+
+# 参考星盘在 node 中只保留核心字段：
+# [命宫地支, 身宫地支, 五行局, [[宫位地支, [[星名, 亮度, 四化], ...]], ...]]
+REFERENCE_TRANSFORM = """(chart) => [
+  chart.earthlyBranchOfSoulPalace,
+  chart.earthlyBranchOfBodyPalace,
+  chart.fiveElementsClass,
+  chart.palaces.map((p) => [
+    p.earthlyBranch,
+    p.majorStars.concat(p.minorStars).map((s) => [s.name, s.brightness || null, s.mutagen || null]),
+  ]),
+]"""
+
+
+def year_inputs(year: int) -> Iterator[Tuple[str, int, str]]:
+    """
+    按语料顺序列出一年中的全部星盘输入
+
+    Returns:
+        (solar_date, time_index, gender) 迭代器
+    """
+    day = date(year, 1, 1)
+    while day.year == year:
+        solar_date = f"{day.year}-{day.month}-{day.day}"
+        for time_index in range(13):
+            for gender in GENDERS:
+                yield solar_date, time_index, gender
+        day += timedelta(days=1)
+
+
+def _encode(
+    soul: int, body: int, five_elements: int, stars: Sequence[Tuple[int, int, int, int]]
+) -> bytes:
+    record = bytearray(_EMPTY_RECORD)
+    record[0], record[1], record[2] = soul, body, five_elements
+    for code, branch, brightness, mutagen in stars:
+        record[3 + 2 * code] = branch
+        record[4 + 2 * code] = brightness << 3 | mutagen
+    return bytes(record)
+
+
+def encode_chart(chart: Any) -> bytes:
+    """
+    把 iztro-py 星盘编码为语料记录
+
+    Args:
+        chart: FunctionalAstrolabe 对象
+
+    Returns:
+        RECORD_SIZE 字节的记录
+    """
+    stars = []
+    for palace in chart.palaces:
+        branch = _BRANCH_CODES[palace.earthly_branch]
+        for star in palace.major_stars.interned() + palace.minor_stars.interned():
+            stars.append(
+                (
+                    STAR_CODES[star.name],
+                    branch,
+                    _BRIGHTNESS_CODES.get(star.brightness, 0),
+                    _MUTAGEN_CODES.get(star.mutagen, 0),
+                )
+            )
+    return _encode(
+        _BRANCH_CODES[chart.earthly_branch_of_soul_palace],
+        _BRANCH_CODES[chart.earthly_branch_of_body_palace],
+        _FIVE_ELEMENTS_CODES[chart.five_elements_class],
+        stars,
+    )
+
+
+def encode_reference(value: Any) -> bytes:
+    """
+    把 node 端 REFERENCE_TRANSFORM 的输出（zh-CN）编码为语料记录
+
+    Args:
+        value: 参考星盘的核心字段，或 {'error': ...}
+
+    Returns:
+        RECORD_SIZE 字节的记录；出错的星盘为 MISSING_RECORD
+
+    Raises:
+        KeyError: 如果参考输出中有无法识别的名称
+    """
+    if isinstance(value, dict):
+        return MISSING_RECORD
+    table = get_reverse_table(LANGUAGE)
+    branches, star_names = table["earthlyBranch"], table["stars"]
+    soul, body, five_elements, palaces = value
+
+    stars = []
+    for palace_branch, palace_stars in palaces:
+        branch = _BRANCH_CODES[branches[palace_branch]]
+        for name, brightness, mutagen in palace_stars:
+            stars.append(
+                (
+                    STAR_CODES[star_names[name]],
+                    branch,
+                    _BRIGHTNESS_CODES.get(brightness, 0),
+                    _MUTAGEN_CODES.get(mutagen, 0),
+                )
+            )
+    return _encode(
+        _BRANCH_CODES[branches[soul]],
+        _BRANCH_CODES[branches[body]],
+        _FIVE_ELEMENTS_CODES[five_elements],
+        stars,
+    )
+
+
+def decode_record(record: bytes) -> Dict[str, Any]:
+    """
+    解码语料记录，用于报告差异
+
+    Returns:
+        {'soul', 'body', 'five_elements_class',
+         '<star>.palace', '<star>.brightness', '<star>.mutagen'}
+    """
+    fields: Dict[str, Any] = {
+        "soul": EARTHLY_BRANCHES[record[0]],
+        "body": EARTHLY_BRANCHES[record[1]],
+        "five_elements_class": FIVE_ELEMENTS_CLASSES[record[2] - 2],
+    }
+    for code, name in enumerate(STAR_NAMES):
+        branch, flags = record[3 + 2 * code], record[4 + 2 * code]
+        fields[f"{name}.palace"] = EARTHLY_BRANCHES[branch] if branch != _ABSENT else None
+        fields[f"{name}.brightness"] = BRIGHTNESS_LEVELS[flags >> 3]
+        fields[f"{name}.mutagen"] = MUTAGEN_TYPES[(flags & 7) - 1] if flags & 7 else None
+    return fields
+
+
+def _year_path(directory: str, year: int) -> str:
+    return os.path.join(directory, f"{year}.bin.xz")
+
+
+def _write_year(directory: str, year: int, records: Iterator[bytes]) -> Dict[str, Any]:
+    data = lzma.compress(b"".join(records), preset=9 | lzma.PRESET_EXTREME)
+    path = _year_path(directory, year)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+    os.replace(temp, path)
+    return _year_info(directory, year)
+
+
+def _year_info(directory: str, year: int) -> Dict[str, Any]:
+    with open(_year_path(directory, year), "rb") as f:
+        data = f.read()
+    records = len(lzma.decompress(data)) // RECORD_SIZE
+    return {"records": records, "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def _generate_python_year(directory: str, year: int) -> Dict[str, Any]:
+    def records() -> Iterator[bytes]:
+        for solar_date, time_index, gender in year_inputs(year):
+            try:
+                chart = astro.by_solar(solar_date, time_index, gender, True, LANGUAGE)
+            except ValueError:
+                yield MISSING_RECORD
+            else:
+                yield encode_chart(chart)
+
+    return _write_year(directory, year, records())
+
+
+def _generate_node_year(
+    directory: str, year: int, node: str, root: Optional[str], batch_size: int = 2000
+) -> Dict[str, Any]:
+    inputs = list(year_inputs(year))
+    encoded: List[bytes] = []
+    with NodeIztro(node, root, node_worker(REFERENCE_TRANSFORM)) as js:
+        for offset in range(0, len(inputs), batch_size):
+            _, charts = js.by_solar(inputs[offset : offset + batch_size], LANGUAGE)
+            encoded.extend(encode_reference(chart) for chart in charts)
+    return dict(_write_year(directory, year, iter(encoded)), iztro_js=js.version)
+
+
+def generate(
+    directory: str,
+    start_year: int = 1900,
+    end_year: int = 2100,
+    reference: str = "node",
+    workers: Optional[int] = None,
+    node: str = "node",
+    root: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    生成黄金语料（已存在的年份文件会被跳过，可以断点续跑）
+
+    Args:
+        directory: 语料目录
+        start_year: 起始年份
+        end_year: 结束年份（含）
+        reference: 'node'（JavaScript iztro）或 'python'（当前的 iztro-py）
+        workers: 并行数（node 进程或工作进程），默认 CPU 核数
+        node: node 可执行文件
+        root: 包含 node_modules/iztro 的目录，默认当前目录
+
+    Returns:
+        写入 manifest.json 的清单
+
+    Raises:
+        ValueError: 如果参数无效
+        RuntimeError: 如果 node iztro 不可用
+    """
+    if reference not in ("node", "python"):
+        raise ValueError(f"Unknown reference: {reference!r}")
+    if start_year > end_year:
+        raise ValueError("start_year must not be after end_year")
+    os.makedirs(directory, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    years = list(range(start_year, end_year + 1))
+    todo = [year for year in years if not os.path.exists(_year_path(directory, year))]
+
+    infos: Dict[int, Dict[str, Any]] = {}
+    if reference == "node":
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tasks = [
+                executor.submit(_generate_node_year, directory, year, node, root) for year in todo
+            ]
+            infos.update(zip(todo, (task.result() for task in tasks)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            infos.update(
+                zip(todo, executor.map(_generate_python_year, [directory] * len(todo), todo))
+            )
+    for year in years:
+        if year not in infos:
+            infos[year] = _year_info(directory, year)
+
+    versions = {info.pop("iztro_js") for info in infos.values() if "iztro_js" in info}
+    manifest = {
+        "format": CORPUS_FORMAT,
+        "record_size": RECORD_SIZE,
+        "stars": list(STAR_NAMES),
+        "language": LANGUAGE,
+        "fix_leap": True,
+        "reference": reference,
+        "reference_version": (",".join(sorted(versions)) if reference == "node" else __version__),
+        "start_year": start_year,
+        "end_year": end_year,
+        "years": {str(year): infos[year] for year in years},
+    }
+    with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def load_manifest(directory: str) -> Dict[str, Any]:
+    """
+    读取并校验语料清单
+
+    Raises:
+        ValueError: 如果语料格式与当前版本不兼容
+    """
+    with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if (
+        manifest.get("format") != CORPUS_FORMAT
+        or manifest.get("record_size") != RECORD_SIZE
+        or manifest.get("stars") != list(STAR_NAMES)
+    ):
+        raise ValueError(f"Incompatible golden corpus in {directory}")
+    return manifest
+
+
+def check_year(
+    directory: str, year: int, sha256: Optional[str] = None, max_examples: int = 5
+) -> Dict[str, Any]:
+    """
+    用当前的 iztro-py 校验一年的语料（在工作进程中运行）
+
+    Returns:
+        {'year', 'charts', 'mismatches', 'unverified', 'fields', 'examples'}
+
+    Raises:
+        ValueError: 如果年份文件的校验和或长度不符
+    """
+    with open(_year_path(directory, year), "rb") as f:
+        data = f.read()
+    if sha256 is not None and hashlib.sha256(data).hexdigest() != sha256:
+        raise ValueError(f"Checksum mismatch for {year}")
+    golden = lzma.decompress(data)
+    inputs = list(year_inputs(year))
+    if len(golden) != len(inputs) * RECORD_SIZE:
+        raise ValueError(f"Unexpected record count for {year}")
+
+    result: Dict[str, Any] = {
+        "year": year,
+        "charts": len(inputs),
+        "mismatches": 0,
+        "unverified": 0,
+        "fields": {},
+        "examples": [],
+    }
+    fields: Dict[str, int] = result["fields"]
+    view = memoryview(golden)
+    for i, (solar_date, time_index, gender) in enumerate(inputs):
+        expected = view[i * RECORD_SIZE : (i + 1) * RECORD_SIZE]
+        if expected == MISSING_RECORD:
+            result["unverified"] += 1
+            continue
+        try:
+            actual = encode_chart(astro.by_solar(solar_date, time_index, gender, True, LANGUAGE))
+        except ValueError:
+            actual = MISSING_RECORD
+        if actual == expected:
+            continue
+
+        result["mismatches"] += 1
+        expected_fields = decode_record(bytes(expected))
+        actual_fields = decode_record(actual) if actual != MISSING_RECORD else {}
+        differences = [
+            name for name, value in expected_fields.items() if actual_fields.get(name) != value
+        ]
+        for name in differences:
+            fields[name] = fields.get(name, 0) + 1
+        if len(result["examples"]) < max_examples:
+            result["examples"].append(
+                {
+                    "input": [solar_date, time_index, gender],
+                    "fields": {
+                        name: {"golden": expected_fields[name], "py": actual_fields.get(name)}
+                        for name in differences
+                    },
+                }
+            )
+    return result
+
+
+def check(
+    directory: str,
+    years: Optional[Sequence[int]] = None,
+    workers: Optional[int] = None,
+    max_examples: int = 5,
+) -> Dict[str, Any]:
+    """
+    并行校验语料中的全部（或指定）年份
+
+    Args:
+        directory: 语料目录
+        years: 要校验的年份，默认语料中的全部年份
+        workers: 工作进程数，默认 CPU 核数
+        max_examples: 每年保留的差异示例数
+
+    Returns:
+        {'charts', 'mismatches', 'unverified', 'fields', 'examples', 'years'}
+
+    Raises:
+        ValueError: 如果语料不兼容、年份不在语料中或文件损坏
+    """
+    manifest = load_manifest(directory)
+    available = manifest["years"]
+    selected = list(years) if years is not None else [int(year) for year in available]
+    missing = [year for year in selected if str(year) not in available]
+    if missing:
+        raise ValueError(f"Years not in corpus: {', '.join(map(str, missing))}")
+
+    report: Dict[str, Any] = {
+        "iztro_py": __version__,
+        "reference": manifest["reference"],
+        "reference_version": manifest["reference_version"],
+        "charts": 0,
+        "mismatches": 0,
+        "unverified": 0,
+        "fields": {},
+        "examples": [],
+        "years": {},
+    }
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        results = executor.map(
+            check_year,
+            [directory] * len(selected),
+            selected,
+            [available[str(year)]["sha256"] for year in selected],
+            [max_examples] * len(selected),
+        )
+        for result in results:
+            for key in ("charts", "mismatches", "unverified"):
+                report[key] += result[key]
+            for name, count in result["fields"].items():
+                report["fields"][name] = report["fields"].get(name, 0) + count
+            report["examples"].extend(result["examples"])
+            report["years"][str(result["year"])] = result["mismatches"]
+    report["fields"] = dict(sorted(report["fields"].items(), key=lambda item: -item[1]))
+    return report
+
+
+def _years(value: str) -> List[int]:
+    start, _, end = value.partition("-")
+    try:
+        return list(range(int(start), int(end or start) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid years {value!r}, expected Y or Y1-Y2") from None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m iztro_py.verify",
+        description="Verify every chart class from 1900 to 2100 against a golden corpus.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+
+    generate_parser = commands.add_parser("generate", help="write the golden corpus")
+    generate_parser.add_argument("directory")
+    generate_parser.add_argument("--years", type=_years, default=_years("1900-2100"))
+    generate_parser.add_argument("--reference", choices=["node", "python"], default="node")
+    generate_parser.add_argument("-j", "--workers", type=int)
+    generate_parser.add_argument("--node", default="node", help="node executable")
+    generate_parser.add_argument("--root", help="directory containing node_modules/iztro")
+
+    check_parser = commands.add_parser("check", help="check iztro-py against the corpus")
+    check_parser.add_argument("directory")
+    check_parser.add_argument("--years", type=_years, help="Y or Y1-Y2 (default: all)")
+    check_parser.add_argument("-j", "--workers", type=int)
+    check_parser.add_argument("--examples", type=int, default=5, help="examples per year")
+    check_parser.add_argument("-o", "--output", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "generate":
+            manifest = generate(
+                args.directory,
+                args.years[0],
+                args.years[-1],
+                args.reference,
+                args.workers,
+                args.node,
+                args.root,
+            )
+            total = sum(info["bytes"] for info in manifest["years"].values())
+            print(f"{len(manifest['years'])} years, {total} bytes", file=sys.stderr)
+            return 0
+        report = check(args.directory, args.years, args.workers, args.examples)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"verify: {e}", file=sys.stderr)
+        return 2
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if report["mismatches"] else 0
+
+
+__all__ = [
+    "CORPUS_FORMAT",
+    "RECORD_SIZE",
+    "MISSING_RECORD",
+    "REFERENCE_TRANSFORM",
+    "year_inputs",
+    "encode_chart",
+    "encode_reference",
+    "decode_record",
+    "generate",
+    "load_manifest",
+    "check_year",
+    "check",
+    "main",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Asyncio API tests
+"""
+
+import asyncio
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from iztro_py import aio, astro, instrumentation
+
+
+class TestAio:
+    """Test iztro_py.aio"""
+
+    def test_matches_sync_api(self):
+        async def main():
+            chart = await aio.by_solar("2000-8-16", 6, "男")
+            lunar_chart = await aio.by_lunar("2000-7-17", 6, "男")
+            horoscope = await aio.horoscope(chart, "2024-1-1", 6)
+            return chart, lunar_chart, horoscope
+
+        chart, lunar_chart, horoscope = asyncio.run(main())
+        expected = astro.by_solar("2000-8-16", 6, "男")
+
+        assert chart.to_iztro_dict() == expected.to_iztro_dict()
+        assert lunar_chart.to_iztro_dict() == expected.to_iztro_dict()
+        assert horoscope == expected.horoscope("2024-1-1", 6)
+
+    def test_coalesces_identical_requests(self):
+        runner = aio.AioRunner(max_workers=2)
+
+        async def main():
+            charts = await asyncio.gather(
+                runner.by_solar("2000-8-16", 6, "男"),
+                runner.by_solar("2000-8-16", 6, "男"),
+                runner.by_solar("2000-8-16", 7, "男"),
+                runner.by_solar("2000-08-16", 6, "男"),
+            )
+            horoscopes = await asyncio.gather(
+                runner.horoscope(charts[0], "2024-1-1", 6),
+                runner.horoscope(charts[1], "2024-1-1", 6),
+            )
+            return charts, horoscopes
+
+        try:
+            with instrumentation.record() as recorder:
+                charts, horoscopes = asyncio.run(main())
+        finally:
+            runner.shutdown()
+
+        assert charts[0] is charts[1]
+        assert charts[2] is not charts[0]
+        # 写法不同的日期不合并，每个调用方拿到的都是自己传入的日期
+        assert charts[3] is not charts[0]
+        assert charts[3].solar_date == "2000-08-16"
+        assert horoscopes[0] is horoscopes[1]
+        assert recorder.cache_hits[aio.COALESCE_CACHE] == 2
+        assert recorder.cache_misses[aio.COALESCE_CACHE] == 4
+
+    def test_backpressure(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work(i):
+            with lock:
+                running.append(i)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(i)
+            return i
+
+        executor = ThreadPoolExecutor(max_workers=8)
+        runner = aio.AioRunner(executor, max_pending=2)
+
+        async def main():
+            return await asyncio.gather(*(runner.run(i, work, i) for i in range(8)))
+
+        try:
+            assert asyncio.run(main()) == list(range(8))
+            runner.shutdown()
+            # 传入的执行器由调用方关闭
+            assert executor.submit(int).result() == 0
+        finally:
+            executor.shutdown()
+
+        assert max(peak) <= 2
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        runner = aio.AioRunner(max_workers=1)
+
+        async def main():
+            first = asyncio.ensure_future(runner.run("key", time.sleep, 0.05))
+            second = asyncio.ensure_future(runner.run("key", time.sleep, 0.05))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        try:
+            assert asyncio.run(main()) is None
+        finally:
+            runner.shutdown()
+
+    def test_process_executor(self):
+        runner = aio.AioRunner(process=True, max_workers=1)
+
+        async def main():
+            chart = await runner.by_solar("2000-8-16", 6, "女", language="en-US")
+            return chart, await runner.horoscope(chart, "2024-1-1", 6)
+
+        try:
+            chart, horoscope = asyncio.run(main())
+        finally:
+            runner.shutdown()
+
+        expected = astro.by_solar("2000-8-16", 6, "女", language="en-US")
+        assert chart.to_iztro_dict() == expected.to_iztro_dict()
+        assert horoscope == expected.horoscope("2024-1-1", 6)
+
+    def test_chart_fingerprint(self):
+        chart = astro.by_solar("2000-8-16", 6, "男")
+
+        assert aio.chart_fingerprint(chart) == aio.chart_fingerprint(
+            astro.by_solar("2000-08-16", 6, "男")
+        )
+        assert aio.chart_fingerprint(chart) != aio.chart_fingerprint(
+            astro.by_solar("2000-8-16", 6, "男", language="en-US")
+        )
+        assert aio.chart_fingerprint(chart) != aio.chart_fingerprint(
+            astro.by_solar("2000-8-16", 0, "男")
+        )
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            aio.AioRunner(max_pending=0)
+
+    def test_pending_without_running_loop(self):
+        runner = aio.AioRunner(max_workers=1)
+
+        async def main():
+            task = asyncio.ensure_future(runner.run("key", time.sleep, 0.05))
+            await asyncio.sleep(0)
+            inside = runner.pending()
+            await task
+            return inside, asyncio.get_running_loop()
+
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", DeprecationWarning)
+                inside, loop = asyncio.run(main())
+                assert runner.pending() == 0
+                assert runner.pending(loop) == 0
+            assert inside == 1
+        finally:
+            runner.shutdown()
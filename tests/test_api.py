@@ -210,6 +210,88 @@ def test_complete_workflow():
     print("✓ 完整工作流测试通过\n")
 
 
+def test_by_solar_fields():
+    """测试只计算部分字段的 by_solar_fields"""
+    import pytest
+    from iztro_py import instrumentation
+    from iztro_py.astro.astro import CHART_FIELDS, PALACE_FIELDS
+
+    # 与完整星盘逐字段一致（含晚子时与闰月）
+    for solar_date, time_index, gender in [
+        ("2000-8-16", 6, "男"),
+        ("2023-3-22", 12, "女"),
+        ("1984-1-31", 0, "男"),
+        ("2020-5-30", 3, "女"),
+    ]:
+        chart = astro.by_solar(solar_date, time_index, gender)
+        fields = astro.by_solar_fields(solar_date, time_index, gender, CHART_FIELDS)
+        assert list(fields) == list(CHART_FIELDS)
+        for field in CHART_FIELDS:
+            if field != "palaces":
+                assert fields[field] == getattr(chart, field), field
+        for palace, expected in zip(fields["palaces"], chart.palaces):
+            for field in PALACE_FIELDS:
+                actual = palace[field]
+                if field.endswith("_stars"):
+                    actual = [(s.name, s.brightness, s.mutagen) for s in actual]
+                    expected_value = [
+                        (s.name, s.brightness, s.mutagen) for s in getattr(expected, field)
+                    ]
+                else:
+                    expected_value = getattr(expected, field)
+                assert actual == expected_value, field
+
+    # 只执行所需的阶段
+    with instrumentation.record() as recorder:
+        basic = astro.by_solar_fields("2000-8-16", 6, "男", ["soul", "five_elements_class"])
+        soul_palace = astro.by_solar_fields(
+            "2000-8-16", 6, "男", ["palaces.name", "palaces.major_stars"]
+        )["palaces"][0]
+    basic_stages, palace_stages = [
+        stages for name, stages in recorder.runs if name == "by_solar_fields"
+    ]
+    assert set(basic) == {"soul", "five_elements_class"}
+    assert "init_palaces" not in basic_stages
+    assert "major_stars" in palace_stages and "minor_stars" not in palace_stages
+    assert set(soul_palace) == {"name", "major_stars"}
+    assert [s.name for s in soul_palace["major_stars"]] == [
+        s.name for s in astro.by_solar("2000-8-16", 6, "男").palaces[0].major_stars
+    ]
+
+    with pytest.raises(ValueError):
+        astro.by_solar_fields("2000-8-16", 6, "男", ["palaces.nope"])
+    with pytest.raises(ValueError):
+        astro.by_solar_fields("2000-8-16", 6, "男", ["nope"])
+
+
+def test_by_solar_all_hours():
+    """测试一次排出全部 13 个时辰"""
+    from iztro_py.astro.astro import CHART_FIELDS
+
+    for solar_date, gender in [("2000-8-16", "男"), ("2023-3-21", "女"), ("1984-2-1", "男")]:
+        charts = astro.by_solar_all_hours(solar_date, gender)
+        assert len(charts) == 13
+        rows = astro.by_solar_all_hours(solar_date, gender, fields=CHART_FIELDS)
+        for time_index, (chart, row) in enumerate(zip(charts, rows)):
+            expected = astro.by_solar(solar_date, time_index, gender)
+            assert chart.to_iztro_dict() == expected.to_iztro_dict()
+            assert chart.raw_chinese_date == expected.raw_chinese_date
+            assert chart.raw_lunar_date == expected.raw_lunar_date
+
+            single = astro.by_solar_fields(solar_date, time_index, gender, CHART_FIELDS)
+            assert row.keys() == single.keys()
+            for field in CHART_FIELDS:
+                if field != "palaces":
+                    assert row[field] == single[field], field
+            assert [p["major_stars"] + p["minor_stars"] for p in row["palaces"]] == [
+                p["major_stars"] + p["minor_stars"] for p in single["palaces"]
+            ]
+
+    # 各时辰的星盘互不影响
+    charts[0].raw_lunar_date.day = 99
+    assert charts[1].raw_lunar_date.day != 99
+
+
 if __name__ == "__main__":
     try:
         test_by_solar_api()
@@ -218,6 +300,8 @@ if __name__ == "__main__":
         test_palace_query()
         test_by_lunar_api()
         test_complete_workflow()
+        test_by_solar_fields()
+        test_by_solar_all_hours()
 
         print("=" * 60)
         print("✓✓✓ 所有API测试通过！")
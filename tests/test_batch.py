@@ -0,0 +1,156 @@
+"""
+Batch processing and CLI tests
+"""
+
+import io
+import json
+
+import pytest
+from iztro_py import astro, batch, cli
+
+RECORDS = [
+    {"id": "a", "date": "2000-8-16", "hour": "12", "gender": "男"},
+    {"id": "b", "date": "2000-7-17", "time_index": 6, "gender": "m", "calendar": "lunar"},
+    {"id": "c", "date": "bad", "time_index": 6, "gender": "男"},
+    {"id": "d", "date": "2000-08-16", "time_index": 6, "gender": "male"},
+    {"_error": "Invalid JSON: x"},
+]
+
+
+class TestParseRecord:
+    """Test batch.parse_record()"""
+
+    def test_normalizes(self):
+        request = batch.parse_record({"date": "2000-08-16", "hour": 12, "gender": "F"})
+
+        assert request == ("solar", "2000-8-16", 6, "女", False, True, "zh-CN")
+        assert batch.parse_record(RECORDS[0]) == batch.parse_record(RECORDS[3])
+
+    @pytest.mark.parametrize(
+        "record",
+        [
+            {"date": "2000-8-16", "gender": "男"},
+            {"date": "2000-8-16", "hour": 24, "gender": "男"},
+            {"date": "2000-8-16", "time_index": 6, "gender": "x"},
+            {"date": "2000-8-16", "time_index": 6, "gender": "男", "calendar": "moon"},
+            {"date": "2000-8-16", "time_index": 6, "gender": "男", "fix_leap": "maybe"},
+        ],
+    )
+    def test_invalid(self, record):
+        with pytest.raises(ValueError):
+            batch.parse_record(record)
+
+
+class TestRunBatch:
+    """Test batch.run_batch()"""
+
+    def test_ordered_with_errors(self):
+        rows = list(batch.run_batch(RECORDS, workers=1, chunk_size=2, render="dict"))
+        expected = astro.by_solar("2000-8-16", 6, "男").to_iztro_dict()
+
+        assert [row.line for row in rows] == [1, 2, 3, 4, 5]
+        assert [row.id for row in rows] == ["a", "b", "c", "d", None]
+        assert rows[0].result == rows[1].result == rows[3].result == expected
+        assert rows[2].error.startswith("ValueError") and rows[2].result is None
+        assert rows[4].error == "Invalid JSON: x"
+
+    def test_dedupes_within_chunk(self):
+        rows = list(batch.run_batch([RECORDS[0], RECORDS[3]], workers=1, render="chart"))
+
+        assert rows[0].result is rows[1].result
+
+    def test_process_pool(self):
+        records = RECORDS * 5
+        rows = list(batch.run_batch(records, workers=2, chunk_size=3, max_pending=2))
+
+        assert [row.line for row in rows] == list(range(1, len(records) + 1))
+        assert [row.result for row in rows] == [
+            row.result for row in batch.run_batch(records, workers=1)
+        ]
+
+
+def _job_lines(directory):
+    lines = []
+    for path in sorted(directory.glob("shard-*/chunk-*.jsonl")):
+        lines += [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    return sorted(lines, key=lambda line: line["line"])
+
+
+class TestRunJob:
+    """Test batch.run_job()"""
+
+    def _source(self, tmp_path):
+        source = tmp_path / "births.jsonl"
+        records = [
+            {
+                "id": i,
+                "date": f"1990-{i % 12 + 1}-{i % 28 + 1}",
+                "time_index": i % 13,
+                "gender": "女",
+            }
+            for i in range(40)
+        ]
+        source.write_text("\n".join(json.dumps(r) for r in records) + "\nbad\n", encoding="utf-8")
+        return source
+
+    def test_shards_cover_input(self, tmp_path):
+        source = self._source(tmp_path)
+        job = tmp_path / "job"
+        stats = [
+            batch.run_job(str(source), str(job), shard=(i, 3), workers=1, chunk_size=4)
+            for i in range(3)
+        ]
+
+        assert sum(s["rows"] for s in stats) == 41
+        assert sum(s["errors"] for s in stats) == 1
+        assert [line["line"] for line in _job_lines(job)] == list(range(1, 42))
+        assert all(s["rows"] for s in stats)
+        checkpoint = json.loads((job / "shard-00001-of-00003" / "checkpoint.json").read_text())
+        assert checkpoint["complete"] and checkpoint["rows"] == stats[1]["rows"]
+
+    def test_resume_skips_completed_chunks(self, tmp_path):
+        source = self._source(tmp_path)
+        job = tmp_path / "job"
+        batch.run_job(str(source), str(job), workers=1, chunk_size=10)
+        expected = _job_lines(job)
+        (job / "shard-00000-of-00001" / "chunk-00000002.jsonl").unlink()
+
+        stats = batch.run_job(str(source), str(job), workers=1, chunk_size=10)
+
+        assert (stats["chunks"], stats["skipped"], stats["rows"]) == (1, 4, 10)
+        assert _job_lines(job) == expected
+        with pytest.raises(ValueError):
+            batch.run_job(str(source), str(job), workers=1, chunk_size=5)
+
+    def test_shard_of_is_stable(self):
+        assert batch.shard_of(RECORDS[0], 7) == batch.shard_of(RECORDS[3], 7)
+        assert {batch.shard_of(r, 1) for r in RECORDS} == {0}
+
+
+class TestCli:
+    """Test iztro-py batch"""
+
+    def test_jsonl(self, tmp_path):
+        source = tmp_path / "births.csv"
+        source.write_text(
+            "id,date,hour,gender\nx,2000-8-16,12,男\ny,2000-2-30,12,女\n", encoding="utf-8"
+        )
+        output = tmp_path / "charts.jsonl"
+
+        assert cli.main(["batch", str(source), "-o", str(output), "-j", "1", "-q"]) == 0
+        lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+        assert lines[0]["id"] == "x"
+        assert lines[0]["chart"] == astro.by_solar("2000-8-16", 6, "男").to_iztro_dict()
+        assert lines[1]["line"] == 2 and "error" in lines[1]
+
+    def test_summary(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(
+            "sys.stdin", io.StringIO('{"date":"2000-8-16","hour":12,"gender":"女"}\n')
+        )
+
+        assert cli.main(["batch", "-", "--input-format", "jsonl", "-j", "1"]) == 0
+        out, err = capsys.readouterr()
+
+        assert json.loads(out)["line"] == 1
+        assert json.loads(err.splitlines()[-1])["rows"] == 1
@@ -0,0 +1,82 @@
+"""
+Benchmark suite tests
+
+Only checks that the suite runs and produces a well-formed report; the
+numbers themselves are not asserted.
+"""
+
+import json
+import threading
+
+import pytest
+from iztro_py.bench import parity, run_benchmarks
+from iztro_py.bench.__main__ import main
+
+
+class TestBenchmarks:
+    """Test iztro_py.bench"""
+
+    def test_report(self):
+        names = ["by_solar", "horoscope", "to_iztro_dict", "i18n_render"]
+        report = run_benchmarks(names=names, iterations=5, warmup=1)
+
+        assert {"by_solar", "horoscope", "to_iztro_dict", "i18n_render"} <= set(
+            report["benchmarks"]
+        )
+        for result in report["benchmarks"].values():
+            assert result["ops_per_sec"] > 0
+            assert result["p50_us"] <= result["p99_us"]
+            assert "peak_alloc_bytes_per_op" in result
+
+    def test_import_benchmark(self):
+        report = run_benchmarks(names=["import"], iterations=2, warmup=0)
+        result = report["benchmarks"]["import"]
+
+        assert result["iterations"] == 2
+        assert "peak_alloc_bytes_per_op" not in result
+
+    def test_threaded_benchmark(self):
+        before = threading.active_count()
+        report = run_benchmarks(names=["by_solar_threads_2"], iterations=2, warmup=1)
+
+        assert report["benchmarks"]["by_solar_threads_2"]["ops_per_sec"] > 0
+        # 测量结束后线程池已关闭
+        assert threading.active_count() == before
+        assert isinstance(report["gil_enabled"], bool)
+
+    def test_unknown_benchmark(self):
+        with pytest.raises(ValueError):
+            run_benchmarks(names=["missing"])
+
+    def test_cli_output(self, tmp_path):
+        output = tmp_path / "report.json"
+        main(["-b", "star_lookup", "-n", "5", "--no-allocations", "-o", str(output)])
+
+        result = json.loads(output.read_text(encoding="utf-8"))["benchmarks"]["star_lookup"]
+        assert result["iterations"] == 5
+        assert "peak_alloc_bytes_per_op" not in result
+
+
+class TestParity:
+    """Test iztro_py.bench.parity"""
+
+    def test_compare(self):
+        inputs = parity.random_inputs(3, seed=7)
+        _, (chart, *_) = parity.python_by_solar(inputs)
+        js_chart = json.loads(json.dumps(chart))
+        js_chart["rawDates"] = {}
+        js_chart["palaces"][2]["majorStars"][0]["brightness"] = "?"
+
+        assert inputs == parity.random_inputs(3, seed=7)
+        assert [path for path, _, _ in parity.compare(js_chart, chart)] == [
+            "palaces[2].majorStars[0].brightness"
+        ]
+
+    def test_against_node(self):
+        try:
+            report = parity.run_parity(count=50, batch_size=20)
+        except RuntimeError as e:
+            pytest.skip(str(e))
+
+        assert report["node_by_solar"]["charts_per_sec"] > 0
+        assert report["python_by_solar"]["charts_per_sec"] > 0
@@ -0,0 +1,215 @@
+"""
+Chart cache tests
+"""
+
+import os
+import pickle
+import struct
+import subprocess
+import sys
+
+import pytest
+import iztro_py
+from iztro_py import astro, cache, instrumentation
+
+
+class TestChartCache:
+    """Test iztro_py.cache.ChartCache"""
+
+    def test_memory_hits(self):
+        charts = cache.ChartCache()
+
+        chart = charts.by_solar("2000-8-16", 6, "男")
+        assert charts.by_solar("2000-08-16", 6, "男") is chart
+        assert charts.by_solar("2000-8-16", 6, "男", language="en-US") is not chart
+        assert chart.frozen
+        assert chart.to_iztro_dict() == astro.by_solar("2000-8-16", 6, "男").to_iztro_dict()
+
+        horoscope = charts.horoscope(chart, "2024-1-1", 6)
+        assert charts.horoscope(chart, "2024-01-01", 6) is horoscope
+        assert horoscope == chart.horoscope("2024-1-1", 6)
+
+    def test_horoscope_of_edited_chart(self):
+        charts = cache.ChartCache()
+        chart = charts.by_solar("2000-8-16", 6, "男")
+        horoscope = charts.horoscope(chart, "2024-1-1", 6)
+
+        # 未冻结的星盘不经过缓存
+        edited = chart.thaw()
+        for palace in edited.palaces:
+            palace.heavenly_stem = "jiaHeavenly"
+        assert edited.horoscope("2024-1-1", 6) != horoscope
+        assert charts.horoscope(edited, "2024-1-1", 6) == edited.horoscope("2024-1-1", 6)
+        assert charts.horoscope(chart.thaw(), "2024-1-1", 6) is not horoscope
+
+        # 修改后再冻结的星盘使用不同的缓存键
+        edited.freeze()
+        assert edited.content_digest() != chart.content_digest()
+        assert charts.horoscope(edited, "2024-1-1", 6) == edited.horoscope("2024-1-1", 6)
+        assert charts.horoscope(edited, "2024-1-1", 6) is not horoscope
+
+    def test_persistent_store(self, tmp_path):
+        path = str(tmp_path / "charts.sqlite3")
+        first = cache.ChartCache(path)
+        chart = first.by_lunar("2000-7-17", 6, "男")
+        first.horoscope(chart, "2024-1-1", 6)
+        first.close()
+
+        # 新的进程（或重启后的 worker）直接从持久化存储读取
+        second = cache.ChartCache(path)
+        with instrumentation.record() as recorder:
+            restored = second.by_lunar("2000-7-17", 6, "男")
+            horoscope = second.horoscope(restored, "2024-1-1", 6)
+        second.close()
+
+        assert restored == chart
+        assert restored.frozen
+        assert restored.star("ziweiMaj").palace().astrolabe() is restored
+        assert horoscope == chart.horoscope("2024-1-1", 6)
+        assert recorder.cache_hits[cache.STORE_CACHE] == 2
+        assert "by_solar" not in {pipeline for pipeline, _ in recorder.runs}
+
+    def test_dbm_store(self, tmp_path):
+        store = cache.DBMStore(str(tmp_path / "charts"))
+        charts = cache.ChartCache(store=store)
+        chart = charts.by_solar("2000-8-16", 6, "女")
+        charts.clear(memory_only=True)
+
+        assert charts.by_solar("2000-8-16", 6, "女") == chart
+        assert charts.stats()["store_entries"] == 1
+        charts.close()
+
+    def test_lru_eviction(self):
+        lru = cache.LRUCache(max_entries=3, max_bytes=100)
+        with instrumentation.record() as recorder:
+            for key in "abc":
+                lru.put(key, key, 10)
+            lru.get("a")
+            lru.put("d", "d", 10)
+            lru.put("e", "e", 81)
+
+        assert lru.get("b") is None
+        assert lru.get("c") is None
+        assert lru.get("a") is None
+        assert (lru.get("d"), lru.get("e")) == ("d", "e")
+        assert lru.nbytes == 91
+        assert recorder.cache_evictions[cache.MEMORY_CACHE] == 3
+
+    def test_versioned_keys(self):
+        key = cache.request_key("by_solar", (2000, 8, 16), 6, "男", True, "zh-CN")
+        assert (
+            key == f"{cache.CACHE_FORMAT}/{iztro_py.__version__}/by_solar/2000-8-16/6/男/True/zh-CN"
+        )
+
+    def test_frozen_chart_pickles(self):
+        chart = astro.by_solar("2000-8-16", 6, "男").freeze()
+        restored = pickle.loads(pickle.dumps(chart))
+
+        assert restored == chart
+        assert hash(restored) == hash(chart)
+        assert restored.raw_lunar_date.model_config.get("frozen")
+        with pytest.raises(TypeError):
+            restored.palaces.append(None)
+
+
+@pytest.fixture
+def shared_store(tmp_path):
+    name = f"iztro_test_{os.getpid()}"
+    store = cache.SharedMemoryStore(
+        name, slots=64, slot_size=4096, lock_path=str(tmp_path / "shm.lock")
+    )
+    yield store
+    store.unlink()
+
+
+class TestSharedMemoryStore:
+    """Test iztro_py.cache.SharedMemoryStore"""
+
+    def test_set_get(self, shared_store):
+        shared_store.set("a", b"alpha")
+        shared_store.set("a", b"alpha2")
+        shared_store.set("too-big", b"x" * 4096)
+
+        assert shared_store.get("a") == b"alpha2"
+        assert shared_store.get("missing") is None
+        assert shared_store.get("too-big") is None
+        assert len(shared_store) == 1
+
+        shared_store.clear()
+        assert shared_store.get("a") is None
+
+    def test_slot_being_written_reads_as_miss(self, shared_store):
+        shared_store.set("a", b"alpha")
+        offset = next(
+            offset
+            for offset in shared_store._offsets(cache._key_digest("a"))
+            if shared_store._read(offset, cache._key_digest("a"))
+        )
+        seq = struct.unpack_from("<I", shared_store._buf, offset)[0]
+        struct.pack_into("<I", shared_store._buf, offset, seq + 1)
+
+        assert shared_store.get("a") is None
+
+    def test_shared_between_processes(self, shared_store, tmp_path):
+        charts = cache.ChartCache(store=shared_store)
+        chart = charts.by_solar("2000-8-16", 6, "男")
+        charts.horoscope(chart, "2024-1-1", 6)
+
+        code = (
+            "from iztro_py import cache, instrumentation\n"
+            f"store = cache.SharedMemoryStore({shared_store.name!r}, "
+            f"secret=bytes.fromhex({shared_store.secret.hex()!r}), "
+            f"lock_path={str(tmp_path / 'shm.lock')!r})\n"
+            "charts = cache.ChartCache(store=store)\n"
+            "with instrumentation.record() as recorder:\n"
+            "    chart = charts.by_solar('2000-08-16', 6, '男')\n"
+            "    charts.horoscope(chart, '2024-1-1', 6)\n"
+            "store.close()\n"
+            "print(recorder.cache_hits.get(cache.STORE_CACHE), chart.soul)\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout.split()
+
+        assert output == ["2", chart.soul]
+        assert shared_store.get(
+            cache.request_key("by_solar", (2000, 8, 16), 6, "男", True, "zh-CN")
+        )
+
+    def test_values_are_signed(self, shared_store, tmp_path):
+        shared_store.set("a", b"alpha")
+        with pytest.raises(ValueError):
+            cache.SharedMemoryStore(shared_store.name, lock_path=str(tmp_path / "shm.lock"))
+
+        other = cache.SharedMemoryStore(
+            shared_store.name, secret=b"wrong", lock_path=str(tmp_path / "shm.lock")
+        )
+        try:
+            # 其他密钥写入的值不会被读取（pickle 解码之前即被拒绝）
+            assert other.get("a") is None
+            other.set("b", b"beta")
+            assert shared_store.get("b") is None
+        finally:
+            other.close()
+
+        # 篡改数据后校验失败
+        offset = shared_store._offsets(cache._key_digest("a"))[0]
+        data_offset = offset + shared_store._SLOT.size + shared_store._MAC_SIZE
+        shared_store._buf[data_offset] ^= 0xFF
+        assert shared_store.get("a") is None
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+    def test_rejects_accessible_segment(self, shared_store, tmp_path):
+        os.fchmod(shared_store._shm._fd, 0o666)
+        with pytest.raises(PermissionError):
+            cache.SharedMemoryStore(
+                shared_store.name, secret=shared_store.secret, lock_path=str(tmp_path / "l")
+            )
+
+    def test_random_name(self, tmp_path):
+        store = cache.SharedMemoryStore(slots=4, lock_path=str(tmp_path / "l"))
+        try:
+            assert store.name.startswith("iztro_py_")
+            assert len(store.secret) == 32
+        finally:
+            store.unlink()
@@ -0,0 +1,95 @@
+"""
+Frozen chart tests
+
+Frozen charts are immutable and hashable so that one instance can be shared
+by every caller; thaw() returns an independent mutable copy.
+"""
+
+import threading
+
+import pytest
+from pydantic import ValidationError
+from iztro_py import astro
+
+
+@pytest.fixture
+def frozen_chart():
+    return astro.by_solar("2000-8-16", 6, "男").freeze()
+
+
+class TestFrozenChart:
+    """Test FunctionalAstrolabe.freeze()"""
+
+    def test_content_unchanged(self, frozen_chart):
+        chart = astro.by_solar("2000-8-16", 6, "男")
+
+        assert frozen_chart.frozen
+        assert frozen_chart == chart
+        assert frozen_chart.to_iztro_dict() == chart.to_iztro_dict()
+        assert frozen_chart.model_dump() == chart.model_dump()
+        assert frozen_chart.horoscope("2024-1-1") == chart.horoscope("2024-1-1")
+
+    def test_assignment_rejected(self, frozen_chart):
+        star = frozen_chart.star("ziweiMaj")
+
+        with pytest.raises(ValidationError):
+            frozen_chart.gender = "女"
+        with pytest.raises(ValidationError):
+            frozen_chart.palaces[0].name = "spousePalace"
+        with pytest.raises(ValidationError):
+            star.mutagen = "禄"
+        with pytest.raises(ValidationError):
+            frozen_chart.raw_lunar_date.year = 1999
+        with pytest.raises(ValidationError):
+            frozen_chart.set_language("en-US")
+
+    def test_lists_read_only(self, frozen_chart):
+        with pytest.raises(TypeError):
+            frozen_chart.palaces.append(frozen_chart.palaces[0])
+        with pytest.raises(TypeError):
+            frozen_chart.palaces[0].minor_stars.clear()
+        with pytest.raises(TypeError):
+            frozen_chart.palaces[1] = frozen_chart.palaces[0]
+
+    def test_hashable(self, frozen_chart):
+        same = astro.by_solar("2000-8-16", 6, "男").freeze()
+        other = astro.by_solar("2000-8-16", 7, "男").freeze()
+
+        assert hash(frozen_chart) == hash(same)
+        assert len({frozen_chart, same, other}) == 2
+        assert hash(frozen_chart.star("ziweiMaj")) == hash(same.star("ziweiMaj"))
+
+    def test_unfrozen_not_hashable(self):
+        with pytest.raises(TypeError):
+            hash(astro.by_solar("2000-8-16", 6, "男"))
+
+    def test_thaw_copy_on_write(self, frozen_chart):
+        editable = frozen_chart.thaw()
+
+        assert not editable.frozen
+        assert editable == frozen_chart
+
+        editable.palaces[0].major_stars.clear()
+        editable.raw_lunar_date.year = 1999
+        editable.gender = "女"
+
+        assert editable != frozen_chart
+        assert frozen_chart == astro.by_solar("2000-8-16", 6, "男")
+        assert editable.palaces[6].astrolabe() is editable
+
+    def test_shared_across_threads(self, frozen_chart):
+        expected = frozen_chart.to_iztro_dict()
+        results = []
+
+        def worker():
+            for _ in range(20):
+                results.append(frozen_chart.to_iztro_dict() == expected)
+                results.append(frozen_chart.star("ziweiMaj").palace().astrolabe() is frozen_chart)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(results) and len(results) == 160
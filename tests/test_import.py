@@ -0,0 +1,45 @@
+"""
+Import behaviour tests
+
+`import iztro_py` must stay cheap: heavy dependencies and locale data are
+loaded on first use.
+"""
+
+import subprocess
+import sys
+
+
+def _run(code):
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+class TestLazyImport:
+    """Test PEP 562 lazy loading of the iztro_py package"""
+
+    def test_import_is_lazy(self):
+        loaded = _run(
+            "import sys, iztro_py\n"
+            "heavy = ['pydantic', 'lunarcalendar', 'iztro_py.astro', 'iztro_py.i18n.locales.zh_CN']\n"
+            "print(','.join(m for m in heavy if m in sys.modules))"
+        )
+
+        assert loaded == ""
+
+    def test_attributes_load_on_access(self):
+        output = _run(
+            "import sys, iztro_py\n"
+            "chart = iztro_py.by_solar('2000-8-16', 6, '男')\n"
+            "print(chart.palace(0).translate_name(), 'lunarcalendar' in sys.modules)"
+        )
+
+        assert output == "命宫 True"
+
+    def test_public_names(self):
+        import iztro_py
+
+        assert set(iztro_py.__all__) <= set(dir(iztro_py))
+        assert iztro_py.astro.by_solar is iztro_py.by_solar
+        assert iztro_py.utils.solar_to_lunar(2000, 8, 16).day == 17
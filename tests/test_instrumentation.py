@@ -0,0 +1,105 @@
+"""
+Instrumentation tests
+"""
+
+import threading
+
+from iztro_py import astro, instrumentation
+
+
+def _runs(recorder, pipeline="by_solar"):
+    return [stages for name, stages in recorder.runs if name == pipeline]
+
+
+class TestInstrumentation:
+    """Test iztro_py.instrumentation"""
+
+    def test_disabled_by_default(self):
+        assert not instrumentation.is_enabled()
+        assert instrumentation.stage_timer("by_solar") is None
+
+    def test_record_stages(self):
+        with instrumentation.record() as recorder:
+            astro.by_solar("2000-8-16", 6, "男")
+            astro.by_lunar("2000-7-17", 6, "女")
+
+        assert not instrumentation.is_enabled()
+        assert len(_runs(recorder)) == 2
+        stages = _runs(recorder)[0]
+        assert tuple(stages) == instrumentation.BY_SOLAR_STAGES
+        assert all(seconds >= 0 for seconds in stages.values())
+
+        summary = recorder.summary()["by_solar"]
+        assert summary["major_stars"]["count"] == 2
+        assert summary["brightness"]["total"] >= summary["brightness"]["max"]
+
+    def test_cache_events(self):
+        with instrumentation.record() as recorder:
+            astro.by_solar("2000-8-16", 6, "男")
+            astro.by_solar("2000-8-16", 6, "男")
+
+        assert recorder.cache_hits.get("solar_to_lunar", 0) >= 2
+
+    def test_nested_recorders(self):
+        with instrumentation.record() as outer:
+            astro.by_solar("2000-8-16", 6, "男")
+            with instrumentation.record() as inner:
+                astro.by_solar("2000-8-17", 6, "男")
+
+        assert len(_runs(outer)) == 2
+        assert len(_runs(inner)) == 1
+
+    def test_recording_is_context_local(self):
+        counts = []
+
+        def other_thread():
+            astro.by_solar("2000-8-16", 6, "男")
+
+        with instrumentation.record() as recorder:
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join()
+            counts.append(len(recorder.runs))
+
+        assert counts == [0]
+
+    def test_other_pipelines(self):
+        with instrumentation.record() as recorder:
+            chart = astro.by_solar("2000-8-16", 6, "男", language="en-US")
+            chart.horoscope("2024-1-1")
+            chart.to_iztro_dict()
+
+        assert len(_runs(recorder, "horoscope")) == 1
+        assert len(_runs(recorder, "to_iztro_dict")) == 1
+        assert len(_runs(recorder, "solar_to_lunar")) >= 1
+
+    def test_all_hours_stages_are_summed(self):
+        with instrumentation.record() as recorder:
+            astro.by_solar_all_hours("2000-8-16", "男")
+
+        (stages,) = _runs(recorder, "by_solar_all_hours")
+        assert tuple(stages) == instrumentation.BY_SOLAR_STAGES
+        assert _runs(recorder) == []
+
+    def test_listeners(self):
+        stage_events = []
+        cache_events = []
+
+        def on_stages(pipeline, stages, labels):
+            if pipeline == "by_solar":
+                stage_events.append(set(stages))
+
+        def on_cache(cache, event):
+            cache_events.append((cache, event))
+
+        instrumentation.add_listener(on_stages)
+        instrumentation.add_cache_listener(on_cache)
+        try:
+            astro.by_solar("2000-8-16", 6, "男")
+        finally:
+            instrumentation.remove_listener(on_stages)
+            instrumentation.remove_cache_listener(on_cache)
+
+        assert stage_events == [set(instrumentation.BY_SOLAR_STAGES)]
+        assert ("solar_to_lunar", instrumentation.CACHE_HIT) in cache_events
+        assert not instrumentation.is_enabled()
@@ -0,0 +1,158 @@
+"""
+Memory behaviour tests
+"""
+
+import gc
+import weakref
+
+import pytest
+from iztro_py import astro
+from iztro_py.astro import FunctionalPalace, FunctionalStar
+
+
+@pytest.fixture
+def gc_disabled():
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+class TestChartLifetime:
+    """Test back-references between charts, palaces and stars"""
+
+    def test_back_references_while_alive(self):
+        chart = astro.by_solar("2000-8-16", 6, "男")
+        ziwei = chart.star("ziweiMaj")
+
+        assert ziwei.palace().astrolabe() is chart
+        assert ziwei.opposite_palace() is not None
+
+    def test_chained_calls(self, gc_disabled):
+        # 不保留星盘变量，单个表达式中的链式调用也可用
+        surpalaces = astro.by_solar("2000-8-16", 6, "男").star("ziweiMaj").surrounded_palaces()
+        assert surpalaces is not None
+        assert surpalaces.target.astrolabe().solar_date == "2000-8-16"
+
+        chart = astro.by_solar("2000-8-16", 6, "男").palace("命宫").astrolabe()
+        assert chart is not None and chart.gender == "男"
+
+        ziwei = astro.by_solar("2000-8-16", 6, "男").star("ziweiMaj")
+        assert ziwei.palace().astrolabe().star("ziweiMaj") == ziwei
+        assert ziwei.opposite_palace().index == (ziwei.palace().index + 6) % 12
+
+    def test_list_element_chains(self, gc_disabled):
+        # 从列表元素出发与从 star()/palace() 出发的行为相同
+        chart = astro.by_solar("2000-8-16", 2, "女")
+        soul = chart.palace("命宫")
+        expected = soul.major_stars[0].name
+
+        star = astro.by_solar("2000-8-16", 2, "女").palace("命宫").major_stars[0]
+        assert star.name == expected
+        assert star.palace().name == soul.name
+        assert star.palace().astrolabe().solar_date == "2000-8-16"
+
+        palace = astro.by_solar("2000-8-16", 2, "女").palaces[0]
+        assert palace.astrolabe().palace(0) is palace
+        assert astro.by_solar("2000-8-16", 2, "女").palaces[0].astrolabe() is not None
+        assert astro.by_solar("2000-8-16", 2, "女").empty_palaces()[0].astrolabe() is not None
+
+    def test_returns_chart_objects(self):
+        chart = astro.by_solar("2000-8-16", 6, "男")
+
+        assert type(chart.star("ziweiMaj")) is FunctionalStar
+        assert type(chart.palace(0)) is FunctionalPalace
+        assert chart.palace(0) is chart.palaces[0]
+        assert chart.get_soul_palace() is chart.palaces[0]
+
+    def test_chart_released(self):
+        chart = astro.by_solar("2000-8-16", 6, "男")
+        chart_ref = weakref.ref(chart)
+        star_ref = weakref.ref(chart.star("ziweiMaj"))
+
+        del chart
+        gc.collect()
+
+        assert chart_ref() is None
+        assert star_ref() is None
+
+
+class TestStarPool:
+    """Test iztro_py.star.pool"""
+
+    def _place(self, lunar_month, time_index, year_stem, year_branch):
+        from iztro_py.astro.palace import get_soul_and_body, initialize_palaces
+        from iztro_py.data.brightness import apply_brightness_to_palaces
+        from iztro_py.star.major_star import place_major_stars
+        from iztro_py.star.minor_star import place_minor_stars
+        from iztro_py.star.mutagen import apply_mutagen_to_palaces
+
+        palaces = initialize_palaces(get_soul_and_body(lunar_month, time_index, year_stem))
+        place_major_stars(palaces, 4, 8)
+        place_minor_stars(palaces, lunar_month, time_index, year_stem, year_branch)
+        apply_mutagen_to_palaces(palaces, year_stem)
+        apply_brightness_to_palaces(palaces)
+        return {s.name: s for p in palaces for s in p["major_stars"] + p["minor_stars"]}
+
+    def test_charts_share_star_instances(self):
+        first = self._place(7, 6, "gengHeavenly", "chenEarthly")
+        second = self._place(3, 2, "gengHeavenly", "chenEarthly")
+
+        # 同一年干：四化相同；紫微位置相同：亮度相同
+        assert first["ziweiMaj"] is second["ziweiMaj"]
+        assert first["wuquMaj"] is second["wuquMaj"]
+        assert first["taiyangMaj"].mutagen == "禄"
+
+    def test_interned_stars_are_immutable(self):
+        from pydantic import ValidationError
+        from iztro_py.star.pool import intern_star, replace_star
+
+        star = intern_star("ziweiMaj", "major")
+        with pytest.raises(ValidationError):
+            star.mutagen = "禄"
+
+        changed = replace_star(star, mutagen="禄")
+        assert changed is intern_star("ziweiMaj", "major", mutagen="禄")
+        assert star.mutagen is None
+
+    def test_functional_stars_stay_per_chart(self):
+        first = astro.by_solar("2000-8-16", 6, "男")
+        second = astro.by_solar("2000-8-16", 6, "女")
+
+        assert first.star("ziweiMaj") is not second.star("ziweiMaj")
+        assert first.star("ziweiMaj") == second.star("ziweiMaj")
+        assert first.star("ziweiMaj").palace().astrolabe() is first
+
+    def test_functional_star_fields_set_per_instance(self):
+        chart = astro.by_solar("2000-8-16", 6, "男")
+        first = chart.star("ziweiMaj")
+        second = chart.star("tianfuMaj")
+
+        assert first.model_fields_set == {"name", "type", "scope", "brightness", "mutagen"}
+        assert first.model_fields_set is not second.model_fields_set
+
+    def test_palaces_hold_pooled_stars(self):
+        from iztro_py.star.pool import InternedStar
+
+        first = astro.by_solar("2000-8-16", 6, "男")
+        second = astro.by_solar("2000-8-16", 6, "女")
+        stored = first.palace("命宫").major_stars.interned()
+
+        assert all(type(star) is InternedStar for star in stored)
+        assert stored == second.palace("命宫").major_stars.interned()
+        assert all(a is b for a, b in zip(stored, second.palace("命宫").major_stars.interned()))
+
+    def test_bound_star_edits_write_back(self):
+        from pydantic import ValidationError
+
+        chart = astro.by_solar("2000-8-16", 6, "男")
+        star = chart.star("ziweiMaj")
+        star.brightness = "陷"
+
+        assert chart.star("ziweiMaj").brightness == "陷"
+        assert star.palace() is chart.star("ziweiMaj").palace()
+        with pytest.raises(ValidationError):
+            star.mutagen = "未知"
+        assert chart.star("ziweiMaj").mutagen == star.mutagen
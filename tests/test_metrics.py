@@ -0,0 +1,81 @@
+"""
+Metrics tests
+"""
+
+import pytest
+from iztro_py import astro, instrumentation, metrics
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable()
+    try:
+        yield metrics
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+
+class TestMetrics:
+    """Test iztro_py.metrics"""
+
+    def test_disabled_by_default(self):
+        assert not metrics.is_enabled()
+        assert not instrumentation.is_enabled()
+
+    def test_counts(self, enabled_metrics):
+        chart = astro.by_solar("2000-8-16", 6, "男", language="en-US")
+        astro.by_solar("2000-8-16", 6, "男")
+        chart.horoscope("2024-1-1")
+        chart.to_iztro_dict()
+
+        assert metrics.CHARTS_BUILT.value() == 2
+        assert metrics.HOROSCOPES.value() == 1
+        assert metrics.RENDERS.value(language="en-US") == 1
+        assert metrics.CALENDAR_CONVERSIONS.value(direction="solar_to_lunar") >= 2
+        assert metrics.CACHE_HITS.value(cache="solar_to_lunar") >= 1
+
+        snapshot = metrics.snapshot()
+        build = snapshot["iztro_chart_build_seconds"]["samples"][0]
+        assert build["count"] == 2
+        assert build["buckets"]["+Inf"] == 2
+        stages = {s["labels"]["stage"] for s in snapshot["iztro_chart_stage_seconds"]["samples"]}
+        assert stages == set(instrumentation.BY_SOLAR_STAGES)
+
+    def test_batched_pipelines(self, enabled_metrics):
+        astro.by_solar("2000-8-16", 6, "男")
+        astro.by_solar_all_hours("2000-8-16", "男")
+        astro.by_solar_all_hours("2000-8-16", "男", fields=["soul"])
+        astro.by_solar_fields("2000-8-16", 6, "男", ["soul"])
+
+        assert metrics.CHARTS_BUILT.value() == 1 + 13 + 13 + 1
+        build = metrics.snapshot()["iztro_chart_build_seconds"]["samples"][0]
+        assert build["count"] == 28
+
+    def test_evictions(self, enabled_metrics):
+        instrumentation.record_cache_eviction("charts", 3)
+
+        assert metrics.CACHE_EVICTIONS.value(cache="charts") == 3
+
+    def test_prometheus_text(self, enabled_metrics):
+        astro.by_solar("2000-8-16", 6, "男")
+        text = metrics.to_prometheus()
+
+        assert "# TYPE iztro_charts_built_total counter" in text
+        assert "iztro_charts_built_total 1\n" in text
+        assert 'iztro_chart_build_seconds_bucket{le="+Inf"} 1' in text
+        assert "iztro_chart_build_seconds_count 1" in text
+        assert 'iztro_cache_hits_total{cache="solar_to_lunar"}' in text
+
+    def test_disable_keeps_data(self, enabled_metrics):
+        astro.by_solar("2000-8-16", 6, "男")
+        metrics.disable()
+        astro.by_solar("2000-8-16", 6, "男")
+
+        assert metrics.CHARTS_BUILT.value() == 1
+        assert not instrumentation.is_enabled()
+
+    def test_label_validation(self):
+        with pytest.raises(ValueError):
+            metrics.RENDERS.inc()
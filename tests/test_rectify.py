@@ -0,0 +1,68 @@
+"""
+Birth-time rectification tests
+"""
+
+import pytest
+from iztro_py import astro, rectify
+from iztro_py.data.constants import PALACES
+
+BIRTH = ("1990-5-17", "女")
+EVENTS = [
+    ("2008-9-1", "career"),
+    ("2015-10-1", "marriage"),
+    ("2017-2-28", "children"),
+    ("2019-3-2", "wealthPalace"),
+    ("2022-12-5", "疾厄宫"),
+]
+
+
+def _horoscope_hits(chart, event_date, category):
+    """用 horoscope() 逐个计算某事件被引动的项目"""
+    palace = rectify.event_palace(category)
+    horoscope = chart.horoscope(event_date)
+    hits = []
+    for name in ("decadal", "age", "yearly"):
+        if getattr(horoscope, name).index == palace:
+            hits.append(name)
+    for name in ("decadal", "yearly"):
+        for star_name in getattr(horoscope, name).mutagen:
+            star = chart.star(star_name)
+            if star is not None and star.palace().index == palace:
+                hits.append(f"{name}_mutagen")
+    return hits
+
+
+class TestRectify:
+    """Test iztro_py.rectify"""
+
+    def test_matches_horoscope(self):
+        for gender in ("男", "女"):
+            candidates = rectify.score_hours(BIRTH[0], gender, EVENTS)
+            assert [c.time_index for c in candidates] == list(range(13))
+            for candidate in candidates:
+                chart = astro.by_solar(BIRTH[0], candidate.time_index, gender)
+                expected = [_horoscope_hits(chart, *event) for event in EVENTS]
+                assert candidate.hits == expected
+                assert candidate.score == sum(
+                    rectify.ACTIVATION_WEIGHTS[hit] for hits in expected for hit in hits
+                )
+
+    def test_recovers_true_hour(self):
+        # 每年的事件都落在真实时辰（未时）星盘的流年宫位
+        chart = astro.by_solar(BIRTH[0], 7, BIRTH[1])
+        events = []
+        for year in range(2000, 2024):
+            event_date = f"{year}-6-1"
+            events.append((event_date, PALACES[chart.horoscope(event_date).yearly.index]))
+
+        ranked = rectify.rectify(*BIRTH, events)
+        assert ranked[0].time_index == 7
+        assert ranked[0].score > ranked[1].score
+        assert all(a.score >= b.score for a, b in zip(ranked, ranked[1:]))
+
+    def test_weights_and_errors(self):
+        zero = {name: 0.0 for name in rectify.ACTIVATION_WEIGHTS}
+        assert {c.score for c in rectify.rectify(*BIRTH, EVENTS, weights=zero)} == {0.0}
+
+        with pytest.raises(ValueError):
+            rectify.rectify(*BIRTH, [("2015-10-1", "lottery")])
@@ -0,0 +1,123 @@
+"""
+Warmup tests
+"""
+
+import builtins
+
+import pytest
+import iztro_py
+from iztro_py import astro, runtime
+from iztro_py.i18n import get_language, set_language
+from iztro_py.star.pool import pool_size
+
+
+class TestWarmup:
+    """Test iztro_py.warmup()"""
+
+    def test_default_steps(self):
+        timings = iztro_py.warmup(languages=["zh-CN", "en-US"])
+
+        assert list(timings) == ["imports", "locales"] + runtime.precompute_names(default_only=True)
+        assert "calendar" not in timings
+
+    def test_star_pool_complete(self):
+        iztro_py.warmup(languages=["zh-CN"], precompute=["star_pool"])
+        filled = pool_size()
+
+        for year in range(1960, 1990, 3):
+            for month in range(1, 13):
+                astro.by_solar(f"{year}-{month}-{month + 10}", (year + month) % 13, "女")
+
+        assert pool_size() == filled
+
+    def test_keeps_current_language(self):
+        set_language("ko-KR")
+        try:
+            iztro_py.warmup(languages=["en-US"], precompute=["charts"])
+            assert get_language() == "ko-KR"
+        finally:
+            set_language("zh-CN")
+
+    def test_register_precompute(self):
+        calls = []
+
+        @runtime.register_precompute("test_table", default=False)
+        def fill(languages):
+            calls.append(languages)
+
+        try:
+            assert "test_table" not in runtime.precompute_names(default_only=True)
+            iztro_py.warmup(languages=["vi-VN"], precompute=["test_table"])
+            assert calls == [["vi-VN"]]
+        finally:
+            runtime._PRECOMPUTE.pop("test_table")
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            iztro_py.warmup(precompute=["missing"])
+        with pytest.raises(ValueError):
+            iztro_py.warmup(languages=["xx-XX"], precompute=False)
+
+
+class TestFreezeForFork:
+    """Test iztro_py.freeze_for_fork()"""
+
+    def test_freezes_live_objects(self):
+        import gc
+
+        try:
+            assert iztro_py.freeze_for_fork() == gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
+
+
+class TestHotPath:
+    """After warmup, chart computation neither imports nor writes global state"""
+
+    def test_no_imports_or_language_writes(self, monkeypatch):
+        iztro_py.warmup(languages=["zh-CN", "en-US"], precompute=["charts"])
+        imports = []
+        original_import = builtins.__import__
+
+        def tracking_import(name, *args, **kwargs):
+            imports.append(name)
+            return original_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", tracking_import)
+        chart = astro.by_solar("1990-3-21", 4, "男", language="en-US")
+        chart.horoscope("2024-1-1", 6)
+        chart.to_iztro_dict()
+        astro.by_lunar("1990-2-25", 4, "女")
+        monkeypatch.undo()
+
+        assert imports == []
+        assert get_language() == "zh-CN"
+
+    def test_render_uses_chart_language(self):
+        chart = astro.by_solar("2000-8-16", 6, "男", language="en-US")
+        set_language("ja-JP")
+        try:
+            rendered = chart.to_iztro_dict()
+        finally:
+            set_language("zh-CN")
+
+        assert rendered == astro.by_solar("2000-8-16", 6, "男", language="en-US").to_iztro_dict()
+        assert rendered["palaces"][0]["name"] == chart.palaces[0].translate_name("en-US")
+
+    def test_translate_defaults_to_chart_language(self):
+        chart = astro.by_solar("2000-8-16", 6, "男", language="en-US")
+        soul = chart.palace("命宫")
+        ziwei = chart.star("ziweiMaj")
+
+        assert get_language() == "zh-CN"
+        assert astro.by_solar("2000-8-16", 6, "男", language="en-US").star(
+            "ziweiMaj"
+        ).translate_name() == ziwei.translate_name("en-US")
+        assert ziwei.translate_name() == "Ziwei"
+        assert soul.translate_name() == "Soul"
+        assert soul.translate_heavenly_stem() == soul.translate_heavenly_stem("en-US")
+        assert soul.translate_earthly_branch() == soul.translate_earthly_branch("en-US")
+        assert ziwei.translate_brightness() == ziwei.translate_brightness("en-US")
+        assert ziwei.translate_brightness() != ziwei.translate_brightness("zh-CN")
+        # 显式指定的语言优先
+        assert ziwei.translate_name("zh-CN") == "紫微"
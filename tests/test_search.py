@@ -0,0 +1,77 @@
+"""
+Chart search tests
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from iztro_py import astro, search
+
+START, END = "2000-1-20", "2000-3-10"
+
+
+def _brute_force(check):
+    """逐日逐时辰排盘，返回满足 check(chart) 的 (日期, 时辰)"""
+    found = []
+    day, end = date(2000, 1, 20), date(2000, 3, 10)
+    while day <= end:
+        solar_date = f"{day.year}-{day.month}-{day.day}"
+        for time_index in range(13):
+            if check(astro.by_solar(solar_date, time_index, "男")):
+                found.append((solar_date, time_index))
+        day += timedelta(days=1)
+    return found
+
+
+class TestSearch:
+    """Test iztro_py.search"""
+
+    def test_matches_by_solar(self):
+        def in_soul(chart):
+            return chart.star("ziweiMaj").palace().index == 0
+
+        def tianji(chart):
+            star = chart.star("tianjiMaj")
+            return star.palace().name == "surfacePalace" and star.brightness in ("庙", "旺")
+
+        def taiyang(chart):
+            return (
+                chart.star("taiyangMaj").mutagen == "禄"
+                and chart.star("wenquMin").palace().name == "careerPalace"
+            )
+
+        career = search.star_in("文曲", "官禄宫")
+
+        cases = [
+            (search.star_in("紫微", "命宫"), in_soul),
+            (search.star_in("tianjiMaj", "迁移宫", brightness=("庙", "旺")), tianji),
+            (lambda c: c.mutagen_of("taiyangMaj") == "禄" and career(c), taiyang),
+        ]
+        for predicate, check in cases:
+            expected = _brute_force(check)
+            assert expected
+            assert list(search.search(predicate, START, END)) == expected
+
+    def test_late_zi_hour(self):
+        # 晚子时按次日的农历日起紫微
+        results = list(search.search(search.star_in("紫微", 0), "1990-1-1", "1990-12-31"))
+        late = [(d, t) for d, t in results if t == 12]
+        assert late
+        for solar_date, time_index in late[:20]:
+            chart = astro.by_solar(solar_date, time_index, "女")
+            assert chart.star("ziweiMaj").palace().index == 0
+
+    def test_chart_classes(self):
+        assert sum(1 for _ in search.chart_classes()) == 60 * 12 * 30 * 13
+        classes = list(search.chart_classes([16]))
+        assert len(classes) == 12 * 30 * 13
+        assert {(c.year_stem, c.year_branch) for c in classes} == {("gengHeavenly", "chenEarthly")}
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            search.star_in("不存在", "命宫")
+        with pytest.raises(ValueError):
+            search.star_in("紫微", "不存在")
+        with pytest.raises(ValueError):
+            list(search.search(search.star_in("紫微", 0), "2000-2-1", "2000-1-1"))
+        assert list(search.search(lambda c: False, START, END)) == []
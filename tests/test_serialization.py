@@ -0,0 +1,159 @@
+"""
+Serialization tests
+
+Round-trip tests for exporting and restoring astrolabes.
+"""
+
+import pytest
+from iztro_py import astro
+from iztro_py.astro import FunctionalAstrolabe
+from iztro_py.utils.calendar import (
+    format_chinese_date,
+    format_lunar_date,
+    parse_formatted_chinese_date,
+    parse_formatted_lunar_date,
+)
+
+
+class TestFromIztroDict:
+    """Test FunctionalAstrolabe.from_iztro_dict()"""
+
+    @pytest.mark.parametrize("language", ["zh-CN", "zh-TW", "en-US", "ja-JP", "ko-KR", "vi-VN"])
+    def test_round_trip(self, language):
+        chart = astro.by_solar("2000-8-16", 12, "女", language=language)
+        data = chart.to_iztro_dict()
+
+        restored = FunctionalAstrolabe.from_iztro_dict(data)
+
+        assert restored.to_iztro_dict() == data
+        assert restored.language == language
+
+    def test_functional_api(self):
+        chart = astro.by_solar("1989-10-17", 6, "男")
+        restored = FunctionalAstrolabe.from_iztro_dict(chart.to_iztro_dict())
+
+        ziwei = restored.star("ziweiMaj")
+        assert ziwei is not None
+        assert ziwei.palace().name == chart.star("ziweiMaj").palace().name
+        assert restored.get_soul_palace().earthly_branch == chart.get_soul_palace().earthly_branch
+        assert restored.surrounded_palaces(0) is not None
+
+    def test_horoscope_matches(self):
+        chart = astro.by_solar("1989-10-17", 6, "男")
+        restored = FunctionalAstrolabe.from_iztro_dict(chart.to_iztro_dict())
+
+        assert restored.raw_chinese_date == chart.raw_chinese_date
+        assert restored.horoscope("2024-6-1", 3) == chart.horoscope("2024-6-1", 3)
+
+    def test_explicit_language(self):
+        chart = astro.by_solar("2000-8-16", 6, "男", language="en-US")
+        restored = FunctionalAstrolabe.from_iztro_dict(chart.to_iztro_dict(), language="en-US")
+
+        assert restored.palace(0).name == "soulPalace"
+
+    def test_unknown_name(self):
+        data = astro.by_solar("2000-8-16", 6, "男").to_iztro_dict()
+        data["palaces"][0]["majorStars"][0]["name"] = "不存在"
+
+        with pytest.raises(ValueError):
+            FunctionalAstrolabe.from_iztro_dict(data, language="zh-CN")
+
+
+class TestFormattedDateParsing:
+    """Test parsing of formatted lunar/chinese date strings"""
+
+    def test_lunar_date(self):
+        chart = astro.by_solar("2023-4-1", 6, "男")
+        parsed = parse_formatted_lunar_date(chart.lunar_date)
+
+        assert parsed == chart.raw_lunar_date
+        assert format_lunar_date(parsed) == chart.lunar_date
+
+    def test_chinese_date(self):
+        chart = astro.by_solar("2000-8-16", 6, "男")
+        parsed = parse_formatted_chinese_date(chart.chinese_date)
+
+        assert parsed == chart.raw_chinese_date
+        assert format_chinese_date(parsed) == chart.chinese_date
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_formatted_lunar_date("2000-7-17")
+        with pytest.raises(ValueError):
+            parse_formatted_chinese_date("庚辰年")
+
+
+class TestColumnarExport:
+    """Test iztro_py.columnar"""
+
+    def _charts(self):
+        for day in range(1, 6):
+            for time_index in (0, 6, 12):
+                yield astro.by_solar(f"2000-8-{day}", time_index, "女")
+
+    def test_export_streams_chunks(self, tmp_path):
+        from iztro_py.columnar import export_columnar, read_schema
+
+        rows = export_columnar(self._charts(), str(tmp_path), chunk_size=4, arrow=False)
+        schema = read_schema(str(tmp_path))
+
+        assert rows == 15
+        assert schema["rows"] == 15
+        # 固定 128 字节头部 + 每行 1 字节
+        assert (tmp_path / "gender.npy").stat().st_size == 128 + 15
+        assert (tmp_path / "solar_year.npy").stat().st_size == 128 + 15 * 2
+
+    def test_accepts_iztro_dicts(self, tmp_path):
+        from iztro_py.columnar import export_columnar
+
+        dicts = (chart.to_iztro_dict() for chart in self._charts())
+        assert export_columnar(dicts, str(tmp_path), arrow=False) == 15
+
+    def test_load_with_numpy(self, tmp_path):
+        pytest.importorskip("numpy")
+        from iztro_py.columnar import export_columnar, load_columnar, read_schema
+
+        charts = list(self._charts())
+        export_columnar(charts, str(tmp_path), chunk_size=4, arrow=False)
+        columns = load_columnar(str(tmp_path))
+        categories = read_schema(str(tmp_path))["columns"]
+
+        for i, chart in enumerate(charts):
+            taiyin = chart.star("taiyinMaj")
+            assert columns["star_taiyinMaj_palace"][i] == taiyin.palace().index
+            mutagen_code = columns["star_taiyinMaj_mutagen"][i]
+            assert (
+                categories["star_taiyinMaj_mutagen"]["categories"][mutagen_code] == taiyin.mutagen
+            )
+            assert columns["time_index"][i] == [0, 6, 12][i % 3]
+
+    def test_arrow(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        from iztro_py.columnar import ARROW_FILE, export_columnar
+
+        charts = list(self._charts())
+        export_columnar(charts, str(tmp_path), chunk_size=4, arrow=True)
+        table = pa.ipc.open_file(str(tmp_path / ARROW_FILE)).read_all()
+
+        assert table.num_rows == 15
+        assert table.column("gender").to_pylist() == ["女"] * 15
+        assert (
+            table.column("star_ziweiMaj_mutagen").to_pylist()[0]
+            == charts[0].star("ziweiMaj").mutagen
+        )
+
+    def test_bad_value_keeps_columns_aligned(self, tmp_path):
+        from iztro_py.columnar import ColumnarWriter
+
+        charts = list(self._charts())[:2]
+        writer = ColumnarWriter(str(tmp_path), arrow=False)
+        writer.write(charts[0])
+        bad = charts[1].thaw()
+        bad.palaces[11].heavenly_stem = "未知"
+        with pytest.raises(ValueError):
+            writer.write(bad)
+        writer.write(charts[1])
+
+        assert len({len(buffer) for buffer in writer._buffers.values()}) == 1
+        writer.close()
+        assert writer.rows == 2
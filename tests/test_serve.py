@@ -0,0 +1,125 @@
+"""
+HTTP service tests
+"""
+
+import asyncio
+import http.client
+import json
+from urllib.parse import urlencode
+
+import pytest
+from iztro_py import astro, metrics, serve
+from iztro_py.aio import AioRunner
+
+CHART = {"date": "2000-8-16", "time_index": 6, "gender": "男"}
+
+
+def _exchange(port, requests):
+    """在同一个 keep-alive 连接上依次发送请求"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    responses = []
+    for method, path, body, headers in requests:
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        responses.append((response.status, dict(response.getheaders()), response.read()))
+    connection.close()
+    return responses
+
+
+def _run(requests, **service_options):
+    async def main():
+        runner = AioRunner(max_workers=2)
+        service = serve.ChartService(runner, **service_options)
+        server = await serve.start_server(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, _exchange, port, requests)
+        finally:
+            server.close()
+            await server.wait_closed()
+            runner.shutdown()
+
+    return asyncio.run(main())
+
+
+class TestServe:
+    """Test iztro_py.serve"""
+
+    def test_chart_etag_and_keep_alive(self):
+        path = "/chart?" + urlencode(CHART)
+        first, second = _run([("GET", path, None, {}), ("GET", path, None, {})])
+        etag = first[1]["ETag"]
+        (not_modified,) = _run([("GET", path, None, {"If-None-Match": etag})])
+
+        assert first[0] == second[0] == 200
+        assert json.loads(first[2]) == astro.by_solar("2000-8-16", 6, "男").to_iztro_dict()
+        assert second[1]["ETag"] == etag
+        assert not_modified[0] == 304 and not_modified[2] == b""
+
+    def test_horoscope(self):
+        query = dict(CHART, target_date="2024-1-1", target_time_index=6)
+        ((status, _, body),) = _run([("GET", "/horoscope?" + urlencode(query), None, {})])
+        expected = astro.by_solar("2000-8-16", 6, "男").horoscope("2024-1-1", 6)
+
+        assert status == 200
+        assert json.loads(body) == expected.model_dump(mode="json")
+
+    def test_batch_and_errors(self):
+        records = [CHART, {"date": "2000-2-30", "time_index": 6, "gender": "男"}, 3]
+        responses = _run(
+            [
+                ("POST", "/batch", json.dumps(records), {}),
+                ("GET", "/chart?date=2000-8-16", None, {}),
+                ("GET", "/missing", None, {}),
+                ("POST", "/batch", json.dumps(records), {}),
+            ],
+            max_batch=2,
+        )
+
+        assert [status for status, _, _ in responses] == [413, 400, 404, 413]
+
+        ((status, _, body),) = _run([("POST", "/batch", json.dumps(records), {})])
+        results = json.loads(body)["results"]
+        assert status == 200
+        assert results[0]["chart"]["solarDate"] == "2000-8-16"
+        assert "Invalid solar date" in results[1]["error"]
+        assert results[2] == {"error": "Record is not an object"}
+
+    def test_bounded_queue(self):
+        service = serve.ChartService(AioRunner(max_workers=1), max_queue=1)
+        service.waiting = 1
+
+        with pytest.raises(serve.HTTPError) as info:
+            asyncio.run(service.chart(CHART))
+        assert info.value.status == 503
+        service.runner.shutdown()
+
+    def test_unexpected_error(self, monkeypatch):
+        def broken(request):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(serve, "render_chart", broken)
+        ((status, headers, body),) = _run([("GET", "/chart?" + urlencode(CHART), None, {})])
+
+        assert status == 500
+        assert headers["Connection"] == "close"
+        assert json.loads(body) == {"error": "Internal server error"}
+
+    def test_worker_metrics(self):
+        runner = serve.make_runner(1, collect_metrics=True)
+        service = serve.ChartService(runner)
+        query = dict(CHART, target_date="2024-1-1", target_time_index=6)
+        metrics.reset()
+        metrics.enable()
+        try:
+            asyncio.run(service.chart(CHART))
+            asyncio.run(service.horoscope(query))
+
+            assert metrics.CHARTS_BUILT.value() == 2
+            assert metrics.HOROSCOPES.value() == 1
+            assert metrics.RENDERS.value(language="zh-CN") == 1
+        finally:
+            metrics.disable()
+            metrics.reset()
+            runner.executor.shutdown()
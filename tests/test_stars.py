@@ -190,6 +190,104 @@ def test_brightness_application():
     print("✓ 亮度应用测试通过\n")
 
 
+def test_compact_tables_match_configs():
+    """紧凑查找表与原始配置一致"""
+    from iztro_py.data.brightness import STAR_BRIGHTNESS, get_star_brightness
+    from iztro_py.data.constants import EARTHLY_BRANCHES, MAJOR_STARS, MINOR_STARS
+    from iztro_py.data.heavenly_stems import HEAVENLY_STEMS_CONFIG, get_mutagen_type
+
+    for star in MAJOR_STARS + MINOR_STARS + ["tianxiMin"]:
+        for i, branch in enumerate(EARTHLY_BRANCHES):
+            expected = STAR_BRIGHTNESS[star][(i - 2) % 12] if star in STAR_BRIGHTNESS else None
+            assert get_star_brightness(star, branch) == expected
+
+        for stem, config in HEAVENLY_STEMS_CONFIG.items():
+            expected = "禄权科忌"[config.mutagen.index(star)] if star in config.mutagen else None
+            assert get_mutagen_type(stem, star) == expected
+
+
+def test_factor_tables_match_algorithms():
+    """排盘因子表与逐步推算的结果一致"""
+    from iztro_py.astro.palace import get_palace_heavenly_stem
+    from iztro_py.data.constants import EARTHLY_BRANCHES, HEAVENLY_STEMS, TIGER_RULE
+    from iztro_py.star import location
+
+    # 命宫/身宫与十二宫天干
+    for stem in HEAVENLY_STEMS:
+        for month in range(1, 13):
+            for time in range(13):
+                soul_and_body = get_soul_and_body(month, time, stem)
+                actual_time = time % 12
+                assert soul_and_body.soul_index == (month + 1 - actual_time) % 12
+                assert soul_and_body.body_index == (month + 1 + actual_time) % 12
+                yin_stem = HEAVENLY_STEMS.index(TIGER_RULE[stem])
+                assert (
+                    soul_and_body.heavenly_stem_of_soul
+                    == HEAVENLY_STEMS[(yin_stem + (soul_and_body.soul_index - 2) % 12) % 10]
+                )
+                for palace in initialize_palaces(soul_and_body):
+                    branch = EARTHLY_BRANCHES.index(palace["earthly_branch"])
+                    assert palace["heavenly_stem"] == get_palace_heavenly_stem(
+                        branch, soul_and_body.soul_index, soul_and_body.heavenly_stem_of_soul
+                    )
+
+    # 主星：每颗星落在 get_major_star_positions 给出的地支
+    palaces = initialize_palaces(get_soul_and_body(5, 3, "bingHeavenly"))
+    for class_value in range(2, 7):
+        for lunar_day in range(1, 31):
+            ziwei, tianfu = location.get_start_indices_by_day(class_value, lunar_day)
+            assert tianfu == (16 - ziwei) % 12
+            for palace in palaces:
+                palace["major_stars"] = []
+            place_major_stars(palaces, ziwei, tianfu)
+            placed = {
+                star.name: EARTHLY_BRANCHES.index(palace["earthly_branch"])
+                for palace in palaces
+                for star in palace["major_stars"]
+            }
+            assert placed == location.get_major_star_positions(ziwei, tianfu)
+
+    # 辅星：按月、时、年干、年支四个因子逐一核对
+    for month in range(1, 13):
+        for time in range(13):
+            palaces = initialize_palaces(get_soul_and_body(month, time, "jiaHeavenly"))
+            for stem_index, stem in enumerate(HEAVENLY_STEMS):
+                for branch_index in range(stem_index % 2, 12, 2):
+                    for palace in palaces:
+                        palace["minor_stars"] = []
+                    place_minor_stars(palaces, month, time, stem, EARTHLY_BRANCHES[branch_index])
+                    placed = [
+                        (star.name, EARTHLY_BRANCHES.index(palace["earthly_branch"]))
+                        for palace in palaces
+                        for star in palace["minor_stars"]
+                    ]
+                    lucun = location.get_minor_star_positions_lucun_yangtuo_tianma(
+                        stem_index, branch_index
+                    )
+                    expected = {
+                        "zuofuMin": location.get_minor_star_position_zuofu(month),
+                        "youbiMin": location.get_minor_star_position_youbi(month),
+                        "wenchangMin": location.get_minor_star_position_wenchang(time),
+                        "wenquMin": location.get_minor_star_position_wenqu(time),
+                        "tiankuiMin": location.get_minor_star_positions_kuiyue(stem_index)[0],
+                        "tianyueMin": location.get_minor_star_positions_kuiyue(stem_index)[1],
+                        "huoxingMin": location.get_minor_star_positions_huoling(branch_index, time)[
+                            0
+                        ],
+                        "lingxingMin": location.get_minor_star_positions_huoling(
+                            branch_index, time
+                        )[1],
+                        "dikongMin": location.get_minor_star_positions_kongjie(time)[0],
+                        "dijieMin": location.get_minor_star_positions_kongjie(time)[1],
+                        "lucunMin": lucun[0],
+                        "qingyangMin": lucun[1],
+                        "tuoluoMin": lucun[2],
+                        "tianmaMin": lucun[3],
+                    }
+                    assert len(placed) == 14
+                    assert dict(placed) == expected
+
+
 if __name__ == "__main__":
     try:
         test_ziwei_tianfu_position()
@@ -197,6 +295,8 @@ if __name__ == "__main__":
         test_minor_stars_placement()
         test_mutagen_application()
         test_brightness_application()
+        test_compact_tables_match_configs()
+        test_factor_tables_match_algorithms()
 
         print("=" * 60)
         print("✓✓✓ 所有星曜定位测试通过！")
@@ -0,0 +1,100 @@
+"""
+Golden corpus verification tests
+"""
+
+import json
+from itertools import islice
+
+import pytest
+from iztro_py import astro, verify
+
+
+def _reference(chart):
+    """按 node 端 REFERENCE_TRANSFORM 的格式提取 zh-CN 星盘的核心字段"""
+    d = chart.to_iztro_dict()
+    return [
+        d["earthlyBranchOfSoulPalace"],
+        d["earthlyBranchOfBodyPalace"],
+        d["fiveElementsClass"],
+        [
+            [
+                p["earthlyBranch"],
+                [
+                    [s["name"], s["brightness"], s["mutagen"]]
+                    for s in p["majorStars"] + p["minorStars"]
+                ],
+            ]
+            for p in d["palaces"]
+        ],
+    ]
+
+
+class TestEncoding:
+    """Test the corpus record encoding"""
+
+    @pytest.mark.parametrize("args", [("2000-8-16", 6, "男"), ("1900-1-1", 0, "女")])
+    def test_reference_matches_chart(self, args):
+        chart = astro.by_solar(*args)
+        record = verify.encode_chart(chart)
+
+        assert len(record) == verify.RECORD_SIZE
+        assert verify.encode_reference(_reference(chart)) == record
+        assert verify.encode_reference({"error": "x"}) == verify.MISSING_RECORD
+
+    def test_decode(self):
+        fields = verify.decode_record(verify.encode_chart(astro.by_solar("2000-8-16", 6, "男")))
+
+        assert fields["soul"] == "yinEarthly"
+        assert fields["five_elements_class"] == "金四局"
+        assert fields["taiyinMaj.palace"] == "yinEarthly"
+        assert fields["taiyinMaj.mutagen"] == "科"
+
+    def test_year_inputs(self):
+        inputs = list(verify.year_inputs(2000))
+
+        assert len(inputs) == 366 * 13 * 2
+        assert inputs[:3] == [("2000-1-1", 0, "男"), ("2000-1-1", 0, "女"), ("2000-1-1", 1, "男")]
+
+
+class TestCheck:
+    """Test verify.check()"""
+
+    def _corpus(self, directory, year=2000):
+        # 只有前 26 条（一天）有黄金记录，其余为无法验证，使测试保持快速
+        records = [
+            verify.encode_chart(astro.by_solar(*args))
+            for args in islice(verify.year_inputs(year), 26)
+        ]
+        wrong = bytearray(records[5])
+        wrong[0] = (wrong[0] + 1) % 12
+        records[5] = bytes(wrong)
+        count = sum(1 for _ in verify.year_inputs(year))
+        records += [verify.MISSING_RECORD] * (count - len(records))
+        info = verify._write_year(str(directory), year, iter(records))
+        manifest = {
+            "format": verify.CORPUS_FORMAT,
+            "record_size": verify.RECORD_SIZE,
+            "stars": list(verify.STAR_NAMES),
+            "reference": "python",
+            "reference_version": "test",
+            "years": {str(year): info},
+        }
+        (directory / verify.MANIFEST_FILE).write_text(json.dumps(manifest), encoding="utf-8")
+
+    def test_reports_mismatch(self, tmp_path):
+        self._corpus(tmp_path)
+        report = verify.check(str(tmp_path), workers=1)
+
+        assert report["mismatches"] == 1
+        assert report["unverified"] == report["charts"] - 26
+        assert report["fields"] == {"soul": 1}
+        assert report["examples"][0]["input"] == ["2000-1-1", 2, "女"]
+
+    def test_rejects_corrupt_corpus(self, tmp_path):
+        self._corpus(tmp_path)
+        (tmp_path / "2000.bin.xz").write_bytes(b"corrupt")
+
+        with pytest.raises(ValueError):
+            verify.check(str(tmp_path), workers=1)
+        with pytest.raises(ValueError):
+            verify.check(str(tmp_path), years=[1999], workers=1)